@@ -0,0 +1,69 @@
+"""Benchmarks ``harmonise_unicode`` and ``remove_diacritics`` against their former, multi-pass implementations.
+
+The text is the words of the sample commentary's canonical json in ``tests/data`` (or any utf-8 file given with
+``--text_path``), repeated until it reaches ``--size_mb``. Throughput is given in MB of utf-8 encoded input per second.
+
+Usage:
+    python -m ajmc.commons._scripts.benchmark_unicode --size_mb 5 --repeats 5
+"""
+
+import argparse
+import json
+import re
+import time
+import unicodedata
+
+from ajmc.commons import unicode_utils
+from ajmc.commons import variables as vs
+
+
+def sequential_harmonise_unicode(text: str) -> str:
+    """``harmonise_unicode`` as it used to be, with one ``str.replace`` per character and a final regex."""
+    for mapping in [unicode_utils.PUNCTUATION_MAPPING, unicode_utils.MISCELLANEOUS_SYMBOLS_MAPPING,
+                    unicode_utils.LIGATURES_MAPPING]:
+        for char, replacement in mapping.items():
+            text = text.replace(char, replacement)
+    return re.sub(r'\s+', ' ', text)
+
+
+def sequential_remove_diacritics(text: str) -> str:
+    """``remove_diacritics`` as it used to be, testing each character with ``unicodedata.combining``."""
+    return ''.join([c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c)])
+
+
+def get_throughput(function, text: str, repeats: int) -> float:
+    """Returns the best throughput of ``repeats`` calls to ``function`` on ``text``, in MB/s."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(text)
+        times.append(time.perf_counter() - start)
+    return len(text.encode('utf-8')) / 1e6 / min(times)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the harmonisation of unicode texts.')
+    parser.add_argument('--text_path', type=str, default=None, help='A utf-8 text file, defaults to the sample commentary.')
+    parser.add_argument('--size_mb', type=float, default=5)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.text_path is None:
+        canonical_path = vs.PACKAGE_DIR / 'tests/data/cu31924087948174/canonical/3464N4_tess_retrained.json'
+        words = json.loads(canonical_path.read_text(encoding='utf-8'))['children']['words']
+        text = unicodedata.normalize('NFC', ' '.join(w['text'] for w in words))
+    else:
+        text = unicodedata.normalize('NFC', open(args.text_path, encoding='utf-8').read())
+
+    text = text * max(1, int(args.size_mb * 1e6 / len(text.encode('utf-8'))))
+
+    assert unicode_utils.harmonise_unicode(text) == sequential_harmonise_unicode(text)
+    assert unicode_utils.remove_diacritics(text) == sequential_remove_diacritics(text)
+
+    print(f'{"function":<24}{"sequential (MB/s)":>20}{"compiled (MB/s)":>18}{"speed-up":>10}')
+    for name, sequential, compiled in [('harmonise_unicode', sequential_harmonise_unicode, unicode_utils.harmonise_unicode),
+                                       ('remove_diacritics', sequential_remove_diacritics, unicode_utils.remove_diacritics)]:
+        sequential_throughput = get_throughput(sequential, text, args.repeats)
+        compiled_throughput = get_throughput(compiled, text, args.repeats)
+        print(f'{name:<24}{sequential_throughput:>20.1f}{compiled_throughput:>18.1f}'
+              f'{compiled_throughput / sequential_throughput:>9.1f}x')
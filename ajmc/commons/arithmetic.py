@@ -1,5 +1,7 @@
 """This module contains basic arithmetic functions."""
 
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from typing import List, Tuple
 
 import numpy as np
@@ -48,3 +50,62 @@ def are_intervals_within_intervals(contained: List[Tuple[int, int]], container:
 def safe_divide(dividend, divisor):
     """Simple division which return ``np.nan`` if ``divisor`` equals zero."""
     return dividend / divisor if divisor != 0 else np.nan
+
+
+class IntervalIndex:
+    """A static index over a list of intervals, answering containment queries in logarithmic time.
+
+    Intervals are sorted by start once at init. Queries then bisect the sorted starts instead of scanning every interval,
+    which makes ``CanonicalTextContainer``'s children and parents lookups sub-linear.
+
+    Note:
+        Query results are positions in the list of intervals the index was built from, returned in ascending order. This
+        allows to retrieve elements in the same order as the original list.
+    """
+
+    def __init__(self, intervals: List[Tuple[int, int]]):
+        """Default constructor.
+
+        Args:
+            intervals: A list of ``(start, stop)`` tuples, with boundaries included.
+        """
+        self._order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+        self._starts = [intervals[i][0] for i in self._order]
+        self._ends = [intervals[i][1] for i in self._order]
+
+        # The running maximum of ends allows to stop backward scans as soon as no interval can reach the query's end.
+        self._max_ends = list(accumulate(self._ends, max))
+
+        # Empty intervals (e.g. empty pages, with ``start == end + 1``) may start after their end. Knowing by how much
+        # bounds the forward scans in ``get_contained``.
+        self._max_overhang = max([s - e for s, e in zip(self._starts, self._ends)] + [0])
+
+    def __len__(self):
+        return len(self._order)
+
+    @docstring_formatter(**docstrings)
+    def get_contained(self, container: Tuple[int, int]) -> List[int]:
+        """Returns the positions of the intervals which are within ``container``.
+
+        Args:
+            container: {interval}
+        """
+        start = bisect_left(self._starts, container[0])
+        stop = bisect_right(self._starts, container[1] + self._max_overhang)
+        return sorted(self._order[i] for i in range(start, stop) if self._ends[i] <= container[1])
+
+    @docstring_formatter(**docstrings)
+    def get_containers(self, contained: Tuple[int, int]) -> List[int]:
+        """Returns the positions of the intervals which contain ``contained``.
+
+        Args:
+            contained: {interval}
+        """
+        containers = []
+        for i in range(bisect_right(self._starts, contained[0]) - 1, -1, -1):
+            if self._max_ends[i] < contained[1]:
+                break
+            if self._ends[i] >= contained[1]:
+                containers.append(self._order[i])
+
+        return sorted(containers)
@@ -0,0 +1,80 @@
+"""A persistent cache of image contours, used by ``AjmcImage`` to avoid re-contouring the same images.
+
+Each entry is a compressed ``.npz`` file in the cache directory, holding the contours' bboxes as an ``int32`` array in
+the ``x1, y1, x2, y2`` format, and the shape of the image they were computed from. Entries are named after the hash of
+the image file's content and the contouring parameters, so that modified images or changed parameters never hit stale
+entries.
+
+Use ``python -m ajmc.commons.contours_cache --clear`` to remove all the entries.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from ajmc.commons import variables as vs
+from ajmc.commons.miscellaneous import get_ajmc_logger
+
+logger = get_ajmc_logger(__name__)
+
+CONTOURS_CACHE_VERSION = 2  # Increment this whenever the computation of contours changes
+
+
+def get_image_hash(img_path: Union[str, Path]) -> str:
+    """Gets the sha1 hash of the content of the image file at ``img_path``."""
+    return hashlib.sha1(Path(img_path).read_bytes()).hexdigest()
+
+
+def get_entry_path(img_hash: str, binarize: bool, cache_dir: Union[str, Path]) -> Path:
+    """Gets the path to the cache entry of the image with hash ``img_hash``, contoured with the given parameters."""
+    params = 'otsu' if binarize else 'raw'
+    return Path(cache_dir) / f'{img_hash}_{params}_v{CONTOURS_CACHE_VERSION}.npz'
+
+
+def save_contours(entry_path: Union[str, Path], xyxy: np.ndarray, img_shape: Tuple[int, int]):
+    """Saves the contours' bboxes and the image's ``(height, width)`` to ``entry_path``."""
+    entry_path = Path(entry_path)
+    entry_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = entry_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, xyxy=np.asarray(xyxy, dtype=np.int32).reshape(-1, 4),
+                            img_shape=np.array(img_shape, dtype=np.int64))
+    os.replace(tmp_path, entry_path)  # Atomic, so that concurrent readers never see a partial entry
+
+
+def load_contours(entry_path: Union[str, Path]) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+    """Loads the contours' bboxes and the image's ``(height, width)`` from ``entry_path``.
+
+    Returns:
+        The ``(N, 4)`` array of the contours' bboxes and the image's shape, or ``None`` if there is no valid entry.
+    """
+    entry_path = Path(entry_path)
+    if not entry_path.is_file():
+        return None
+
+    try:
+        with np.load(entry_path, allow_pickle=False) as entry:
+            return entry['xyxy'], tuple(entry['img_shape'].tolist())
+    except Exception as e:
+        logger.debug(f'Could not read cache entry {entry_path} ({e}).')
+        return None
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manage the cache of image contours.')
+    parser.add_argument('--cache_dir', type=str, help='The cache directory. Defaults to variables.CONTOURS_CACHE_DIR.')
+    parser.add_argument('--clear', action='store_true', help='Remove all the entries.')
+
+    args = parser.parse_args()
+    args.cache_dir = args.cache_dir or vs.CONTOURS_CACHE_DIR  # Only evaluated if needed, as it requires AJMC_DATA_DIR
+
+    if args.clear:
+        entries = list(Path(args.cache_dir).glob('*.npz'))
+        for entry_path in entries:
+            entry_path.unlink()
+        print(f'Removed {len(entries)} entries from {args.cache_dir}.')
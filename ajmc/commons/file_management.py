@@ -7,14 +7,15 @@ import subprocess
 from datetime import datetime
 from pathlib import Path
 from string import ascii_letters
-from typing import Callable, List, Optional, Union, Tuple, Set
-
-import pandas as pd
+from typing import Callable, List, Optional, Union, Tuple, Set, TYPE_CHECKING
 
 from ajmc.commons import variables as vs
 from ajmc.commons.docstrings import docstring_formatter, docstrings
 from ajmc.commons.miscellaneous import get_ajmc_logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = get_ajmc_logger(__name__)
 
 
@@ -107,14 +108,15 @@ def get_62_based_datecode(date: Optional[datetime] = None) -> str:
 @docstring_formatter(**docstrings)
 def move_files_in_each_commentary_dir(relative_src_path: Union[str, Path],
                                       relative_dst_path: Union[str, Path],
-                                      root_dir: Path = vs.COMMS_DATA_DIR):
+                                      root_dir: Optional[Path] = None):
     """Moves/rename files/folders in the folder structure.
 
     Args:
         relative_src_path: relative path of the source file/folder, from commentary root_dir (e.g. ``'ocr/groundtruth'``)
         relative_dst_path: relative path of the destination file/folder,  from commentary root_dir (e.g. ``'ocr/groundtruth'``)
-        root_dir: {root_dir}
+        root_dir: {root_dir} Defaults to ``variables.COMMS_DATA_DIR``.
     """
+    root_dir = vs.COMMS_DATA_DIR if root_dir is None else root_dir
 
     for dir_ in walk_dirs(root_dir):
         abs_src_path = dir_ / relative_src_path
@@ -306,7 +308,7 @@ def data_sanity_check():
 
 
 @docstring_formatter(**docstrings)
-def read_google_sheet(sheet_id: str, sheet_name: str, **kwargs) -> pd.DataFrame:
+def read_google_sheet(sheet_id: str, sheet_name: str, **kwargs) -> 'pd.DataFrame':
     """A simple function to read a google sheet in a ``pd.DataFrame``.
 
     Works at 2022-09-29. See https://towardsdatascience.com/read-data-from-google-sheets-into-pandas-without-the-google-sheets-api-5c468536550
@@ -319,6 +321,7 @@ def read_google_sheet(sheet_id: str, sheet_name: str, **kwargs) -> pd.DataFrame:
     Returns:
         The sheet as a ``pd.DataFrame``.
     """
+    import pandas as pd
 
     url = f'https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}'
     return pd.read_csv(url, **kwargs)
@@ -327,7 +330,7 @@ def read_google_sheet(sheet_id: str, sheet_name: str, **kwargs) -> pd.DataFrame:
 _OLR_GT_SPREADSHEET = None
 
 
-def get_olr_gt_spreadsheet() -> pd.DataFrame:
+def get_olr_gt_spreadsheet() -> 'pd.DataFrame':
     """Returns the OLR spreadsheet as a ``pd.DataFrame``."""
 
     global _OLR_GT_SPREADSHEET
@@ -339,7 +342,7 @@ def get_olr_gt_spreadsheet() -> pd.DataFrame:
 _OCR_GT_SPREADSHEET = None
 
 
-def get_ocr_gt_spreadsheet() -> pd.DataFrame:
+def get_ocr_gt_spreadsheet() -> 'pd.DataFrame':
     """Returns the OCR spreadsheet as a ``pd.DataFrame``."""
 
     global _OCR_GT_SPREADSHEET
@@ -351,7 +354,7 @@ def get_ocr_gt_spreadsheet() -> pd.DataFrame:
 _METADATA_SPREADSHEET = None
 
 
-def get_metadata_spreadsheet() -> pd.DataFrame:
+def get_metadata_spreadsheet() -> 'pd.DataFrame':
     """Returns the metadata spreadsheet as a ``pd.DataFrame``."""
 
     global _METADATA_SPREADSHEET
@@ -130,6 +130,96 @@ class Shape:
         return max(self.width * self.height, 0)
 
 
+class ShapeArray:
+    """A batch of bounding boxes, backed by an ``int32`` array of shape ``(N, 4)`` in the ``x1, y1, x2, y2`` format.
+
+    Note:
+        Pairwise methods compare each box of ``self`` to each box of ``other`` and return ``(N, M)`` matrices. They follow
+        the conventions of their scalar counterparts (e.g. borders are included, so that a box's width is
+        ``x2 - x1 + 1``), so that ``ShapeArray.within(other)[i, j] == is_bbox_within_bbox(self[i].bbox, other[j].bbox)``.
+    """
+
+    def __init__(self, xyxy: Union[np.ndarray, Iterable[Iterable[int]]]):
+        """Default constructor.
+
+        Args:
+            xyxy: An array-like of shape ``(N, 4)`` containing the boxes' ``x1, y1, x2, y2``.
+        """
+        self.xyxy = np.asarray(xyxy, dtype=np.int32).reshape(-1, 4)
+
+    @classmethod
+    def from_shapes(cls, shapes: Iterable[Shape]) -> 'ShapeArray':
+        """Creates a ``ShapeArray`` from the bboxes of ``Shape`` objects."""
+        return cls.from_bboxes([s.bbox for s in shapes])
+
+    @classmethod
+    @docstring_formatter(**docstrings)
+    def from_bboxes(cls, bboxes: Iterable[variables.BoxType]) -> 'ShapeArray':
+        """Creates a ``ShapeArray`` from bboxes.
+
+        Args:
+            bboxes: An iterable of bboxes, each being {bbox}
+        """
+        return cls([(b[0][0], b[0][1], b[1][0], b[1][1]) for b in bboxes])
+
+    def to_shapes(self) -> List[Shape]:
+        """Converts the array to a list of rectangular ``Shape`` objects."""
+        return [Shape([(x1, y1), (x2, y2)]) for x1, y1, x2, y2 in self.xyxy.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.xyxy)
+
+    def __getitem__(self, item) -> Union[Shape, 'ShapeArray']:
+        if isinstance(item, (int, np.integer)):
+            x1, y1, x2, y2 = self.xyxy[item].tolist()
+            return Shape([(x1, y1), (x2, y2)])
+        return ShapeArray(self.xyxy[item])
+
+    @property
+    def widths(self) -> np.ndarray:
+        return self.xyxy[:, 2].astype(np.int64) - self.xyxy[:, 0] + 1
+
+    @property
+    def heights(self) -> np.ndarray:
+        return self.xyxy[:, 3].astype(np.int64) - self.xyxy[:, 1] + 1
+
+    @property
+    def areas(self) -> np.ndarray:
+        """The boxes' areas, computed like ``compute_bbox_area``."""
+        return self.widths * self.heights
+
+    def overlap_areas(self, other: 'ShapeArray') -> np.ndarray:
+        """The ``(N, M)`` matrix of the intersection areas, computed like ``compute_bbox_overlap_area``."""
+        a, b = self.xyxy.astype(np.int64)[:, None, :], other.xyxy.astype(np.int64)[None, :, :]
+        inter_widths = np.maximum(np.minimum(a[..., 2], b[..., 2]) + 1 - np.maximum(a[..., 0], b[..., 0]), 0)
+        inter_heights = np.maximum(np.minimum(a[..., 3], b[..., 3]) + 1 - np.maximum(a[..., 1], b[..., 1]), 0)
+        return inter_widths * inter_heights
+
+    def within(self, other: 'ShapeArray') -> np.ndarray:
+        """The ``(N, M)`` boolean matrix of ``is_bbox_within_bbox(contained=self[i], container=other[j])``."""
+        a, b = self.xyxy[:, None, :], other.xyxy[None, :, :]
+        return ((a[..., 0] >= b[..., 0]) & (a[..., 1] >= b[..., 1])
+                & (a[..., 2] <= b[..., 2]) & (a[..., 3] <= b[..., 3]))
+
+    def overlapping(self, other: 'ShapeArray') -> np.ndarray:
+        """The ``(N, M)`` boolean matrix of ``are_bboxes_overlapping(self[i], other[j])``."""
+        return self.overlap_areas(other) > 0
+
+    def ious(self, other: 'ShapeArray') -> np.ndarray:
+        """The ``(N, M)`` matrix of the intersection over union of the boxes."""
+        inter_areas = self.overlap_areas(other)
+        return inter_areas / (self.areas[:, None] + other.areas[None, :] - inter_areas)
+
+    def within_with_threshold(self, other: 'ShapeArray', threshold: float) -> np.ndarray:
+        """The ``(N, M)`` boolean matrix of ``is_bbox_within_bbox_with_threshold(self[i], other[j], threshold)``."""
+        return self.overlap_areas(other) > threshold * self.areas[:, None]
+
+    def overlapping_with_threshold(self, other: 'ShapeArray', threshold: float) -> np.ndarray:
+        """The ``(N, M)`` boolean matrix of ``are_bboxes_overlapping_with_threshold(self[i], other[j], threshold)``."""
+        inter_areas = self.overlap_areas(other)
+        return inter_areas >= threshold * (self.areas[:, None] + other.areas[None, :] - inter_areas)
+
+
 @docstring_formatter(**docstrings)
 def get_bbox_from_points(points: Union[np.ndarray, Iterable[Iterable[int]]]) -> variables.BoxType:
     """Gets the bounding box (i.e. the minimal rectangle containing all points) from a sequence of x-y points.
@@ -264,7 +354,7 @@ def are_bboxes_overlapping_with_threshold(bbox1: variables.BoxType,
 
 @docstring_formatter(**docstrings)
 def adjust_bbox_to_included_contours(bbox: variables.BoxType,
-                                     contours: List[Shape],
+                                     contours: Union[List[Shape], ShapeArray],
                                      exclude_vertically_expanding_contours: bool = True) -> Shape:
     """Finds the contours included in ``bbox`` and returns a shape objects that minimally contains them.
 
@@ -274,18 +364,19 @@ def adjust_bbox_to_included_contours(bbox: variables.BoxType,
 
     Args:
         bbox: {bbox}
-        contours: A list of included contours
+        contours: A list of included contours, preferably as a ``ShapeArray`` when adjusting many boxes to the same
+            contours.
     """
 
+    if not isinstance(contours, ShapeArray):
+        contours = ShapeArray.from_shapes(contours)
+
+    xyxy = contours.xyxy
+    is_included = contours.overlapping(ShapeArray.from_bboxes([bbox]))[:, 0]
     if exclude_vertically_expanding_contours:
-        included_contours = [c for c in contours
-                             if are_bboxes_overlapping(c.bbox, bbox)
-                             and not (c.bbox[0][1] < bbox[0][1]
-                                      or c.bbox[1][1] > bbox[1][1])]
-    else:
-        included_contours = [c for c in contours if are_bboxes_overlapping(c.bbox, bbox)]
+        is_included &= (xyxy[:, 1] >= bbox[0][1]) & (xyxy[:, 3] <= bbox[1][1])
 
-    if included_contours:  # If we find included contours, readjust the bounding box
-        return Shape([xy for c in included_contours for xy in c.bbox])
+    if is_included.any():  # If we find included contours, readjust the bounding box
+        return Shape([xy for x1, y1, x2, y2 in xyxy[is_included].tolist() for xy in ((x1, y1), (x2, y2))])
     else:
         return Shape(bbox)  # Leave the box untouched
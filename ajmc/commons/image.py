@@ -1,23 +1,144 @@
 """Basic operations and objects for image processing."""
 
 import random
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional, Tuple, Union, Callable
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
 from lazy_objects.lazy_objects import lazy_property, lazy_init
 
-from ajmc.commons import variables
+from ajmc.commons import contours_cache, tracing, variables
 from ajmc.commons.docstrings import docstring_formatter, docstrings
-from ajmc.commons.geometry import Shape
+from ajmc.commons.geometry import Shape, ShapeArray
 from ajmc.commons.miscellaneous import get_ajmc_logger
-from ajmc.ocr.data_processing import font_utils
-from ajmc.ocr.data_processing.data_generation import draw_textline
+from ajmc.commons.spatial_index import GridIndex
 
 logger = get_ajmc_logger(__name__)
 
 
+DECODE_MODES = ('color', 'grayscale', 'binarized')
+DECODE_REDUCTIONS = (1, 2, 4, 8)
+
+_IMREAD_FLAGS = {('color', 1): cv2.IMREAD_COLOR,
+                 ('color', 2): cv2.IMREAD_REDUCED_COLOR_2,
+                 ('color', 4): cv2.IMREAD_REDUCED_COLOR_4,
+                 ('color', 8): cv2.IMREAD_REDUCED_COLOR_8,
+                 ('grayscale', 1): cv2.IMREAD_GRAYSCALE,
+                 ('grayscale', 2): cv2.IMREAD_REDUCED_GRAYSCALE_2,
+                 ('grayscale', 4): cv2.IMREAD_REDUCED_GRAYSCALE_4,
+                 ('grayscale', 8): cv2.IMREAD_REDUCED_GRAYSCALE_8}
+
+
+def _check_decode_mode(mode: str, reduction: int):
+    if mode not in DECODE_MODES:
+        raise ValueError(f'Unknown decode mode {mode!r}, expected one of {DECODE_MODES}.')
+    if reduction not in DECODE_REDUCTIONS:
+        raise ValueError(f'Unsupported reduction {reduction!r}, expected one of {DECODE_REDUCTIONS}.')
+
+
+@tracing.traced('decode_image')
+def decode_image(path: Union[str, Path], mode: str = 'color', reduction: int = 1) -> Optional[np.ndarray]:
+    """Decodes the image at ``path`` in the requested mode, letting the decoder do the conversion and the downscaling.
+
+    Args:
+        path: The path to the image.
+        mode: ``'color'`` (BGR, 3 channels), ``'grayscale'`` (1 channel) or ``'binarized'`` (1 channel, black on white,
+            see ``binarize``).
+        reduction: The downscaling factor, one of 1, 2, 4 or 8, see ``cv2.IMREAD_REDUCED_*``.
+
+    Returns:
+        The decoded matrix, or ``None`` if the image cannot be read (like ``cv2.imread``).
+    """
+    _check_decode_mode(mode, reduction)
+    matrix = cv2.imread(str(path), _IMREAD_FLAGS['color' if mode == 'color' else 'grayscale', reduction])
+    if matrix is not None and mode == 'binarized':
+        matrix = binarize(matrix)
+    return matrix
+
+
+def convert_matrix(matrix: np.ndarray, mode: str = 'color', reduction: int = 1) -> np.ndarray:
+    """Converts an already decoded ``matrix`` to the requested mode, see ``decode_image``."""
+    _check_decode_mode(mode, reduction)
+    if reduction > 1:
+        matrix = cv2.resize(matrix, (max(matrix.shape[1] // reduction, 1), max(matrix.shape[0] // reduction, 1)),
+                            interpolation=cv2.INTER_AREA)
+    if mode == 'color' and matrix.ndim == 2:
+        matrix = cv2.cvtColor(matrix, cv2.COLOR_GRAY2BGR)
+    elif mode == 'grayscale' and matrix.ndim == 3:
+        matrix = cv2.cvtColor(matrix, cv2.COLOR_BGR2GRAY)
+    elif mode == 'binarized':
+        matrix = binarize(matrix)
+    return matrix
+
+
+class ImageCache:
+    """A process-wide cache of decoded images, keyed by path and decode mode, with a byte budget and least-recently-used
+    eviction.
+
+    Note:
+        Cached matrices are shared by every ``AjmcImage`` with the same path, so they are made read-only. Copy them
+        before drawing on them. Evicted matrices are only freed once no ``AjmcImage`` or crop refers to them anymore.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Default constructor.
+
+        Args:
+            max_bytes: The maximal number of bytes of the cached matrices. Images larger than this are not cached.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._matrices: 'OrderedDict[Tuple[str, str, int], np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._matrices)
+
+    def __contains__(self, path: Union[str, Path]) -> bool:
+        """Checks whether the image at ``path`` is cached, in any mode."""
+        return any(key[0] == str(path) for key in self._matrices)
+
+    def get_matrix(self, path: Union[str, Path], mode: str = 'color', reduction: int = 1) -> Optional[np.ndarray]:
+        """Gets the matrix of the image at ``path``, decoding and caching it if it is not cached yet.
+
+        Args:
+            path: The path to the image.
+            mode: The decode mode, see ``decode_image``.
+            reduction: The downscaling factor, see ``decode_image``.
+        """
+        key = (str(path), mode, reduction)
+        with self._lock:
+            if key in self._matrices:
+                self._matrices.move_to_end(key)
+                return self._matrices[key]
+
+        matrix = decode_image(path, mode, reduction)
+        if matrix is None:
+            return None
+        matrix.flags.writeable = False
+
+        with self._lock:
+            if matrix.nbytes <= self.max_bytes and key not in self._matrices:
+                self._matrices[key] = matrix
+                self.current_bytes += matrix.nbytes
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self._matrices.popitem(last=False)
+                    self.current_bytes -= evicted.nbytes
+        return matrix
+
+    def clear(self):
+        """Removes all the matrices from the cache."""
+        with self._lock:
+            self._matrices.clear()
+            self.current_bytes = 0
+
+
+IMAGE_CACHE = ImageCache(max_bytes=variables.IMAGE_CACHE_MAX_BYTES)
+
+
 class AjmcImage:
     """Default class for ajmc images.
 
@@ -43,28 +164,111 @@ class AjmcImage:
         """
 
 
-    @lazy_property
+    @property
     def matrix(self) -> np.ndarray:
-        """np.ndarray of the image image matrix. Its shape is (height, width, channels)."""
-        return cv2.imread(str(self.path))
+        """np.ndarray of the image image matrix. Its shape is (height, width, channels).
+
+        Note:
+            Unless a matrix was given at init, it is read from ``IMAGE_CACHE`` and is read-only.
+        """
+        return self.get_matrix('color')
+
+    @matrix.setter
+    def matrix(self, matrix: np.ndarray):
+        self._matrix = matrix
+
+    _matrix: Optional[np.ndarray] = None
+
+    @lazy_property
+    def _converted_matrices(self) -> Dict[Tuple[str, int], np.ndarray]:
+        return {}
+
+    def get_matrix(self, mode: str = 'color', reduction: int = 1) -> np.ndarray:
+        """Gets the image's matrix in the requested mode. Request the cheapest mode you need.
+
+        Note:
+            If the image has no matrix given at init, it is decoded directly in the requested mode and cached in
+            ``IMAGE_CACHE``. Otherwise, the given matrix is converted and the conversion is kept with the image.
+
+        Args:
+            mode: ``'color'`` (BGR, 3 channels), ``'grayscale'`` (1 channel) or ``'binarized'`` (1 channel, black on
+                white).
+            reduction: The downscaling factor, one of 1, 2, 4 or 8.
+        """
+        if self._matrix is None:
+            return IMAGE_CACHE.get_matrix(self.path, mode, reduction)
+
+        if mode == 'color' and reduction == 1:
+            return self._matrix
+        if (mode, reduction) not in self._converted_matrices:
+            self._converted_matrices[mode, reduction] = convert_matrix(self._matrix, mode, reduction)
+        return self._converted_matrices[mode, reduction]
 
     @lazy_property
     def height(self) -> int:
-        return self.matrix.shape[0]
+        return self._get_shape_matrix().shape[0]
 
     @lazy_property
     def width(self) -> int:
-        return self.matrix.shape[1]
+        return self._get_shape_matrix().shape[1]
+
+    def _get_shape_matrix(self) -> np.ndarray:
+        """Gets the cheapest full-resolution matrix to read the image's size from."""
+        return self._matrix if self._matrix is not None else self.get_matrix('grayscale')
 
     @lazy_property
-    def contours(self):
-        return find_contours(self.matrix)
+    def contours_cache_dir(self) -> Optional[Path]:
+        """The directory in which contours are cached, see ``ajmc.commons.contours_cache``. Set to ``None`` to disable."""
+        return variables.CONTOURS_CACHE_DIR
+
+    @lazy_property
+    def contours(self) -> List[Shape]:
+        """The image's contours, as polygonal ``Shape`` s (see ``find_contours``).
+
+        Note:
+            These are not cached on disk. Use ``self.contours_array`` if only the contours' bboxes are needed.
+        """
+        with tracing.span('find_contours'):
+            return find_contours(self.get_matrix('grayscale'))
+
+    @lazy_property
+    def contours_array(self) -> ShapeArray:
+        """The bboxes of ``self.contours`` as a ``ShapeArray``, to adjust many boxes to the same contours.
+
+        Note:
+            If the image has a path and ``self.contours_cache_dir`` is not ``None``, contours are read from and written
+            to the cache. A cache hit also sets the image's ``height`` and ``width``, without decoding the image.
+        """
+        path = getattr(self, 'path', None)
+        if path is None or self.contours_cache_dir is None:
+            return ShapeArray.from_shapes(self.contours)
+
+        entry_path = contours_cache.get_entry_path(contours_cache.get_image_hash(path), True, self.contours_cache_dir)
+        entry = contours_cache.load_contours(entry_path)
+        if entry is not None:
+            xyxy, (self.height, self.width) = entry
+            return ShapeArray(xyxy)
+
+        contours_array = ShapeArray.from_shapes(self.contours)
+        try:
+            contours_cache.save_contours(entry_path, contours_array.xyxy, (self.height, self.width))
+        except OSError as e:
+            logger.debug(f'Could not cache the contours of {path} ({e}).')
+        return contours_array
+
+    @lazy_property
+    def contours_index(self) -> GridIndex:
+        """A ``GridIndex`` over ``self.contours_array``, to search the contours overlapping a given box."""
+        return GridIndex.from_shape_array(self.contours_array)
 
     def crop(self,
              box: variables.BoxType,
              margin: int = 0) -> 'AjmcImage':
         """Gets the slice of ``self.matrix`` corresponding to ``box``.
 
+        Note:
+            The crop is a zero-copy view of ``self.matrix``, which keeps the latter alive as long as the crop is.
+
         Args:
             box: The bbox delimiting the desired crop
             margin: The extra margin desired around ``box``
@@ -87,9 +291,9 @@ class AjmcImage:
 
 def binarize(img_matrix: np.ndarray,
              inverted: bool = False):
-    """Binarizes an ``img_matrix`` using cv2 and Otsu's method."""
+    """Binarizes an ``img_matrix`` (BGR or grayscale) using cv2 and Otsu's method."""
     binarization_type = (cv2.THRESH_OTSU | cv2.THRESH_BINARY_INV) if inverted else (cv2.THRESH_OTSU | cv2.THRESH_BINARY)
-    gray = cv2.cvtColor(img_matrix, cv2.COLOR_BGR2GRAY)
+    gray = cv2.cvtColor(img_matrix, cv2.COLOR_BGR2GRAY) if img_matrix.ndim == 3 else img_matrix
     return cv2.threshold(gray, 0, 255, type=binarization_type)[1]
 
 
@@ -149,6 +353,10 @@ def draw_box(box: variables.BoxType,
                                thickness=stroke_thickness)
 
     if text is not None:
+        # Imported here, as fonts and text rendering are only needed to draw texts
+        from ajmc.ocr.data_processing import font_utils
+        from ajmc.ocr.data_processing.data_generation import draw_textline
+
         try:
             text_img = draw_textline(text,
                                      fonts=font_utils.get_default_fonts(),
@@ -274,7 +482,7 @@ def find_contours(img_matrix: np.ndarray,
     """Finds contours using ``cv2.findContours``, potentially binarizing the image first.
 
     Args:
-        img_matrix (np.ndarray): The image matrix to find contours in.
+        img_matrix (np.ndarray): The image matrix to find contours in. Pass a grayscale matrix to spare a conversion.
         binarize (bool): Whether to binarize the image first.
 
     Returns:
@@ -283,7 +491,7 @@ def find_contours(img_matrix: np.ndarray,
 
     # This has to be done in cv2. Using cv2.THRESH_BINARY_INV to avoid looking for the white background as a contour
     if binarize:
-        gray = cv2.cvtColor(img_matrix, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(img_matrix, cv2.COLOR_BGR2GRAY) if img_matrix.ndim == 3 else img_matrix
         thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_OTSU | cv2.THRESH_BINARY_INV)[1]
     else:
         thresh = img_matrix
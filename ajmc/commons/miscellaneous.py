@@ -7,8 +7,6 @@ import timeit
 from pathlib import Path
 from typing import Generator, Iterable, List, Type, Optional
 
-from jsonschema import Draft6Validator
-
 from ajmc.commons import variables as vs
 
 
@@ -59,6 +57,7 @@ def get_unique_elements(iterable: Iterable, iterable_types: Iterable[Type[Iterab
 
 def validate_json_schema(schema_path: Path = vs.SCHEMA_PATH):
     """Validates a json schema against ``Draft6Validator``"""
+    from jsonschema import Draft6Validator
     Draft6Validator.check_schema(json.loads(schema_path.read_text(encoding='utf-8')))
 
 
@@ -0,0 +1,106 @@
+"""Spatial indices over bounding boxes, to avoid testing every box against every other box."""
+
+from collections import defaultdict
+from statistics import median
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ajmc.commons import variables
+from ajmc.commons.docstrings import docstring_formatter, docstrings
+from ajmc.commons.geometry import Shape, ShapeArray
+
+
+class GridIndex:
+    """A uniform grid over a static list of bounding boxes.
+
+    Each box is registered in every grid cell it touches. Queries only look at the boxes registered in the cells
+    touched by the query box, and then check them exactly.
+
+    Note:
+        Results are positions in the original list of bboxes, in ascending order, so that filtering candidates with the
+        index preserves the original order of elements. Borders are included, consistently with ``ajmc.commons.geometry``.
+    """
+
+    @docstring_formatter(**docstrings)
+    def __init__(self, bboxes: Iterable[variables.BoxType], cell_size: Optional[int] = None):
+        """Default constructor.
+
+        Args:
+            bboxes: The bounding boxes to index, each in the ``((x_min, y_min), (x_max, y_max))`` format.
+            cell_size: The side of the grid's square cells, in pixels. Defaults to the median of the boxes' largest side.
+        """
+        self.xyxys = [(int(bbox[0][0]), int(bbox[0][1]), int(bbox[1][0]), int(bbox[1][1])) for bbox in bboxes]
+
+        if cell_size is None:
+            cell_size = median([max(x2 - x1, y2 - y1) + 1 for x1, y1, x2, y2 in self.xyxys]) if self.xyxys else 1
+        self.cell_size = max(int(cell_size), 1)
+
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, xyxy in enumerate(self.xyxys):
+            for cell in self._get_cells(xyxy):
+                self.cells[cell].append(i)
+
+    @classmethod
+    def from_shapes(cls, shapes: Iterable[Shape], cell_size: Optional[int] = None) -> 'GridIndex':
+        """Creates a ``GridIndex`` over the bboxes of ``Shape`` objects."""
+        return cls([s.bbox for s in shapes], cell_size=cell_size)
+
+    @classmethod
+    def from_shape_array(cls, shape_array: ShapeArray, cell_size: Optional[int] = None) -> 'GridIndex':
+        """Creates a ``GridIndex`` over the bboxes of a ``ShapeArray``."""
+        return cls([((x1, y1), (x2, y2)) for x1, y1, x2, y2 in shape_array.xyxy.tolist()], cell_size=cell_size)
+
+    def __len__(self) -> int:
+        return len(self.xyxys)
+
+    def _get_cells(self, xyxy: Tuple[int, int, int, int]) -> Iterable[Tuple[int, int]]:
+        x1, y1, x2, y2 = xyxy
+        return ((cx, cy)
+                for cx in range(x1 // self.cell_size, x2 // self.cell_size + 1)
+                for cy in range(y1 // self.cell_size, y2 // self.cell_size + 1))
+
+    def _get_candidates(self, x1: int, y1: int, x2: int, y2: int) -> Iterable[int]:
+        """Gets the positions of the boxes registered in the cells touched by the box ``x1, y1, x2, y2``."""
+        # For very large query boxes, it is cheaper to scan every box
+        if (x2 // self.cell_size - x1 // self.cell_size + 1) * (y2 // self.cell_size - y1 // self.cell_size + 1) > len(self.cells):
+            return range(len(self.xyxys))
+        return {i for cell in self._get_cells((x1, y1, x2, y2)) for i in self.cells.get(cell, ())}
+
+    @docstring_formatter(**docstrings)
+    def query_overlapping(self, bbox: variables.BoxType) -> List[int]:
+        """Gets the positions of the indexed boxes which overlap with ``bbox``, touching boundaries included.
+
+        Args:
+            bbox: {bbox}
+        """
+        x1, y1, x2, y2 = int(bbox[0][0]), int(bbox[0][1]), int(bbox[1][0]), int(bbox[1][1])
+        if x2 < x1 or y2 < y1:
+            return []
+
+        return sorted(i for i in self._get_candidates(x1, y1, x2, y2)
+                      if self.xyxys[i][0] <= x2 and x1 <= self.xyxys[i][2]
+                      and self.xyxys[i][1] <= y2 and y1 <= self.xyxys[i][3])
+
+    @docstring_formatter(**docstrings)
+    def query_contained(self, bbox: variables.BoxType) -> List[int]:
+        """Gets the positions of the indexed boxes which are within ``bbox``, like ``geometry.is_bbox_within_bbox``.
+
+        Args:
+            bbox: {bbox}
+        """
+        x1, y1, x2, y2 = int(bbox[0][0]), int(bbox[0][1]), int(bbox[1][0]), int(bbox[1][1])
+        if x2 < x1 or y2 < y1:
+            return []
+
+        return sorted(i for i in self._get_candidates(x1, y1, x2, y2)
+                      if x1 <= self.xyxys[i][0] and self.xyxys[i][2] <= x2
+                      and y1 <= self.xyxys[i][1] and self.xyxys[i][3] <= y2)
+
+    def query_containing(self, point: Iterable[int]) -> List[int]:
+        """Gets the positions of the indexed boxes which contain ``point``, like ``geometry.is_point_within_bbox``.
+
+        Args:
+            point: The ``(x, y)`` coordinates of the point.
+        """
+        x, y = (int(c) for c in point)
+        return sorted(i for i in self.cells.get((x // self.cell_size, y // self.cell_size), ())
+                      if self.xyxys[i][0] <= x <= self.xyxys[i][2] and self.xyxys[i][1] <= y <= self.xyxys[i][3])
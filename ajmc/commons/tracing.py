@@ -0,0 +1,236 @@
+"""Lightweight tracing of the pipelines' stages, with spans and counters exportable to Chrome's trace format.
+
+Tracing is disabled by default, in which case ``span`` returns a shared no-op context manager and ``count`` returns
+immediately, so that instrumented code only pays a function call. Enable it with ``enable()`` or by setting the
+``AJMC_TRACE`` environment variable to ``1``.
+
+When enabled, each span records its wall time and the growth of the process's peak resident set size (RSS) while it
+was open, and each counter records its running total. Events can be exported with ``export_chrome_trace`` (open the file
+in ``chrome://tracing`` or https://ui.perfetto.dev) and aggregated by stage with ``get_summary`` and ``format_summary``.
+
+Example:
+    >>> from ajmc.commons import tracing
+    >>> tracing.enable()
+    >>> with tracing.span('optimise', page='sophoclesplaysa05campgoog_0146'):
+    ...     pass
+    >>> tracing.count('words', 312)
+    >>> tracing.get_summary()['counters']
+    {'words': 312}
+
+Note:
+    Spans opened in worker processes are recorded there. Pipelines using process pools (e.g.
+    ``RawCommentary.to_canonical``) send them back to the parent process with ``pop_events`` and ``add_events``.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_ENABLED: bool = os.getenv('AJMC_TRACE', '0') not in ('', '0')
+_EVENTS: List[Dict[str, Any]] = []
+_COUNTERS: Dict[str, Union[int, float]] = {}
+
+
+def _get_peak_rss() -> int:
+    """Gets the peak resident set size of the process so far, in bytes, or 0 if unavailable."""
+    if resource is None:
+        return 0
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024  # Linux reports kilobytes
+
+
+def _get_timestamp() -> float:
+    """Gets a timestamp in microseconds, from a monotonic clock shared by the processes of the machine."""
+    return time.perf_counter() * 1e6
+
+
+class _NullSpan:
+    """The span returned when tracing is disabled, which does nothing."""
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A traced stage, recorded as a Chrome trace complete event (``'ph': 'X'``) when it exits.
+
+    Args:
+        name: The name of the stage, e.g. ``'optimise'``. Spans with the same name are aggregated in the summary.
+        args: Any json-serializable details, e.g. the page id, shown in the trace viewer.
+    """
+    __slots__ = ('name', 'args', '_start', '_start_rss')
+
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        """Adds details to the span, e.g. the number of items it processed."""
+        self.args.update(args)
+
+    def __enter__(self) -> 'Span':
+        self._start_rss = _get_peak_rss()
+        self._start = _get_timestamp()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = _get_timestamp()
+        self.args['peak_rss_delta'] = _get_peak_rss() - self._start_rss
+        _EVENTS.append({'name': self.name, 'ph': 'X', 'ts': self._start, 'dur': end - self._start,
+                        'pid': os.getpid(), 'tid': threading.get_ident(), 'args': self.args})
+        return False
+
+
+def span(name: str, **args) -> Union[Span, _NullSpan]:
+    """Opens a span over a stage, to be used as a context manager, e.g. ``with tracing.span('optimise', page=page.id):``.
+
+    Args:
+        name: The name of the stage.
+        **args: Any json-serializable details about this call of the stage.
+    """
+    if not _ENABLED:
+        return _NULL_SPAN
+    return Span(name, args)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator tracing each call of the decorated function as a span named ``name`` (defaults to its qualified name).
+    It should always be called with parentheses."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            with Span(span_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, value: Union[int, float] = 1):
+    """Increments the counter ``name`` by ``value``, recording its running total as a Chrome counter event."""
+    if not _ENABLED:
+        return
+    _COUNTERS[name] = _COUNTERS.get(name, 0) + value
+    _EVENTS.append({'name': name, 'ph': 'C', 'ts': _get_timestamp(), 'pid': os.getpid(), 'tid': threading.get_ident(),
+                    'args': {name: _COUNTERS[name]}})
+
+
+def enable():
+    global _ENABLED
+    _ENABLED = True
+
+
+def disable():
+    global _ENABLED
+    _ENABLED = False
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def reset():
+    """Discards all the recorded events and counters."""
+    _EVENTS.clear()
+    _COUNTERS.clear()
+
+
+def get_events() -> List[Dict[str, Any]]:
+    """Gets a copy of the recorded events, in the Chrome trace event format."""
+    return list(_EVENTS)
+
+
+def pop_events() -> List[Dict[str, Any]]:
+    """Gets and discards the recorded events, e.g. to send them from a worker process to its parent."""
+    events = list(_EVENTS)
+    del _EVENTS[:len(events)]
+    return events
+
+
+def add_events(events: List[Dict[str, Any]]):
+    """Adds events recorded elsewhere, e.g. by a worker process, see ``pop_events``."""
+    _EVENTS.extend(events)
+
+
+def export_chrome_trace(output_path: Union[str, Path]) -> Path:
+    """Writes the recorded events to ``output_path`` in the Chrome trace format."""
+    output_path = Path(output_path)
+    output_path.write_text(json.dumps({'traceEvents': _EVENTS, 'displayTimeUnit': 'ms'}), encoding='utf-8')
+    return output_path
+
+
+def get_summary(events: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+    """Aggregates events by stage.
+
+    Note:
+        Nested spans are not subtracted from their parents, so that the time of a stage includes that of its sub-stages.
+
+    Args:
+        events: The events to aggregate, defaults to the recorded ones.
+
+    Returns:
+        A dict with ``stages``, mapping each span name to its number of ``calls``, its ``total_ms``, ``mean_ms`` and
+        ``max_ms`` wall times and its summed ``peak_rss_delta_mb``, and ``counters``, mapping each counter to its total
+        over all processes.
+    """
+    events = _EVENTS if events is None else events
+    stages = {}
+    counters_by_process = {}
+    for event in events:
+        if event['ph'] == 'X':
+            stage = stages.setdefault(event['name'], {'calls': 0, 'total_ms': 0., 'max_ms': 0., 'peak_rss_delta_mb': 0.})
+            stage['calls'] += 1
+            stage['total_ms'] += event['dur'] / 1000
+            stage['max_ms'] = max(stage['max_ms'], event['dur'] / 1000)
+            stage['peak_rss_delta_mb'] += event['args'].get('peak_rss_delta', 0) / 2 ** 20
+        elif event['ph'] == 'C':
+            counters_by_process[event['name'], event['pid']] = event['args'][event['name']]  # Running totals
+
+    for stage in stages.values():
+        stage['mean_ms'] = stage['total_ms'] / stage['calls']
+
+    counters = {}
+    for (name, _), total in counters_by_process.items():
+        counters[name] = counters.get(name, 0) + total
+
+    return {'stages': stages, 'counters': counters}
+
+
+def format_summary(summary: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Formats ``summary`` (defaults to that of the recorded events) as a table of stages sorted by total wall time."""
+    summary = get_summary() if summary is None else summary
+    lines = [f'{"stage":<32}{"calls":>8}{"total (ms)":>14}{"mean (ms)":>12}{"max (ms)":>12}{"peak RSS delta (MB)":>22}']
+    for name, stage in sorted(summary['stages'].items(), key=lambda item: -item[1]['total_ms']):
+        lines.append(f'{name:<32}{stage["calls"]:>8}{stage["total_ms"]:>14.1f}{stage["mean_ms"]:>12.2f}'
+                     f'{stage["max_ms"]:>12.1f}{stage["peak_rss_delta_mb"]:>22.1f}')
+    if summary['counters']:
+        lines.append('')
+        lines.append(f'{"counter":<32}{"total":>8}')
+        lines += [f'{name:<32}{total:>8}' for name, total in sorted(summary['counters'].items())]
+    return '\n'.join(lines)
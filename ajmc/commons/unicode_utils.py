@@ -1,8 +1,10 @@
 """This file contains unicode variables and functions which serve processing unicode characters."""
 
 import re
+import sys
 import unicodedata
-from typing import List, Tuple, Callable
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
 
 from ajmc.commons.arithmetic import safe_divide
 
@@ -13,15 +15,52 @@ SUBSCRIPT_MAPPING = {'₀': '0', '₁': '1', '₂': '2', '₃': '3', '₄': '4',
                      '₌': '=', '₍': '(', '₎': ')', 'ₐ': 'a', 'ₑ': 'e', 'ₒ': 'o', 'ᵢ': 'i', 'ⱼ': 'j', 'ₖ': 'k', 'ₗ': 'l', 'ₘ': 'm', 'ₙ': 'n',
                      'ₚ': 'p', 'ᵣ': 'r', 'ₛ': 's', 'ₜ': 't', 'ᵤ': 'u', 'ᵥ': 'v', 'ₓ': 'x', }
 
+LIGATURES_MAPPING = {'ﬁ': 'fi', 'ﬂ': 'fl', 'ﬀ': 'ff', 'ﬃ': 'ffi', 'ﬄ': 'ffl', 'ﬅ': 'ft', 'ﬆ': 'st'}
+
+PUNCTUATION_MAPPING = {'═': '=', '‟': '"', '⸗': '—', '●': '•', '⟨': '〈', '⟩': '〉', '‐': '-', '‑': '-', '‒': '-',
+                       '―': '-', '‥': '..', '…': '...', '‧': '·', '′': "'", '″': '"', '（': '(', '）': ')', '͵': ',',
+                       'ʹ': "'", 'ʺ': '"', 'ʻ': "'", 'ʼ': "'", 'ʽ': "'", 'ˈ': "'", 'ˊ': "'", 'ˋ': "'", 'ˌ': ',',
+                       '\x92': "'"}
+
+NON_PRINTABLE_MAPPING = {'\x00': '', '\x01': '', '\x02': '', '\x03': '', '\x04': '', '\x05': '', '\x06': '',
+                         '\x07': '', '\x08': '', '\x92': "'", '\x9e': 'ï', '\x8e': 'ï', '\x81': 'ï', '\xad': '-'}
+
+MISCELLANEOUS_SYMBOLS_MAPPING = {'\x9e': 'ï', '\x8e': 'ï', '\x81': 'ï', '\xad': '-', '⁓': '~', '∼': '~', '➳': '→',
+                                 '⇒': '→', '⇔': '↔', '⇐': '←', '➤': '→', '˖': '+', 'ʼ': "'", '×': 'x', '‟': '"',
+                                 '‛': "'", 'ϰ': 'κ', 'ϱ': 'ρ', 'ϑ': 'θ', 'ꝙ': 'q', 'ꝛ': 'r', 'Ꝙ': 'Q', 'Ꝛ': 'R',
+                                 'ꝓ': 'p', 'Ꝑ': 'P', '🄰': 'A', '🄱': 'B', '🄲': 'C', '🄳': 'D', '🄴': 'E', '🄵': 'F',
+                                 '🄶': 'G', '🄷': 'H', '🄸': 'I', '🄹': 'J', '🄺': 'K', '🄻': 'L', '🄼': 'M', '🄽': 'N',
+                                 '🄾': 'O', '🄿': 'P', '🅀': 'Q', '🅁': 'R', '🅂': 'S', '🅃': 'T', '🅄': 'U', '🅅': 'V',
+                                 '🅆': 'W', '🅇': 'X', '🅈': 'Y', '🅉': 'Z', '⸢': '[', '⸣': ']', '⸤': '[', '⌋': ']',
+                                 '⌈': '[', '⸥': ']', '⁄': '/', 'µ': 'μ'}
+
+
+@lru_cache(maxsize=None)
+def _get_translation_table(harmonise_functions: Tuple[Callable[[str], str], ...], harmonise_spaces: bool = False) -> list:
+    """Compiles harmonise functions into a ``str.translate`` table, using their ``HARMONISE_FUNCTIONS_MAPPINGS``.
+
+    The table is a list indexed by codepoints, which is much faster to look up than a dict. Each character is mapped to
+    the result of applying the functions' mappings one after the other, and then, if ``harmonise_spaces`` is True,
+    every whitespace character is mapped to a single space.
+    """
+    mappings = [HARMONISE_FUNCTIONS_MAPPINGS[function] for function in harmonise_functions]
+    chars = {char for mapping in mappings for char in mapping}
+    if harmonise_spaces:
+        chars.update(chr(ordinal) for ordinal in range(0x10000) if chr(ordinal).isspace())  # There are none beyond
+
+    table = list(range(max(0x10000, max(map(ord, chars), default=0) + 1)))
+    for char in chars:
+        replacement = char
+        for mapping in mappings:
+            replacement = ''.join(mapping.get(c, c) for c in replacement)
+        if harmonise_spaces:
+            replacement = ''.join(' ' if c.isspace() else c for c in replacement)
+        table[ord(char)] = replacement
+    return table
+
+
 def harmonise_ligatures(text: str) -> str:
-    text = text.replace('ﬁ', 'fi')
-    text = text.replace('ﬂ', 'fl')
-    text = text.replace('ﬀ', 'ff')
-    text = text.replace('ﬃ', 'ffi')
-    text = text.replace('ﬄ', 'ffl')
-    text = text.replace('ﬅ', 'ft')
-    text = text.replace('ﬆ', 'st')
-    return text
+    return text.translate(_get_translation_table((harmonise_ligatures,)))
 
 
 def harmonise_spaces(text: str) -> str:
@@ -29,121 +68,24 @@ def harmonise_spaces(text: str) -> str:
 
 
 def harmonise_punctuation(text: str) -> str:
-    text = text.replace('═', '=')
-    text = text.replace('‟', '"')
-    text = text.replace('⸗', '—')
-    text = text.replace('═', '=')
-    text = text.replace('●', '•')
-    text = text.replace('⟨', '〈')
-    text = text.replace('⟩', '〉')
-    text = text.replace('‐', '-')
-    text = text.replace('‑', '-')
-    text = text.replace('‒', '-')
-    text = text.replace('―', '-')
-    text = text.replace('‥', '..')
-    text = text.replace('…', '...')
-    text = text.replace('‧', '·')
-    text = text.replace('′', "'")  # prime
-    text = text.replace('″', '"')  # double prime
-    text = text.replace('（', '(')
-    text = text.replace('）', ')')
-    text = text.replace('͵', ',')  # greek lower numeral sign to comma)
-    text = text.replace('ʹ', "'")
-    text = text.replace('ʺ', '"')
-    text = text.replace('ʻ', "'")
-    text = text.replace('ʼ', "'")
-    text = text.replace('ʽ', "'")
-    text = text.replace('ˈ', "'")
-    text = text.replace('ˊ', "'")
-    text = text.replace('ˋ', "'")
-    text = text.replace('ˌ', ",")
-    text = text.replace('\x92', "'")
-    return text
+    return text.translate(_get_translation_table((harmonise_punctuation,)))
 
 
 def harmonise_non_printable(text: str) -> str:
-    text = text.replace('\x00', '')
-    text = text.replace('\x01', '')
-    text = text.replace('\x02', '')
-    text = text.replace('\x03', '')
-    text = text.replace('\x04', '')
-    text = text.replace('\x05', '')
-    text = text.replace('\x06', '')
-    text = text.replace('\x07', '')
-    text = text.replace('\x08', '')
-    text = text.replace('\x92', "'")
-    text = text.replace('', 'ï')
-    text = text.replace('', 'ï')
-    text = text.replace('', 'ï')
-    text = text.replace('­', '-')
-    text = text.replace('­', '-')
-    return text
+    return text.translate(_get_translation_table((harmonise_non_printable,)))
 
 
 def harmonise_miscellaneous_symbols(text: str) -> str:
-    text = text.replace('', 'ï')
-    text = text.replace('', 'ï')
-    text = text.replace('', 'ï')
-    text = text.replace('­', '-')
-    text = text.replace('­', '-')
-    text = text.replace('⁓', '~')
-    text = text.replace('∼', '~')
-    text = text.replace('➳', '→')
-    text = text.replace('⇒', '→')
-    text = text.replace('⇔', '↔')
-    text = text.replace('⇐', '←')
-    text = text.replace('⇔', '↔')
-    text = text.replace('➤', '→')
-    text = text.replace('˖', '+')
-    text = text.replace('ʼ', "'")
-    text = text.replace('×', 'x')
-    text = text.replace('‟', '"')
-    text = text.replace('‛', "'")
-    text = text.replace('ϰ', 'κ')
-    text = text.replace('ϱ', 'ρ')
-    text = text.replace('ϑ', 'θ')
-    text = text.replace('‟', '"')
-    text = text.replace('ꝙ', 'q')
-    text = text.replace('ꝛ', 'r')
-    text = text.replace('Ꝙ', 'Q')
-    text = text.replace('Ꝛ', 'R')
-    text = text.replace('ꝓ', 'p')
-    text = text.replace('Ꝑ', 'P')
-    text = text.replace('🄰', 'A')
-    text = text.replace('🄱', 'B')
-    text = text.replace('🄲', 'C')
-    text = text.replace('🄳', 'D')
-    text = text.replace('🄴', 'E')
-    text = text.replace('🄵', 'F')
-    text = text.replace('🄶', 'G')
-    text = text.replace('🄷', 'H')
-    text = text.replace('🄸', 'I')
-    text = text.replace('🄹', 'J')
-    text = text.replace('🄺', 'K')
-    text = text.replace('🄻', 'L')
-    text = text.replace('🄼', 'M')
-    text = text.replace('🄽', 'N')
-    text = text.replace('🄾', 'O')
-    text = text.replace('🄿', 'P')
-    text = text.replace('🅀', 'Q')
-    text = text.replace('🅁', 'R')
-    text = text.replace('🅂', 'S')
-    text = text.replace('🅃', 'T')
-    text = text.replace('🅄', 'U')
-    text = text.replace('🅅', 'V')
-    text = text.replace('🅆', 'W')
-    text = text.replace('🅇', 'X')
-    text = text.replace('🅈', 'Y')
-    text = text.replace('🅉', 'Z')
-    text = text.replace('⸢', '[')
-    text = text.replace('⸣', ']')
-    text = text.replace('⸤', '[')
-    text = text.replace('⌋', ']')
-    text = text.replace('⌈', '[')
-    text = text.replace('⸥', ']')
-    text = text.replace('⁄', '/')
-    text = text.replace('µ', 'μ')
-    return text
+    return text.translate(_get_translation_table((harmonise_miscellaneous_symbols,)))
+
+
+# The mappings of the harmonise functions, which ``harmonise_unicode`` compiles into a single translation table
+HARMONISE_FUNCTIONS_MAPPINGS = {harmonise_ligatures: LIGATURES_MAPPING,
+                                harmonise_punctuation: PUNCTUATION_MAPPING,
+                                harmonise_non_printable: NON_PRINTABLE_MAPPING,
+                                harmonise_miscellaneous_symbols: MISCELLANEOUS_SYMBOLS_MAPPING}
+
+_SPACES_PATTERN = re.compile(' {2,}')
 
 
 def harmonise_unicode(text: str,
@@ -152,16 +94,21 @@ def harmonise_unicode(text: str,
     """Harmonise unicode characters.
 
     Note:
-        This function takes an ``NFC`` string and returns an ``NFC`` string.
+        This function takes an ``NFC`` string and returns an ``NFC`` string. If all the ``harmonise_functions`` are in
+        ``HARMONISE_FUNCTIONS_MAPPINGS``, they are compiled (once per tuple of functions) together with the
+        harmonisation of spaces into a single translation table, so that the text is processed in a single pass.
 
     Args:
         text (str): The text to harmonise.
         harmonise_functions (tuple): A tuple of functions to apply to the text. Each function should take an NFC string as input and return an NFC string as output.
-        harmonise_space_chars (bool): Whether to harmonise space characters.
 
     Returns:
         str: The harmonised text (an ``NFC`` string).
     """
+    if all(function in HARMONISE_FUNCTIONS_MAPPINGS for function in harmonise_functions):
+        table = _get_translation_table(tuple(harmonise_functions), harmonise_spaces=True)
+        return _SPACES_PATTERN.sub(' ', text.translate(table))
+
     for function in harmonise_functions:
         text = function(text)
     return harmonise_spaces(text)
@@ -213,6 +160,57 @@ CHARSETS_CHARS_NFD = {charset: ''.join(set(unicodedata.normalize('NFD', charset_
 
 CHARSETS_PATTERNS = {charset: re.compile(rf'[{charset_chars}]', re.UNICODE) for charset, charset_chars in CHARSETS_CHARS_NFC.items()}
 
+# Each charset is given a bit, in the order of ``CHARSETS_RANGES``, so that a character can belong to several charsets
+CHARSETS_BITS = {charset: 1 << i for i, charset in enumerate(CHARSETS_RANGES.keys())}
+
+
+def _get_chars_masks(charsets_chars: Dict[str, str]) -> Dict[int, int]:
+    """Maps the codepoints of the chars in ``charsets_chars`` to the bitwise or of the bits of their charsets."""
+    masks = {}
+    for charset, charset_chars in charsets_chars.items():
+        for char in charset_chars:
+            masks[ord(char)] = masks.get(ord(char), 0) | CHARSETS_BITS[charset]
+    return masks
+
+
+@lru_cache(maxsize=None)
+def _get_charsets_table(nfd: bool) -> str:
+    """Builds a ``str.translate`` table mapping each BMP codepoint to ``chr(mask)``, ``mask`` being the bitwise or of
+    the bits of the charsets the codepoint belongs to (``0`` if it belongs to none)."""
+    masks = [0] * 0x10000
+    for ordinal, mask in _get_chars_masks(CHARSETS_CHARS_NFD if nfd else CHARSETS_CHARS_NFC).items():
+        masks[ordinal] = mask
+    return ''.join(map(chr, masks))
+
+
+# The masks which actually occur, and the charsets they belong to
+CHARSETS_MASKS = {chr(mask): [charset for charset, bit in CHARSETS_BITS.items() if mask & bit]
+                  for mask in sorted({*_get_chars_masks(CHARSETS_CHARS_NFC).values(),
+                                      *_get_chars_masks(CHARSETS_CHARS_NFD).values()})}
+
+
+def get_chars_charsets_masks(string: str, nfd: bool = False) -> str:
+    """Classifies all the characters of ``string`` in a single pass.
+
+    Args:
+        string: The string to classify, NFC-normalized unless ``nfd`` is True.
+        nfd: Whether ``string`` is NFD-normalized.
+
+    Returns:
+        str: A string of the same length as ``string``, whose ``i``-th character is ``chr(mask)``, ``mask`` being the
+        bitwise or of the ``CHARSETS_BITS`` of the charsets ``string[i]`` belongs to. Characters which belong to no
+        charset are mapped to ``chr(0)``, except those beyond the BMP which are left unchanged.
+    """
+    return string.translate(_get_charsets_table(nfd))
+
+
+def _get_mask_charset(mask: str, fallback: str) -> str:
+    """Returns the first charset in ``mask``, as returned by ``get_chars_charsets_masks``, ``fallback`` if none."""
+    try:
+        return CHARSETS_MASKS[mask][0]
+    except KeyError:
+        return fallback
+
 
 def chunk_string_by_charsets(string: str, fallback: str = 'latin'):
     """Chunk a string by character set, returning a list of tuples of the form (chunk, charset).
@@ -227,33 +225,51 @@ def chunk_string_by_charsets(string: str, fallback: str = 'latin'):
     Returns:
         list: A list of tuples of the form (chunk, charset).
     """
-
+    masks = get_chars_charsets_masks(string)
     chunks = []
-    chunk = string[0]
-    chunk_charset = get_char_charset(chunk, fallback=fallback)
-
-    for char in string[1:]:
-        char_charset = get_char_charset(char, fallback=fallback)
+    chunk_start = 0
+    chunk_charset = _get_mask_charset(masks[0], fallback=fallback)
 
-        if any([re.match(r'\s', char),
-                char_charset == chunk_charset]):
-            chunk += char
+    for i in range(1, len(string)):
+        if string[i].isspace():  # Whitespaces are appended to the current chunk
+            continue
 
-        else:
-            chunks.append((chunk, chunk_charset))
-            chunk, chunk_charset = char, char_charset
+        char_charset = _get_mask_charset(masks[i], fallback=fallback)
+        if char_charset != chunk_charset:
+            chunks.append((string[chunk_start:i], chunk_charset))
+            chunk_start, chunk_charset = i, char_charset
 
-    chunks.append((chunk, chunk_charset))
+    chunks.append((string[chunk_start:], chunk_charset))
     return chunks
 
 
 def get_char_charset(char: str, fallback: str = 'fallback') -> str:
     """Returns the charset of a character, if any, ``fallback`` otherwise."""
-    for charset_name, charset_chars in CHARSETS_CHARS_NFC.items():
-        if char in charset_chars:
-            return charset_name
-    else:
-        return fallback
+    return _get_mask_charset(get_chars_charsets_masks(char), fallback=fallback)
+
+
+def count_chars_by_charsets(string: str, nfd: bool = False) -> Dict[str, int]:
+    """Counts the number of chars of each unicode characters set, in a single pass over ``string``.
+
+    Example:
+        ``count_chars_by_charsets('γεια σας, world')`` returns ``{'latin': 5, 'greek': 7, 'numeral': 0,
+        'punctuation': 3}``.
+
+    Args:
+        string: a NFC-normalized string, or a NFD-normalized string if ``nfd`` is True.
+        nfd: Whether ``string`` is NFD-normalized.
+
+    Returns:
+        dict: A mapping between each charset in ``CHARSETS_RANGES`` and its number of characters in ``string``.
+    """
+    masks = get_chars_charsets_masks(string, nfd=nfd)
+    counts = {charset: 0 for charset in CHARSETS_BITS}
+    for mask, charsets in CHARSETS_MASKS.items():
+        mask_count = masks.count(mask)
+        if mask_count:
+            for charset in charsets:
+                counts[charset] += mask_count
+    return counts
 
 
 def count_chars_by_charset(string: str, charset: str) -> int:
@@ -263,6 +279,9 @@ def count_chars_by_charset(string: str, charset: str) -> int:
         ``count_chars_by_charset('γεια σας, world', 'greek')`` returns ``7`` as there are 7 greek
         chars in ``string``.
 
+    Note:
+        To count the chars of several charsets, use ``count_chars_by_charsets``, which counts them all at once.
+
     Args:
         string: a NFC-normalized string (default). For NFD-normalized strings, use ``count_chars_by_charset_nfd``.
         charset: should be ``'greek'``, ``'latin'``, ``'numeral'``, ``'punctuation'``.
@@ -270,7 +289,7 @@ def count_chars_by_charset(string: str, charset: str) -> int:
     Returns:
         int: the number of charset-matching characters in ``string``.
     """
-    return sum([c in CHARSETS_CHARS_NFC[charset] for c in string])
+    return count_chars_by_charsets(string)[charset]
 
 
 def count_chars_by_charset_nfd(string: str, charset: str) -> int:
@@ -287,7 +306,7 @@ def count_chars_by_charset_nfd(string: str, charset: str) -> int:
     Returns:
         int: the number of charset-matching characters in ``string``.
     """
-    return sum([c in CHARSETS_CHARS_NFD[charset] for c in string])
+    return count_chars_by_charsets(string, nfd=True)[charset]
 
 
 def is_charset_string(string: str,
@@ -305,11 +324,11 @@ def is_charset_string(string: str,
                 ``'punctuation'`` are considered.
     """
 
+    counts = count_chars_by_charsets(string)
     if strict:
-        return safe_divide(count_chars_by_charset(string=string, charset=charset), len(string)) >= threshold
+        return safe_divide(counts[charset], len(string)) >= threshold
     else:
-        return safe_divide(sum(count_chars_by_charset(string, charset_) for charset_ in [charset, 'numeral', 'punctuation']),
-                           len(string)) >= threshold
+        return safe_divide(sum(counts[charset_] for charset_ in [charset, 'numeral', 'punctuation']), len(string)) >= threshold
 
 
 def is_charset_string_nfd(string: str,
@@ -326,10 +345,11 @@ def is_charset_string_nfd(string: str,
                 ``'punctuation'`` are considered.
     """
 
+    counts = count_chars_by_charsets(string, nfd=True)
     if strict:
-        return count_chars_by_charset_nfd(string=string, charset=charset) / len(string) >= threshold
+        return counts[charset] / len(string) >= threshold
     else:
-        return sum(count_chars_by_charset_nfd(string, charset_) for charset_ in [charset, 'numeral', 'punctuation']) / len(string) >= threshold
+        return sum(counts[charset_] for charset_ in [charset, 'numeral', 'punctuation']) / len(string) >= threshold
 
 
 def get_char_unicode_name(char: str) -> str:
@@ -348,8 +368,16 @@ def remove_diacritics(s: str) -> str:
     Example:
 
     >>> remove_diacritics("μῆνιν ἄειδε, θεά")
-    'μηνιν αειδε θεα'
+    'μηνιν αειδε, θεα'
     """
-    nfkd_form = unicodedata.normalize("NFKD", s)
-    return "".join([c for c in nfkd_form if not unicodedata.combining(c)])
+    return unicodedata.normalize("NFKD", s).translate(_get_combining_chars_table())
+
 
+@lru_cache(maxsize=None)
+def _get_combining_chars_table() -> list:
+    """Gets a ``str.translate`` table which deletes combining characters, see ``_get_translation_table``."""
+    combining = [ordinal for ordinal in range(sys.maxunicode + 1) if unicodedata.combining(chr(ordinal))]
+    table = list(range(combining[-1] + 1))
+    for ordinal in combining:
+        table[ordinal] = None
+    return table
@@ -21,19 +21,45 @@ TYPESYSTEM_PATH = PACKAGE_DIR / 'ajmc/data/templates/TypeSystem.xml'
 # AJMC DATA DIR AND STRUCTURE
 EXEC_ENV = platform.uname().node
 
-if os.getenv('AJMC_DATA_DIR'):
-    AJMC_DATA_DIR = Path(os.getenv('AJMC_DATA_DIR'))
-else:
-    AJMC_DATA_DIR = Path(input("""WARNING: Unknown execution environment!
-    Please enter the root directory to AjMC data (i.e. the directory containing the 'commentaries_data', 'AjMC-NE-corpus' and `lemma-linkage-corpus` 
-    directories). Note: you can change this permanently by adding ``export AJMC_DATA_DIR="/your/data/root/dir"`` 
-    in your .bashrc.
-    """))
-
-COMMS_DATA_DIR = AJMC_DATA_DIR / 'commentaries_data'
-NE_CORPUS_DIR = AJMC_DATA_DIR / 'AjMC-NE-corpus'
-LEMLINK_CORPUS_DIR = AJMC_DATA_DIR / 'lemma-linkage-corpus'
-LEMLINK_XMI_DIR = LEMLINK_CORPUS_DIR / 'data/preparation/corpus/annotated'
+
+def _get_ajmc_data_dir() -> Path:
+    if not os.getenv('AJMC_DATA_DIR'):
+        raise RuntimeError("""The AjMC data directory is unknown. Please set the AJMC_DATA_DIR environment variable to
+    the root directory of AjMC data (i.e. the directory containing the 'commentaries_data', 'AjMC-NE-corpus' and
+    `lemma-linkage-corpus` directories), for instance by adding ``export AJMC_DATA_DIR="/your/data/root/dir"`` in your
+    .bashrc. Alternatively, set ``ajmc.commons.variables.AJMC_DATA_DIR`` (or the directory you need) at runtime.""")
+    return Path(os.getenv('AJMC_DATA_DIR'))
+
+
+def _get_variable(name: str):
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def _get_cache_dir(env_variable: str, data_rel_dir: str) -> Path:
+    return Path(os.getenv(env_variable)) if os.getenv(env_variable) else _get_variable('AJMC_DATA_DIR') / data_rel_dir
+
+
+# The paths which depend on ``AJMC_DATA_DIR`` are only evaluated when they are first accessed (see ``__getattr__``), so
+# that importing ``ajmc`` neither requires the data directory nor prompts for it. Like any variable, they can be
+# overridden at runtime, e.g. with ``variables.COMMS_DATA_DIR = Path(...)``.
+_LAZY_VARIABLES = {
+    'AJMC_DATA_DIR': _get_ajmc_data_dir,
+    'COMMS_DATA_DIR': lambda: _get_variable('AJMC_DATA_DIR') / 'commentaries_data',
+    'NE_CORPUS_DIR': lambda: _get_variable('AJMC_DATA_DIR') / 'AjMC-NE-corpus',
+    'LEMLINK_CORPUS_DIR': lambda: _get_variable('AJMC_DATA_DIR') / 'lemma-linkage-corpus',
+    'LEMLINK_XMI_DIR': lambda: _get_variable('LEMLINK_CORPUS_DIR') / 'data/preparation/corpus/annotated',
+    'PARSED_OCR_CACHE_DIR': lambda: _get_cache_dir('AJMC_PARSED_OCR_CACHE_DIR', '.cache/parsed_ocr'),
+    'CONTOURS_CACHE_DIR': lambda: _get_cache_dir('AJMC_CONTOURS_CACHE_DIR', '.cache/contours'),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_VARIABLES:
+        globals()[name] = _LAZY_VARIABLES[name]()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 FONTS_DIR = PACKAGE_DIR / 'data/fonts/fonts'
 
 # RELATIVE PATHS
@@ -52,7 +78,7 @@ COMM_BEST_OCR_GLOB = "*tess_retrained"
 
 
 def get_comm_root_dir(comm_id: str) -> Path:
-    return COMMS_DATA_DIR / comm_id
+    return _get_variable('COMMS_DATA_DIR') / comm_id
 
 
 def get_comm_img_dir(comm_id: str) -> Path:
@@ -117,6 +143,15 @@ def get_comm_canonical_path_from_ocr_run_pattern(comm_id: str, ocr_run_pattern:
         raise FileNotFoundError(f'No canonical found for comm_id={comm_id} and ocr_run_pattern={ocr_run_pattern}')
 
 
+def get_comm_canonical_binary_dir_from_ocr_run_pattern(comm_id: str, ocr_run_pattern: str) -> Path:
+    if not ocr_run_pattern.endswith(CANONICAL_BINARY_SUFFIX):
+        ocr_run_pattern += CANONICAL_BINARY_SUFFIX
+    try:
+        return next(get_comm_canonical_dir(comm_id).glob(ocr_run_pattern))
+    except StopIteration:
+        raise FileNotFoundError(f'No binary canonical found for comm_id={comm_id} and ocr_run_pattern={ocr_run_pattern}')
+
+
 def get_comm_sections_path(comm_id: str) -> Path:
     return get_comm_root_dir(comm_id) / COMM_SECTIONS_REL_PATH
 
@@ -134,11 +169,13 @@ SPREADSHEETS = {
 # ======================================================================================================================
 
 OCR_OUTPUTS_EXTENSIONS = ['.hocr', '.xml', '.html', '.json']
+DEFAULT_OCR_PARSER = 'lxml'  # Either 'lxml' or 'bs4', see ``RawCommentary.ocr_parser``
 
 DEFAULT_IMG_EXTENSION = '.png'
 OLR_PREFIX = '_OLR_'
 OCR_GT_PREFIX = 'OCRGT_'
 DEFAULT_OCR_RUN_ID = '*_tess_retrained'
+CANONICAL_BINARY_SUFFIX = '.bin'  # Suffix of the directories containing binary canonical commentaries
 
 # ======================================================================================================================
 #                                                 COMMENTARIES
@@ -513,3 +550,6 @@ PARAMETERS = {
     'words_line_inclusion_threshold': 0.7,
     'word_annotation_inclusion_threshold': 0.80,
 }
+
+# The byte budget of ``ajmc.commons.image.IMAGE_CACHE``, which keeps decoded images in memory
+IMAGE_CACHE_MAX_BYTES = int(os.getenv('AJMC_IMAGE_CACHE_MAX_BYTES', 2 * 1024 ** 3))
@@ -209,9 +209,10 @@ def clean_source_dataset(dts_dir: Union[Path, str],
 def make_clean_ajmc_dataset(output_dir: Path = ocr_vs.get_dataset_dir('ajmc'),
                             comm_ids: List[str] = vs.ALL_COMM_IDS,
                             unicode_form: str = ocr_vs.UNICODE_FORM,
-                            root_dir=Path(vs.COMMS_DATA_DIR),
+                            root_dir: Optional[Path] = None,
                             overwrite=False):
     """Uses``CanonicalCommentary.export_gt_file_pairs`` to export an ocr dataset for given commentary ids."""
+    root_dir = Path(vs.COMMS_DATA_DIR) if root_dir is None else Path(root_dir)
 
     controle_overwrite(output_dir, overwrite=overwrite)
 
@@ -0,0 +1,180 @@
+"""Bulk export of line image/text pairs, either as loose files or as tar shards, and reading of the shards.
+
+Shards are plain tar files in the WebDataset layout: each line is stored as two consecutive members, ``{key}.png`` and
+``{key}.txt``. Each shard directory also contains an ``index.tsv`` file, which records for every line the shard it is in
+and the offsets and sizes of its members, so that single lines can be read without scanning the shards.
+"""
+
+import io
+import tarfile
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ajmc.commons import variables as vs
+from ajmc.commons.miscellaneous import get_ajmc_logger
+from ajmc.ocr import variables as ocr_vs
+
+logger = get_ajmc_logger(__name__)
+
+SHARD_INDEX_NAME = 'index.tsv'
+SHARD_INDEX_COLUMNS = ['key', 'shard', 'img_offset', 'img_size', 'text_offset', 'text_size']
+
+
+class ShardedLine:
+    """A line image/text pair stored in a shard, as listed in the shards' index."""
+
+    def __init__(self, key: str, shard_path: Path, img_offset: int, img_size: int, text_offset: int, text_size: int):
+        self.key = key
+        self.shard_path = shard_path
+        self.img_offset = img_offset
+        self.img_size = img_size
+        self.text_offset = text_offset
+        self.text_size = text_size
+
+    @property
+    def stem(self) -> str:
+        """The key of the line, which plays the role of a loose image's ``Path.stem``."""
+        return self.key
+
+    def read(self) -> Tuple[bytes, str]:
+        """Reads the line's encoded image and its text."""
+        with open(self.shard_path, 'rb') as f:
+            f.seek(self.img_offset)
+            img_bytes = f.read(self.img_size)
+            f.seek(self.text_offset)
+            text = f.read(self.text_size).decode('utf-8')
+        return img_bytes, text
+
+
+class LineShardWriter:
+    """Writes line image/text pairs to numbered tar shards of ``shard_size`` lines, and their index."""
+
+    def __init__(self, output_dir: Path, shard_size: int, prefix: str = 'shard'):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.prefix = prefix
+        self.shard_count = 0
+        self._tar: Optional[tarfile.TarFile] = None
+        self._lines_in_shard = 0
+        self._index = open(self.output_dir / SHARD_INDEX_NAME, 'w', encoding='utf-8')
+        self._index.write('\t'.join(SHARD_INDEX_COLUMNS) + '\n')
+
+    def _add_member(self, name: str, data: bytes) -> int:
+        """Adds a member to the current shard and returns the offset of its data."""
+        tarinfo = tarfile.TarInfo(name)
+        tarinfo.size = len(data)
+        self._tar.addfile(tarinfo, io.BytesIO(data))
+        return self._tar.offset - -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+    def write(self, key: str, img_bytes: bytes, text: str):
+        """Writes a line's encoded image and its text to the current shard, opening a new shard if needed."""
+        if self._tar is None or self._lines_in_shard >= self.shard_size:
+            self._close_shard()
+            self._tar = tarfile.open(self.output_dir / f'{self.prefix}-{self.shard_count:06d}.tar', 'w', format=tarfile.USTAR_FORMAT)
+            self.shard_count += 1
+
+        text_bytes = text.encode('utf-8')
+        img_offset = self._add_member(key + ocr_vs.IMG_EXTENSION, img_bytes)
+        text_offset = self._add_member(key + ocr_vs.GT_TEXT_EXTENSION, text_bytes)
+        self._index.write(f'{key}\t{Path(self._tar.name).name}\t{img_offset}\t{len(img_bytes)}\t{text_offset}\t{len(text_bytes)}\n')
+        self._lines_in_shard += 1
+
+    def _close_shard(self):
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+            self._lines_in_shard = 0
+
+    def close(self):
+        self._close_shard()
+        self._index.close()
+
+    def __enter__(self) -> 'LineShardWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_line_shards_index(shards_dir: Path) -> List[ShardedLine]:
+    """Reads the index of the shards in ``shards_dir``, see ``LineShardWriter``."""
+    shards_dir = Path(shards_dir)
+    lines = []
+    with open(shards_dir / SHARD_INDEX_NAME, encoding='utf-8') as f:
+        next(f)  # Skip the header
+        for row in f:
+            key, shard, img_offset, img_size, text_offset, text_size = row.rstrip('\n').split('\t')
+            lines.append(ShardedLine(key, shards_dir / shard, int(img_offset), int(img_size), int(text_offset), int(text_size)))
+    return lines
+
+
+def iter_line_shard(shard_path: Path) -> Iterator[Tuple[str, bytes, str]]:
+    """Streams the lines of a shard, yielding their key, encoded image and text."""
+    with tarfile.open(shard_path, 'r|') as tar:
+        img_bytes = None
+        for member in tar:
+            key, extension = member.name.rsplit('.', 1)
+            data = tar.extractfile(member).read()
+            if '.' + extension == ocr_vs.IMG_EXTENSION:
+                img_bytes = data
+            else:
+                yield key, img_bytes, data.decode('utf-8')
+
+
+def export_line_pairs(pages: Iterable[vs.PageType],
+                      output_dir: Path,
+                      unicode_format: str = 'NFC',
+                      shard_size: Optional[int] = None,
+                      workers: int = 8) -> int:
+    """Exports the image/text pairs of the lines of ``pages``, named ``{page.id}_{line_number}``.
+
+    Note:
+        Each page image is decoded once, its lines are cropped with NumPy slicing (like ``AjmcImage.crop``) and the
+        crops are encoded in a thread pool.
+
+    Args:
+        pages: The pages whose lines to export.
+        output_dir: The directory to which the pairs or the shards are written.
+        unicode_format: The unicode format to which the text should be normalized.
+        shard_size: If given, the pairs are written to tar shards of ``shard_size`` lines with an index (see
+            ``LineShardWriter``) rather than as loose files.
+        workers: The number of threads encoding the images.
+
+    Returns:
+        The number of exported lines.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    writer = LineShardWriter(output_dir, shard_size) if shard_size else None
+
+    def encode(crop: np.ndarray) -> bytes:
+        return cv2.imencode(ocr_vs.IMG_EXTENSION, crop)[1].tobytes()
+
+    count = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for page in pages:
+                matrix = page.image.matrix
+                lines = page.children.lines
+                crops = [matrix[l.bbox.bbox[0][1]:l.bbox.bbox[1][1], l.bbox.bbox[0][0]:l.bbox.bbox[1][0], :] for l in lines]
+                for i, (line, img_bytes) in enumerate(zip(lines, executor.map(encode, crops))):
+                    key = f'{page.id}_{i}'
+                    text = unicodedata.normalize(unicode_format, line.text)
+                    if writer is not None:
+                        writer.write(key, img_bytes, text)
+                    else:
+                        (output_dir / (key + ocr_vs.IMG_EXTENSION)).write_bytes(img_bytes)
+                        (output_dir / (key + ocr_vs.GT_TEXT_EXTENSION)).write_text(text, encoding='utf-8')
+                    count += 1
+    finally:
+        if writer is not None:
+            writer.close()
+
+    logger.info(f'Exported {count} lines to {output_dir}.')
+    return count
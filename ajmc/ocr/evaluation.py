@@ -11,15 +11,17 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 import Levenshtein
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 
-from ajmc.commons import variables as vs
+from ajmc.commons import tracing, variables as vs
 from ajmc.commons.arithmetic import safe_divide
-from ajmc.commons.geometry import are_bboxes_overlapping_with_threshold, is_bbox_within_bbox
+from ajmc.commons.geometry import ShapeArray
 from ajmc.commons.miscellaneous import get_ajmc_logger
-from ajmc.commons.unicode_utils import harmonise_unicode, count_chars_by_charset, CHARSETS_PATTERNS
+from ajmc.commons.unicode_utils import CHARSETS_BITS, CHARSETS_MASKS, CHARSETS_PATTERNS, count_chars_by_charsets, \
+    get_chars_charsets_masks, harmonise_unicode
 from ajmc.ocr import variables as ocr_vs
 from ajmc.text_processing.raw_classes import RawCommentary, RawPage
 
@@ -122,6 +124,11 @@ def count_errors_by_charset(gt_string: str, pred_string: str, charset: str) -> i
         ``count_errors_by_charset('Hεll_ World1', 'ηειι- world', 'greek')`` returns ``3`` as among the 4 greek
         chars in ``gt``, 3 are misrecognized.
 
+    Note:
+        For the predefined charsets, characters are classified as in ``count_chars_by_charset``. Unlike the former
+        ``CHARSETS_PATTERNS['punctuation']``, which read ``\\`` as an escape, this counts errors on backslashes as
+        punctuation errors.
+
     Args:
         pred_string: prediction/source string
         gt_string: groundtruth/destination string
@@ -132,11 +139,10 @@ def count_errors_by_charset(gt_string: str, pred_string: str, charset: str) -> i
         int: the number of errors on selected caracters in ``pred_string``
     """
 
-    try:
-        pattern = CHARSETS_PATTERNS[charset]
-    except KeyError:
-        pattern = re.compile(charset, re.UNICODE)
+    if charset in CHARSETS_BITS:
+        return count_errors_by_charsets(gt_string, pred_string)[charset]
 
+    pattern = re.compile(charset, re.UNICODE)
     indices = [m.span()[0] for m in re.finditer(pattern, gt_string)]
     editops = Levenshtein.editops(pred_string, gt_string)
 
@@ -144,6 +150,39 @@ def count_errors_by_charset(gt_string: str, pred_string: str, charset: str) -> i
     return sum([1 for e in editops if min(e[2], len(gt_string) - 1) in indices])
 
 
+def count_errors_by_charsets(gt_string: str,
+                             pred_string: str,
+                             editops: Optional[List[Tuple[str, int, int]]] = None) -> Dict[str, int]:
+    """Counts the number of errors among the characters of each unicode character set at once.
+
+    Note:
+        This is equivalent to calling ``count_errors_by_charset`` for each charset, but classifies the characters of
+        ``gt_string`` and computes the edit operations only once. Backslashes are punctuation characters (see
+        ``count_errors_by_charset``).
+
+    Args:
+        gt_string: groundtruth/destination string
+        pred_string: prediction/source string
+        editops: The edit operations from ``pred_string`` to ``gt_string``, if they are already computed.
+
+    Returns:
+        dict: A mapping between each charset in ``CHARSETS_BITS`` and its number of errors in ``pred_string``.
+    """
+    counts = {charset: 0 for charset in CHARSETS_BITS}
+    if not gt_string:
+        return counts
+
+    if editops is None:
+        editops = Levenshtein.editops(pred_string, gt_string)
+
+    masks = get_chars_charsets_masks(gt_string)
+    for e in editops:
+        # min() is there to cope with insertion at the end of the string
+        for charset in CHARSETS_MASKS.get(masks[min(e[2], len(gt_string) - 1)], []):
+            counts[charset] += 1
+    return counts
+
+
 def write_error_counts(bow_error_counts: dict,
                        coord_error_counts: dict,
                        output_dir: str):
@@ -178,6 +217,7 @@ def write_editops_record(editops_record: dict, output_dir: Path):
 # ======================================================================================================================
 
 # 👁️ add fuzzy eval
+@tracing.traced('bag_of_word_evaluation')
 def bag_of_word_evaluation(gt_bag: List[str],
                            pred_bag: List[str],
                            error_counts: Optional[Dict[str, Union[int, float]]] = None,
@@ -251,28 +291,29 @@ def simple_coordinates_based_evaluation(gt_words: List[Union['CanonicalWord', 'R
          float: the character error rate
     """
 
-    pred_words_ = pred_words.copy()
+    preds_overlapping_gts = ShapeArray.from_shapes([w.bbox for w in pred_words]).overlapping_with_threshold(
+        ShapeArray.from_shapes([w.bbox for w in gt_words]), overlap_threshold)
+    is_pred_word_matched = np.zeros(len(pred_words), dtype=bool)
     matched_words = 0
     total_characters = 0
     total_edit_distance = 0
 
-    for gt_word in gt_words:
+    for j, gt_word in enumerate(gt_words):
 
-        for i, pred_word in enumerate(pred_words_):
-            if are_bboxes_overlapping_with_threshold(pred_word.bbox.bbox,
-                                                     gt_word.bbox.bbox,
-                                                     overlap_threshold):
-                total_characters += len(gt_word.text)
-                total_edit_distance += Levenshtein.distance(pred_word.text, gt_word.text)
-                matched_words += 1
-                del pred_words_[i]
-                break
+        for i in np.flatnonzero(preds_overlapping_gts[:, j] & ~is_pred_word_matched):
+            pred_word = pred_words[i]
+            total_characters += len(gt_word.text)
+            total_edit_distance += Levenshtein.distance(pred_word.text, gt_word.text)
+            matched_words += 1
+            is_pred_word_matched[i] = True
+            break
 
     logger.info(f"""Evaluating on {matched_words} words, for a total of {len(gt_words)} words.""")
 
     return total_edit_distance / total_characters
 
 
+@tracing.traced('coord_based_page_evaluation')
 def coord_based_page_evaluation(gt_page: 'RawPage',
                                 pred_page: 'RawPage',
                                 word_overlap_threshold: Optional[float] = 0.8,
@@ -309,7 +350,7 @@ def coord_based_page_evaluation(gt_page: 'RawPage',
 
     soup = initialize_soup(img_width=gt_page.image.width, img_height=gt_page.image.height)  # Initialize html output
     charsets = ['latin', 'greek', 'punctuation', 'numeral']
-    pred_words_ = pred_page.children.words.copy()
+    pred_words = pred_page.children.words
 
     if not error_counts:
         error_counts = {region:
@@ -321,53 +362,60 @@ def coord_based_page_evaluation(gt_page: 'RawPage',
     if not editops_record:
         editops_record = {}
 
-    for gt_word in gt_page.children.words:
+    # Compute the pairwise relations between boxes at once
+    gt_words_array = ShapeArray.from_shapes([w.bbox for w in gt_page.children.words])
+    gt_words_in_regions = gt_words_array.within(ShapeArray.from_shapes([r.bbox for r in gt_page.children.regions]))
+    preds_overlapping_gts = ShapeArray.from_shapes([w.bbox for w in pred_words]).overlapping_with_threshold(
+        gt_words_array, word_overlap_threshold)
+    is_pred_word_matched = np.zeros(len(pred_words), dtype=bool)
+
+    for j, gt_word in enumerate(gt_page.children.words):
 
         # Find ``gt_word``'s regions
-        gt_word_regions = ['global'] + [r.region_type for r in gt_page.children.regions if
-                                        is_bbox_within_bbox(gt_word.bbox.bbox,
-                                                            r.bbox.bbox)]
+        gt_word_regions = ['global'] + [gt_page.children.regions[k].region_type
+                                        for k in np.flatnonzero(gt_words_in_regions[j])]
 
+        gt_word_charsets_counts = count_chars_by_charsets(gt_word.text)
         for region in gt_word_regions:
             error_counts[region]['words']['total'] += 1
             error_counts[region]['chars']['total'] += len(gt_word.text)
             for charset in charsets:
-                error_counts[region][charset]['total'] += count_chars_by_charset(gt_word.text, charset)
+                error_counts[region][charset]['total'] += gt_word_charsets_counts[charset]
 
-        # Find the corresponding ocr_word
-        for i, pred_word in enumerate(pred_words_):
-            if are_bboxes_overlapping_with_threshold(pred_word.bbox.bbox,
-                                                     gt_word.bbox.bbox, word_overlap_threshold):
-                distance = Levenshtein.distance(pred_word.text, gt_word.text)
+        # Find the corresponding ocr_word, i.e. the first overlapping predicted word which is not matched yet
+        for i in np.flatnonzero(preds_overlapping_gts[:, j] & ~is_pred_word_matched):
+            pred_word = pred_words[i]
+            distance = Levenshtein.distance(pred_word.text, gt_word.text)
+            editops = Levenshtein.editops(pred_word.text, gt_word.text)
+            charsets_errors = count_errors_by_charsets(gt_word.text, pred_word.text, editops=editops)
 
-                for region in gt_word_regions:
+            for region in gt_word_regions:
 
-                    # Count evaluated words and false words
-                    error_counts[region]['words']['evaluated'] += 1
-                    error_counts[region]['words']['false'] += min(1, distance)
+                # Count evaluated words and false words
+                error_counts[region]['words']['evaluated'] += 1
+                error_counts[region]['words']['false'] += min(1, distance)
 
-                    # Count evaluated chars and errors
-                    error_counts[region]['chars']['evaluated'] += len(gt_word.text)
-                    error_counts[region]['chars']['false'] += distance
+                # Count evaluated chars and errors
+                error_counts[region]['chars']['evaluated'] += len(gt_word.text)
+                error_counts[region]['chars']['false'] += distance
 
-                    # Count evaluated chars and errors by charset
-                    for charset in charsets:
-                        error_counts[region][charset]['evaluated'] += count_chars_by_charset(gt_word.text, charset)
-                        error_counts[region][charset]['false'] += count_errors_by_charset(gt_word.text, pred_word.text,
-                                                                                          charset)
+                # Count evaluated chars and errors by charset
+                for charset in charsets:
+                    error_counts[region][charset]['evaluated'] += gt_word_charsets_counts[charset]
+                    error_counts[region][charset]['false'] += charsets_errors[charset]
 
-                # Record edit operations
-                editops_record = record_editops(gt_word=gt_word.text,
-                                                ocr_word=pred_word.text,
-                                                editops=Levenshtein.editops(pred_word.text, gt_word.text),
-                                                editops_record=editops_record)
+            # Record edit operations
+            editops_record = record_editops(gt_word=gt_word.text,
+                                            ocr_word=pred_word.text,
+                                            editops=editops,
+                                            editops_record=editops_record)
 
-                # Actualize soup
-                soup = insert_text_in_soup(soup=soup, word=gt_word, is_gt=True, is_false=bool(distance))
-                soup = insert_text_in_soup(soup=soup, word=pred_word, is_gt=False, is_false=bool(distance))
+            # Actualize soup
+            soup = insert_text_in_soup(soup=soup, word=gt_word, is_gt=True, is_false=bool(distance))
+            soup = insert_text_in_soup(soup=soup, word=pred_word, is_gt=False, is_false=bool(distance))
 
-                del pred_words_[i]
-                break
+            is_pred_word_matched[i] = True
+            break
 
     # Compute error rates
     for region in ['global'] + vs.ORDERED_OLR_REGION_TYPES:
@@ -378,6 +426,7 @@ def coord_based_page_evaluation(gt_page: 'RawPage',
     return editops_record, error_counts, soup
 
 
+@tracing.traced('commentary_evaluation')
 def commentary_evaluation(commentary: 'RawCommentary',
                           write_files: bool = True,
                           output_dir: Optional[str] = None,
@@ -407,6 +456,7 @@ def commentary_evaluation(commentary: 'RawCommentary',
                                                                         error_counts=coord_error_counts,
                                                                         editops_record=editops)
         soups.append(soup)
+        tracing.count('evaluated_pages')
 
     if write_files:
         if not output_dir:
@@ -477,14 +527,17 @@ def directory_evaluation(gt_dir: Path,
         error_record['words'].append(len(gt_text.split(' ')))
         error_record['words_distance'].append(Levenshtein.distance(gt_text.split(), ocr_text.split()))
 
+        editops = Levenshtein.editops(ocr_text, gt_text)
+        charsets_counts = count_chars_by_charsets(gt_text)
+        charsets_errors = count_errors_by_charsets(gt_text, ocr_text, editops=editops)
         for charset in CHARSETS_PATTERNS.keys():
-            error_record[f'{charset}_chars'].append(count_chars_by_charset(gt_text, charset))
-            error_record[f'{charset}_chars_distance'].append(count_errors_by_charset(gt_text, ocr_text, charset))
+            error_record[f'{charset}_chars'].append(charsets_counts[charset])
+            error_record[f'{charset}_chars_distance'].append(charsets_errors[charset])
 
         # Record edit operations
         editops_record = record_editops(gt_word=gt_text,
                                         ocr_word=ocr_text,
-                                        editops=Levenshtein.editops(ocr_text, gt_text),
+                                        editops=editops,
                                         editops_record=editops_record)
 
     results = {f'{x}_ER': round(safe_divide(sum(error_record[f'{x}_distance']), sum(error_record[x])), 3)
@@ -562,14 +615,17 @@ def line_based_evaluation(gt_lines: List[str],
         error_record['words'].append(len(gt_text.split(' ')))
         error_record['words_distance'].append(Levenshtein.distance(gt_text.split(), ocr_text.split()))
 
+        editops = Levenshtein.editops(ocr_text, gt_text)
+        charsets_counts = count_chars_by_charsets(gt_text)
+        charsets_errors = count_errors_by_charsets(gt_text, ocr_text, editops=editops)
         for charset in CHARSETS_PATTERNS.keys():
-            error_record[f'{charset}_chars'].append(count_chars_by_charset(gt_text, charset))
-            error_record[f'{charset}_chars_distance'].append(count_errors_by_charset(gt_text, ocr_text, charset))
+            error_record[f'{charset}_chars'].append(charsets_counts[charset])
+            error_record[f'{charset}_chars_distance'].append(charsets_errors[charset])
 
         # Record edit operations
         editops_record = record_editops(gt_word=gt_text,
                                         ocr_word=ocr_text,
-                                        editops=Levenshtein.editops(ocr_text, gt_text),
+                                        editops=editops,
                                         editops_record=editops_record)
 
     results = {f'{x}_ER': round(safe_divide(sum(error_record[f'{x}_distance']), sum(error_record[x])), 3)
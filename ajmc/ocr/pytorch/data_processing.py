@@ -3,18 +3,19 @@ import os
 import random
 from abc import abstractmethod
 from pathlib import Path
-from typing import List, Dict, Tuple, Generator, Optional, Any, Callable, Iterable
+from typing import List, Dict, Tuple, Generator, Optional, Any, Callable, Iterable, Union
 
 import torch
 import unicodedata
 from torch.nn.utils.rnn import pad_sequence
 from torchvision import transforms
-from torchvision.io import read_image, ImageReadMode
+from torchvision.io import decode_image, read_image, ImageReadMode
 from tqdm import tqdm
 
 from ajmc.commons.miscellaneous import get_ajmc_logger
 from ajmc.commons.unicode_utils import harmonise_unicode
 from ajmc.ocr import variables as ocr_vs
+from ajmc.ocr.data_processing.line_shards import ShardedLine, read_line_shards_index
 
 
 logger = get_ajmc_logger(__name__)
@@ -41,18 +42,23 @@ class TorchTrainingLine:
 
     # #@profile
     def __init__(self,
-                 img_path: Path,
+                 img_path: Union[Path, ShardedLine],
                  img_height: int,
                  chunk_width: int,
                  chunk_overlap: int,
                  classes_to_indices: Dict[str, int],
                  special_mapping: Dict[str, str],
                  unknown_char_index: int = 1):
-        img_tensor = read_image(str(img_path), mode=ImageReadMode.GRAY).requires_grad_(False)
-        img_tensor = prepare_img_tensor(img_tensor, img_height=img_height)
+        if isinstance(img_path, ShardedLine):  # Lines exported to shards, see ``ajmc.ocr.data_processing.line_shards``
+            img_bytes, text = img_path.read()
+            img_tensor = decode_image(torch.frombuffer(bytearray(img_bytes), dtype=torch.uint8), mode=ImageReadMode.GRAY)
+        else:
+            img_tensor = read_image(str(img_path), mode=ImageReadMode.GRAY)
+            text = img_path.with_suffix(ocr_vs.GT_TEXT_EXTENSION).read_text(encoding='utf-8')
+        img_tensor = prepare_img_tensor(img_tensor.requires_grad_(False), img_height=img_height)
         self.img_width: int = img_tensor.shape[2]
         self.chunks = chunk_img_tensor(img_tensor, chunk_width, chunk_overlap)
-        self.text = prepare_text(img_path.with_suffix(ocr_vs.GT_TEXT_EXTENSION).read_text(encoding='utf-8'), special_mapping=special_mapping)
+        self.text = prepare_text(text, special_mapping=special_mapping)
         self.text_tensor = torch.tensor([classes_to_indices.get(c, unknown_char_index) for c in self.text])
 
 
@@ -173,7 +179,8 @@ class TorchOcrDataset(torch.utils.data.Dataset):
                  data_dir: Optional[Path] = None,
                  img_paths: Optional[List[Path]] = None,
                  num_workers: int = 1,
-                 per_worker_steps_run: int = 0):
+                 per_worker_steps_run: int = 0,
+                 shards_dir: Optional[Path] = None):
         super().__init__()
         self.max_batch_size = max_batch_size
         self.img_height = img_height
@@ -186,6 +193,10 @@ class TorchOcrDataset(torch.utils.data.Dataset):
             logger.info(f'Using {len(img_paths)} images from given list of paths.')
             self.img_paths = img_paths
 
+        elif shards_dir is not None:
+            self.img_paths = sorted(read_line_shards_index(shards_dir), key=lambda x: x.stem)
+            logger.info(f'Using {len(self.img_paths)} images from the shards in {shards_dir}.')
+
         else:
             self.img_paths = sorted(data_dir.rglob('*' + ocr_vs.IMG_EXTENSION), key=lambda x: x.stem)
             logger.info(f'Using {len(self.img_paths)} images from {data_dir}.')
@@ -256,6 +267,7 @@ class TorchTrainingDataset(TorchOcrDataset):
         shuffle: Whether to shuffle the dataset.
         per_worker_steps_run: The number of steps already run by each worker. This is used to compute the number of chunks to
             skip at the beginning of the dataset, so that each worker starts at a different point in the dataset.
+        shards_dir: A directory of line shards to train on instead of ``data_dir``, see ``ajmc.ocr.data_processing.line_shards``.
 
     """
 
@@ -271,7 +283,8 @@ class TorchTrainingDataset(TorchOcrDataset):
                  loop_infinitely: bool = True,
                  shuffle: bool = True,
                  num_workers: int = 1,
-                 per_worker_steps_run: int = 0):
+                 per_worker_steps_run: int = 0,
+                 shards_dir: Optional[Path] = None):
 
         super().__init__(max_batch_size=max_batch_size,
                          img_height=img_height,
@@ -280,7 +293,8 @@ class TorchTrainingDataset(TorchOcrDataset):
                          data_dir=data_dir,
                          img_paths=img_paths,
                          num_workers=num_workers,
-                         per_worker_steps_run=per_worker_steps_run)
+                         per_worker_steps_run=per_worker_steps_run,
+                         shards_dir=shards_dir)
 
         self.classes_to_indices = classes_to_indices
         self.special_mapping = special_mapping
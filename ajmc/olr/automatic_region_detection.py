@@ -14,9 +14,10 @@ from tqdm import tqdm
 
 from ajmc.commons import variables
 from ajmc.commons.docstrings import docstring_formatter, docstrings
-from ajmc.commons.geometry import is_bbox_within_bbox, Shape
-from ajmc.commons.image import binarize, find_contours, remove_artifacts_from_contours
+from ajmc.commons.geometry import Shape
+from ajmc.commons.image import AjmcImage, binarize, find_contours, remove_artifacts_from_contours
 from ajmc.commons.miscellaneous import get_ajmc_logger
+from ajmc.commons.spatial_index import GridIndex
 
 logger = get_ajmc_logger(__name__)
 
@@ -37,9 +38,9 @@ def detect_regions(img_path: Path, dilation_kernel_size: int, dilation_iteration
         artifact_size_threshold: {artifact_size_threshold}
     """
 
-    # Preparing image
-    img_matrix = cv2.imread(str(img_path))
-    copy = img_matrix.copy()
+    # Preparing image, which is only decoded in color if it must be drawn
+    image = AjmcImage(path=img_path)
+    img_matrix = image.get_matrix('grayscale')
     binarized = binarize(img_matrix=img_matrix, inverted=True)
 
     # Setting the artifact perimeter threshold as percent of image
@@ -60,9 +61,9 @@ def detect_regions(img_path: Path, dilation_kernel_size: int, dilation_iteration
 
     dilated_contours_shrinked = []
 
+    contours_index = GridIndex.from_shapes(contours)
     for dc in dilated_contours:
-        contained_contours = [c for c in contours if
-                              is_bbox_within_bbox(c.bbox, dc.bbox)]
+        contained_contours = [contours[i] for i in contours_index.query_contained(dc.bbox)]
 
         if contained_contours:
             contained_stacked = Shape.from_numpy_array(
@@ -84,6 +85,7 @@ def detect_regions(img_path: Path, dilation_kernel_size: int, dilation_iteration
 
     # Draws output bboxes
     if draw_image:
+        copy = image.matrix.copy()
         # for rectangle in dilation_contours_bboxes:
         #     dilation_rectangle = cv2.rectangle(copy, (rectangle[0, 0], rectangle[0, 1]),
         #                          (rectangle[2, 0], rectangle[2, 1]), (0, 0, 255), 4)
@@ -4,13 +4,14 @@ from typing import List, Optional, Tuple
 
 import cv2
 import easyocr
+import numpy as np
 from kraken import blla, pageseg, binarization
 from kraken.lib import vgsl
 from PIL import Image
 
 from ajmc.commons import geometry as geom
-from ajmc.commons.geometry import adjust_bbox_to_included_contours, is_bbox_within_bbox_with_threshold, are_bboxes_overlapping_with_threshold
-from ajmc.commons.image import draw_box, find_contours, remove_artifacts_from_contours
+from ajmc.commons.geometry import adjust_bbox_to_included_contours, ShapeArray
+from ajmc.commons.image import AjmcImage, draw_box
 
 
 class LineDetectionModel:
@@ -39,7 +40,7 @@ class LineDetectionModel:
             thickness: The thickness of the box's stroke.
         """
 
-        img = cv2.imread(str(img_path))
+        img = AjmcImage(path=Path(img_path)).matrix.copy()
         if predictions is None:
             predictions = self.predict(img_path)
 
@@ -199,16 +200,16 @@ def adjust_predictions(img_path: Path,
         remove_side_margins: The percentage of side margins to remove the contours from. For instance, setting ``remove_side_margins=0.05`` with an
          image of with 100px will lead to the exclusion of the contours with $x_{max} < 5$ or $x_{min} > 95$.
     """
-    img = cv2.imread(str(img_path))
-    page_contours = find_contours(img)
+    img = AjmcImage(path=Path(img_path))  # Contours are read from the contours cache, if any
 
-    artifact_perimeter_threshold = int(img.shape[1] * artifact_size_threshold)
-    page_contours = remove_artifacts_from_contours(page_contours, artifact_perimeter_threshold)
+    artifact_perimeter_threshold = int(img.width * artifact_size_threshold)
+    page_contours = img.contours_array
+    page_contours = page_contours[2 * (page_contours.widths + page_contours.heights) > artifact_perimeter_threshold]
     adjusted_predictions = [adjust_bbox_to_included_contours(l.bbox, page_contours) for l in predictions]
 
     if remove_side_margins > 0:
-        left_margin = int(img.shape[1] * remove_side_margins)
-        right_margin = int(img.shape[1] * (1 - remove_side_margins))
+        left_margin = int(img.width * remove_side_margins)
+        right_margin = int(img.width * (1 - remove_side_margins))
         adjusted_predictions = [p for p in adjusted_predictions if not (p.bbox[1][0] < left_margin or p.bbox[0][0] > right_margin)]
 
     return adjusted_predictions
@@ -247,10 +248,12 @@ def combine_kraken_predictions(legacy_preds: List[geom.Shape],
     blla_preds = [l for l in blla_preds if l.height > minimal_height_factor * avg_line_height]
     legacy_preds = [l for l in legacy_preds if l.height > minimal_height_factor * avg_line_height]
 
+    blla_array = ShapeArray.from_shapes(blla_preds)
+    blla_in_legacy = blla_array.within_with_threshold(ShapeArray.from_shapes(legacy_preds), line_inclusion_threshold)
+
     # We now try to match the legacy lines with the blla lines
-    for lgcy_line in legacy_preds:
-        overlapping_blla_lines = [l for l in blla_preds
-                                  if is_bbox_within_bbox_with_threshold(l.bbox, lgcy_line.bbox, line_inclusion_threshold)]
+    for j, lgcy_line in enumerate(legacy_preds):
+        overlapping_blla_lines = [blla_preds[i] for i in np.flatnonzero(blla_in_legacy[:, j])]
         # Why isn't this using are_bboxes_overlapping_with_threshold?
         # This means we do not grab the blla lines that much bigger than the legacy line
 
@@ -272,13 +275,19 @@ def combine_kraken_predictions(legacy_preds: List[geom.Shape],
             else:
                 combined_preds.append(lgcy_line)
 
-    for line in blla_preds:
-        if not any([are_bboxes_overlapping_with_threshold(line.bbox, l.bbox, 0.35) for l in combined_preds]):
+    # Add the blla lines which overlap neither the combined lines nor the blla lines added before them
+    blla_overlaps_combined = blla_array.overlapping_with_threshold(ShapeArray.from_shapes(combined_preds), 0.35)
+    blla_overlaps_blla = blla_array.overlapping_with_threshold(blla_array, 0.35)
+    added_blla_indices = []
+    for i, line in enumerate(blla_preds):
+        if not (blla_overlaps_combined[i].any() or blla_overlaps_blla[i, added_blla_indices].any()):
+            added_blla_indices.append(i)
             combined_preds.append(line)
 
-    non_overlapping_preds = []
-    for l in combined_preds:
-        if not any([is_bbox_within_bbox_with_threshold(l.bbox, l2.bbox, 0.7) for l2 in non_overlapping_preds]):
-            non_overlapping_preds.append(l)
+    combined_within_combined = ShapeArray.from_shapes(combined_preds).within_with_threshold(ShapeArray.from_shapes(combined_preds), 0.7)
+    non_overlapping_indices = []
+    for k in range(len(combined_preds)):
+        if not combined_within_combined[k, non_overlapping_indices].any():
+            non_overlapping_indices.append(k)
 
-    return non_overlapping_preds
+    return [combined_preds[k] for k in non_overlapping_indices]
@@ -0,0 +1,64 @@
+"""Benchmarks ``RawPage.optimise`` on the sample commentary in ``tests/data``.
+
+For each page, this times a full ``optimise`` and compares the cost of the two pairwise searches it relies on, i.e.
+finding the words within each region and the lines overlapping each region, with a naive scan and with a ``GridIndex``.
+
+Usage:
+    python -m ajmc.text_processing._scripts.benchmark_optimise --repeats 5
+"""
+
+import argparse
+import time
+
+from ajmc.commons import variables as vs
+from ajmc.commons.geometry import are_bboxes_overlapping, is_bbox_within_bbox_with_threshold
+from ajmc.commons.spatial_index import GridIndex
+from ajmc.text_processing.raw_classes import RawCommentary
+
+
+def time_function(function, repeats: int) -> float:
+    """Returns the best time of ``repeats`` calls to ``function``, in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def naive_search(words, lines, regions):
+    for r in regions:
+        _ = [w for w in words if is_bbox_within_bbox_with_threshold(w.bbox.bbox, r.bbox.bbox, r._inclusion_threshold)]
+        _ = [l for l in lines if are_bboxes_overlapping(l.bbox.bbox, r.bbox.bbox)]
+
+
+def indexed_search(words, lines, regions):
+    words_index = GridIndex([w.bbox.bbox for w in words])
+    lines_index = GridIndex([l.bbox.bbox for l in lines])
+    for r in regions:
+        _ = [words[i] for i in words_index.query_overlapping(r.bbox.bbox)
+             if is_bbox_within_bbox_with_threshold(words[i].bbox.bbox, r.bbox.bbox, r._inclusion_threshold)]
+        _ = [lines[i] for i in lines_index.query_overlapping(r.bbox.bbox)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark RawPage.optimise on the sample commentary.')
+    parser.add_argument('--comm_id', type=str, default='cu31924087948174')
+    parser.add_argument('--ocr_run_id', type=str, default='3464N4_tess_retrained')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    vs.COMMS_DATA_DIR = vs.PACKAGE_DIR / 'tests/data'
+    commentary = RawCommentary(id=args.comm_id, ocr_run_id=args.ocr_run_id, ocr_cache_dir=None)
+
+    print(f'{"page":<30}{"words":>8}{"optimise (ms)":>16}{"naive (ms)":>14}{"indexed (ms)":>14}{"speed-up":>10}')
+    for page_id in [p.id for p in commentary.children.pages]:
+        # Optimise is timed once per page, as it changes the page in place
+        page = RawCommentary(id=args.comm_id, ocr_run_id=args.ocr_run_id, ocr_cache_dir=None).get_page(page_id)
+        optimise_time = time_function(page.optimise, 1)
+
+        words, lines, regions = page.children.words, page.children.lines, page.children.regions
+        naive_time = time_function(lambda: naive_search(words, lines, regions), args.repeats)
+        indexed_time = time_function(lambda: indexed_search(words, lines, regions), args.repeats)
+        print(f'{page_id:<30}{len(words):>8}{optimise_time:>16.1f}{naive_time:>14.2f}{indexed_time:>14.2f}'
+              f'{naive_time / indexed_time:>9.1f}x')
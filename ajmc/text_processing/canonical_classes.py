@@ -2,14 +2,15 @@
 
 import json
 from abc import abstractmethod
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 
-from jinja2 import Environment, PackageLoader
+import numpy as np
 from lazy_objects.lazy_objects import lazy_property, LazyObject
 
 from ajmc.commons import variables as vs
-from ajmc.commons.arithmetic import is_interval_within_interval
+from ajmc.commons.arithmetic import IntervalIndex
 from ajmc.commons.docstrings import docstring_formatter, docstrings
 from ajmc.commons.geometry import get_bbox_from_points, Shape
 from ajmc.commons.image import AjmcImage
@@ -19,6 +20,31 @@ from ajmc.text_processing.generic_classes import Commentary, Page, TextContainer
 logger = get_ajmc_logger(__name__)
 
 
+def _get_canonical_children(tc, children_type: str) -> list:
+    """Gets the ``children_type`` children of a canonical ``tc`` from its commentary, using word ranges."""
+
+    commentary = tc.parents.commentary
+
+    if children_type == 'words':  # Special efficiency hack for words
+        return commentary.children.words[tc.word_range[0]:tc.word_range[1] + 1]
+
+    # General case, using the commentary's interval index rather than scanning all the ``children_type``
+    candidates = getattr(commentary.children, children_type)
+    return [candidates[i] for i in commentary.get_interval_index(children_type).get_contained(tc.word_range)
+            if candidates[i] != tc]
+
+
+def _get_canonical_parent(tc, parent_type: str):
+    """Gets the ``parent_type`` parent of a canonical ``tc`` from its commentary, using word ranges."""
+
+    commentary = tc.parents.commentary
+    parent_child_type = vs.TC_TYPES_TO_CHILD_TYPES[parent_type]
+    candidates = getattr(commentary.children, parent_child_type)
+    for i in commentary.get_interval_index(parent_child_type).get_containers(tc.word_range):
+        if candidates[i] != tc:
+            return candidates[i]
+
+
 class CanonicalTextContainer(TextContainer):
 
     def __init__(self, **kwargs):
@@ -35,23 +61,14 @@ class CanonicalTextContainer(TextContainer):
             - This methods works with word ranges, NOT with coordinates.
             - This methods does retrieve elements which overlap only partially with ``self``.
         """
-
-        if children_type == 'words':  # Special efficiency hack for words
-            return self.parents.commentary.children.words[self.word_range[0]:self.word_range[1] + 1]
-
-        # General case
-        return [tc for tc in getattr(self.parents.commentary.children, children_type)
-                if is_interval_within_interval(contained=tc.word_range, container=self.word_range)
-                and self.id != tc.id]
+        return _get_canonical_children(self, children_type)
 
     def _get_parent(self, parent_type: str) -> Optional[Type['CanonicalTextContainer']]:
 
         if parent_type == 'commentary':
             raise NotImplementedError('``CanonicalTextContainer.parents.commentary`` must be set at __init__')
 
-        for tc in getattr(self.parents.commentary.children, vs.TC_TYPES_TO_CHILD_TYPES[parent_type]):
-            if is_interval_within_interval(contained=self.word_range, container=tc.word_range) and self.id != tc.id:
-                return tc
+        return _get_canonical_parent(self, parent_type)
 
     @lazy_property
     def id(self) -> str:
@@ -67,14 +84,19 @@ class CanonicalTextContainer(TextContainer):
     def word_range(self) -> Tuple[int, int]:
         return self.word_range
 
+    @lazy_property
+    def text(self) -> str:
+        """Generic method to get a ``CanonicalTextContainer``'s text, sliced from its commentary's text buffer."""
+        return self.parents.commentary.get_text(self.word_range)
+
     @lazy_property
     def bbox(self) -> Shape:
         """Generic method to get a ``CanonicalTextContainer``'s bbox."""
         return Shape(get_bbox_from_points([xy for w in self.children.words for xy in w.bbox.bbox]))
 
-    @lazy_property
+    @property
     def image(self) -> AjmcImage:
-        """Generic method to create a ``CanonicalTextContainer``'s image."""
+        """Generic method to create a ``CanonicalTextContainer``'s image, as a crop of its page's cached image."""
         return self.parents.page.image.crop(self.bbox.bbox)
 
 
@@ -120,7 +142,8 @@ class CanonicalCommentary(Commentary):
     def from_json(cls,
                   json_path: Optional[Union[str, Path]] = None,
                   id: Optional[str] = None,
-                  ocr_run_id: Optional[str] = vs.DEFAULT_OCR_RUN_ID):
+                  ocr_run_id: Optional[str] = vs.DEFAULT_OCR_RUN_ID,
+                  compact: bool = False):
         """Instantiate a ``CanonicalCommentary`` from a json file.
 
         Args:
@@ -128,6 +151,7 @@ class CanonicalCommentary(Commentary):
             ajmc folder structure.
             id: The id of the commentary.
             ocr_run_id: The id of the ocr run.
+            compact: Whether to store words in arrays, using a ``CanonicalWordsView`` as ``children.words``.
         """
 
         if json_path is None:
@@ -167,8 +191,17 @@ class CanonicalCommentary(Commentary):
                                             for tc_type in vs.CHILD_TYPES if tc_type != 'words'})
 
         # Special case of words which have no index in the canonical json
-        commentary.children.words = [get_tc_type_class('words')(commentary=commentary, index=i, word_range=(i, i), **tc)
-                                     for i, tc in enumerate(can_json['children']['words'])]
+        if compact:
+            commentary.children.words = CanonicalWordsView.from_words(commentary, can_json['children']['words'])
+        else:
+            commentary.children.words = [get_tc_type_class('words')(commentary=commentary, index=i, word_range=(i, i), **tc)
+                                         for i, tc in enumerate(can_json['children']['words'])]
+
+        # Set the other indices eagerly, as ``CanonicalTextContainer.index`` would otherwise scan the children lists
+        for tc_type in vs.CHILD_TYPES:
+            if tc_type != 'words':
+                for i, tc in enumerate(getattr(commentary.children, tc_type)):
+                    tc.index = i
 
         return commentary
 
@@ -198,6 +231,138 @@ class CanonicalCommentary(Commentary):
 
         return data
 
+    @classmethod
+    def from_binary(cls,
+                    binary_dir: Optional[Union[str, Path]] = None,
+                    id: Optional[str] = None,
+                    ocr_run_id: Optional[str] = vs.DEFAULT_OCR_RUN_ID,
+                    compact: bool = False):
+        """Instantiate a ``CanonicalCommentary`` from a binary directory written by ``CanonicalCommentary.to_binary``.
+
+        Note:
+            Arrays are memory-mapped, so that opening a commentary is near-instant and its memory is shared across
+            processes. Children are only instantiated when they are first accessed, e.g. ``commentary.children.words``.
+
+        Args:
+            binary_dir: The path to a binary canonical directory respecting the ajmc folder structure.
+            id: The id of the commentary.
+            ocr_run_id: The id of the ocr run.
+            compact: Whether to use a ``CanonicalWordsView`` over the memory-mapped arrays as ``children.words``.
+        """
+
+        if binary_dir is None:
+            binary_dir = vs.get_comm_canonical_binary_dir_from_ocr_run_pattern(id, ocr_run_id)
+        else:
+            binary_dir = Path(binary_dir)
+
+        logger.debug(f'Importing binary canonical commentary from {binary_dir}')
+        header = json.loads((binary_dir / 'header.json').read_text(encoding='utf-8'))
+
+        commentary = cls(id=header['id'],
+                         children=None,
+                         images=None,
+                         ocr_run_id=header['metadata']['ocr_run_id'],
+                         ocr_gt_page_ids=header['ocr_gt_page_ids'],
+                         olr_gt_page_ids=header['olr_gt_page_ids'],
+                         ner_gt_page_ids=header['ner_gt_page_ids'],
+                         lemlink_gt_page_ids=header['lem_link_gt_page_ids'],
+                         metadata=header['metadata'])
+
+        commentary._binary_attributes = header['attributes']
+        commentary._binary_columns = {path.stem: np.load(path, mmap_mode='r') for path in binary_dir.glob('*.npy')}
+
+        commentary.images = [AjmcImage(id=page['id'], path=commentary.img_dir / (page['id'] + vs.DEFAULT_IMG_EXTENSION),
+                                       word_range=tuple(word_range))
+                             for page, word_range in zip(header['attributes']['pages'],
+                                                         commentary._binary_columns['pages_word_ranges'].tolist())]
+
+        commentary.children = LazyObject(compute_function=commentary._get_binary_children,
+                                         constrained_attrs=vs.CHILD_TYPES)
+        if compact:
+            commentary.children.words = CanonicalWordsView(commentary=commentary,
+                                                           text_blob=commentary._binary_columns['words_text'],
+                                                           offsets=commentary._binary_columns['words_offsets'],
+                                                           bboxes=commentary._binary_columns['words_bboxes'])
+
+        return commentary
+
+    def _get_binary_children(self, children_type: str) -> List[CanonicalTextContainer]:
+        """Instantiates the ``children_type`` children of a commentary loaded with ``CanonicalCommentary.from_binary``."""
+
+        tc_class = get_tc_type_class(children_type)
+
+        if children_type == 'words':
+            text_blob = self._binary_columns['words_text'].tobytes()
+            offsets = self._binary_columns['words_offsets'].tolist()
+            return [tc_class(text=text_blob[offsets[i]:offsets[i + 1]].decode('utf-8'),
+                             bbox=[(x0, y0), (x1, y1)],
+                             commentary=self,
+                             index=i,
+                             word_range=(i, i))
+                    for i, (x0, y0, x1, y1) in enumerate(self._binary_columns['words_bboxes'].tolist())]
+
+        children = [tc_class(commentary=self, word_range=tuple(word_range), **attributes)
+                    for attributes, word_range in zip(self._binary_attributes[children_type],
+                                                      self._binary_columns[f'{children_type}_word_ranges'].tolist())]
+        # Set afterwards, as annotations' constructors take no ``index``
+        for i, tc in enumerate(children):
+            tc.index = i
+        return children
+
+    def to_binary(self, output_dir: Optional[Union[str, Path]] = None) -> Path:
+        """Exports self to the columnar binary format.
+
+        Note:
+            The binary format is a directory containing:
+                - ``header.json``: the commentary's metadata and the non-columnar attributes of its children (e.g.
+                  ``region_type``), without their word ranges.
+                - ``words_text.npy`` and ``words_offsets.npy``: the utf-8 encoded texts of the words, concatenated in a
+                  single ``uint8`` blob, and the ``N+1`` byte offsets delimiting each word.
+                - ``words_bboxes.npy``: an ``int32`` array of shape ``(N, 4)`` containing the words' ``x0, y0, x1, y1``.
+                - ``<children_type>_word_ranges.npy``: an ``int64`` array of shape ``(M, 2)`` for every other children type.
+
+        Args:
+            output_dir: The directory to which the binary should be exported. Leave empty to export to default location.
+
+        Returns:
+            The path to the output directory.
+        """
+
+        if output_dir is None:
+            output_dir = vs.get_comm_canonical_dir(self.id) / (self.ocr_run_id + vs.CANONICAL_BINARY_SUFFIX)
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Words are stored column-wise
+        encoded_texts = [w.text.encode('utf-8') for w in self.children.words]
+        offsets = np.zeros(len(encoded_texts) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in encoded_texts], out=offsets[1:])
+        np.save(output_dir / 'words_text.npy', np.frombuffer(b''.join(encoded_texts), dtype=np.uint8))
+        np.save(output_dir / 'words_offsets.npy', offsets)
+        np.save(output_dir / 'words_bboxes.npy', np.array([[*w.bbox.bbox[0], *w.bbox.bbox[1]] for w in self.children.words],
+                                                          dtype=np.int32).reshape(-1, 4))
+
+        # Other children types only store their word ranges and their remaining attributes
+        attributes = {}
+        for children_type in vs.CHILD_TYPES:
+            if children_type == 'words':
+                continue
+            tc_jsons = [tc.to_json() for tc in getattr(self.children, children_type)]
+            np.save(output_dir / f'{children_type}_word_ranges.npy',
+                    np.array([tc_json.pop('word_range') for tc_json in tc_jsons], dtype=np.int64).reshape(-1, 2))
+            attributes[children_type] = tc_jsons
+
+        header = {'id': self.id,
+                  'metadata': self.metadata,
+                  'ocr_gt_page_ids': self.ocr_gt_page_ids,
+                  'olr_gt_page_ids': self.olr_gt_page_ids,
+                  'ner_gt_page_ids': self.ner_gt_page_ids,
+                  'lem_link_gt_page_ids': self.lemlink_gt_page_ids,
+                  'attributes': attributes}
+        (output_dir / 'header.json').write_text(json.dumps(header, ensure_ascii=False), encoding='utf-8')
+
+        return output_dir
+
     def to_alto(self,
                 output_dir: Union[str, Path],
                 children_types: List[str],
@@ -235,6 +400,68 @@ class CanonicalCommentary(Commentary):
     def _get_children(self, children_type) -> List[Optional[Type['TextContainer']]]:
         raise NotImplementedError('``CanonicalCommentary.children`` must be set at __init__.')
 
+    @lazy_property
+    def text(self) -> str:
+        """The text of the whole commentary, i.e. its words joined by single spaces.
+
+        Note:
+            This buffer is shared by all the commentary's containers, whose ``text`` is a slice of it (see
+            ``CanonicalCommentary.word_char_offsets``).
+        """
+        return ' '.join([w.text for w in self.children.words])
+
+    @lazy_property
+    def word_char_offsets(self) -> np.ndarray:
+        """An ``int64`` array of shape ``(N, 2)`` containing the start and end (excluded) char offsets of each word in
+        ``self.text``."""
+        lengths = np.array([len(w.text) for w in self.children.words], dtype=np.int64)
+        offsets = np.empty((len(lengths), 2), dtype=np.int64)
+        offsets[:, 0] = np.cumsum(lengths + 1) - lengths - 1
+        offsets[:, 1] = offsets[:, 0] + lengths
+        return offsets
+
+    def get_char_range(self, word_range: Tuple[int, int]) -> Tuple[int, int]:
+        """Gets the char offsets (end excluded) of the text spanned by ``word_range`` in ``self.text``.
+
+        Args:
+            word_range: An inclusive ``(start, end)`` word range. Empty ranges (``end < start``) yield empty char ranges.
+        """
+        if word_range[1] < word_range[0]:
+            start = int(self.word_char_offsets[word_range[0], 0]) if word_range[0] < len(self.word_char_offsets) else len(self.text)
+            return start, start
+        return int(self.word_char_offsets[word_range[0], 0]), int(self.word_char_offsets[word_range[1], 1])
+
+    def get_text(self, word_range: Tuple[int, int]) -> str:
+        """Gets the text spanned by ``word_range``, as a slice of ``self.text``."""
+        start, end = self.get_char_range(word_range)
+        return self.text[start:end]
+
+    def get_word_index(self, char_offset: int) -> int:
+        """Gets the index of the word containing ``self.text[char_offset]``. For a space, this is the preceding word."""
+        return int(np.searchsorted(self.word_char_offsets[:, 0], char_offset, side='right')) - 1
+
+    def get_interval_index(self, children_type: str) -> IntervalIndex:
+        """Gets the ``IntervalIndex`` of the word ranges of ``self.children.<children_type>``.
+
+        Note:
+            Indices are built once per children type and cached. They are rebuilt whenever ``self.children`` or
+            ``self.children.<children_type>`` is reassigned, but not if the list is modified in place.
+
+        Args:
+            children_type: The type of children to index, e.g. ``'pages'`` or ``'regions'``.
+        """
+        children = getattr(self.children, children_type)
+        children_list, index = self._interval_indices.get(children_type, (None, None))
+        if children_list is not children:
+            index = IntervalIndex([tc.word_range for tc in children])
+            self._interval_indices[children_type] = (children, index)
+        return index
+
+    @lazy_property
+    def _interval_indices(self) -> Dict[str, Tuple[List[CanonicalTextContainer], IntervalIndex]]:
+        """Maps children types to the children list they were computed from and their ``IntervalIndex``."""
+        return {}
+
     @lazy_property
     def ocr_gt_pages(self) -> List[Type['CanonicalPage']]:
         """A list of ``CanonicalPage`` objects containing the groundtruth of the OCR."""
@@ -284,6 +511,8 @@ class CanonicalPage(Page, CanonicalTextContainer):
             region_types_ids: A dictionary mapping the values of ``region_types_mapping`` to the ids of regions in the ALTO-xml, for instance variables.REGION_TYPES_TO_SEGMONTO_ID
             regions_types: The types of regions to be exported, for instance variables.ROIS. This allows for filtering only the regions of interested, excluded regions types like 'undefined'.
         """
+        from jinja2 import Environment, PackageLoader
+
         env = Environment(loader=PackageLoader('ajmc', 'data/templates'),
                           trim_blocks=True,
                           lstrip_blocks=True,
@@ -302,7 +531,7 @@ class CanonicalPage(Page, CanonicalTextContainer):
 
     @lazy_property
     def image(self) -> AjmcImage:  # Special case of page's images
-        return [img for img in self.parents.commentary.images if img.id == self.id][0]
+        return self.parents.commentary.get_image(self.id)
 
 
 class CanonicalRegion(CanonicalTextContainer):
@@ -337,6 +566,140 @@ class CanonicalWord(CanonicalTextContainer):
         return self.index, self.index
 
 
+class CompactCanonicalWord:
+    """A lightweight, read-only stand-in for ``CanonicalWord``, yielded by ``CanonicalWordsView``.
+
+    Note:
+        A ``CompactCanonicalWord`` only stores its commentary and its index. Its ``text`` and ``bbox`` are read from the
+        commentary's word arrays, and its ``parents`` and ``children`` are resolved from word ranges, on each access.
+        Instances are created on demand and compare equal if they point to the same word of the same commentary.
+    """
+
+    __slots__ = ('commentary', 'index')
+    type = 'word'
+
+    def __init__(self, commentary: CanonicalCommentary, index: int):
+        self.commentary = commentary
+        self.index = index
+
+    @property
+    def id(self) -> str:
+        return self.type + '_' + str(self.index)
+
+    @property
+    def word_range(self) -> Tuple[int, int]:
+        return self.index, self.index
+
+    @property
+    def text(self) -> str:
+        return self.commentary.children.words.get_text(self.index)
+
+    @property
+    def bbox(self) -> Shape:
+        return Shape(self.commentary.children.words.get_bbox(self.index))
+
+    @property
+    def parents(self) -> '_CompactWordFamily':
+        return _CompactWordFamily(self, _get_canonical_parent)
+
+    @property
+    def children(self) -> '_CompactWordFamily':
+        return _CompactWordFamily(self, _get_canonical_children)
+
+    @property
+    def image(self) -> AjmcImage:
+        return self.parents.page.image.crop(self.bbox.bbox)
+
+    def to_json(self) -> Dict[str, Union[str, Tuple[int, int]]]:
+        return {'bbox': self.bbox.bbox, 'text': self.text}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompactCanonicalWord) and other.index == self.index and other.commentary is self.commentary
+
+    def __hash__(self) -> int:
+        return hash((id(self.commentary), self.index))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(index={self.index}, text={self.text!r})'
+
+
+class _CompactWordFamily:
+    """Resolves the ``parents`` or ``children`` of a ``CompactCanonicalWord`` through attribute access."""
+
+    __slots__ = ('word', 'getter')
+
+    def __init__(self, word: CompactCanonicalWord, getter: Callable):
+        self.word = word
+        self.getter = getter
+
+    def __getattr__(self, tc_type: str):
+        if tc_type == 'commentary':
+            return self.word.commentary
+        if tc_type not in vs.TEXTCONTAINER_TYPES and tc_type not in vs.CHILD_TYPES:
+            raise AttributeError(tc_type)
+        return self.getter(self.word, tc_type)
+
+
+class CanonicalWordsView(Sequence):
+    """A sequence-like view over a commentary's word arrays, yielding ``CompactCanonicalWord``s on demand.
+
+    Note:
+        This is used as ``commentary.children.words`` in compact mode (see ``CanonicalCommentary.from_json`` and
+        ``CanonicalCommentary.from_binary``). Arrays can be memory-mapped. Slicing returns a list of words.
+    """
+
+    def __init__(self,
+                 commentary: CanonicalCommentary,
+                 text_blob: np.ndarray,
+                 offsets: np.ndarray,
+                 bboxes: np.ndarray):
+        """Default constructor.
+
+        Args:
+            commentary: The commentary the words belong to.
+            text_blob: A ``uint8`` array containing the concatenated utf-8 encoded texts of the words.
+            offsets: An array of the ``N+1`` byte offsets delimiting each word in ``text_blob``.
+            bboxes: An array of shape ``(N, 4)`` containing the words' ``x0, y0, x1, y1``.
+        """
+        self.commentary = commentary
+        self.text_blob = text_blob
+        self.offsets = offsets
+        self.bboxes = bboxes
+
+    @classmethod
+    def from_words(cls, commentary: CanonicalCommentary, words: Iterable[Dict]) -> 'CanonicalWordsView':
+        """Creates a ``CanonicalWordsView`` from an iterable of canonical words jsons (i.e. with ``text`` and ``bbox``)."""
+        encoded_texts, bboxes = [], []
+        for w in words:
+            encoded_texts.append(w['text'].encode('utf-8'))
+            bboxes.append([*w['bbox'][0], *w['bbox'][1]])
+        offsets = np.zeros(len(encoded_texts) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in encoded_texts], out=offsets[1:])
+        return cls(commentary=commentary,
+                   text_blob=np.frombuffer(b''.join(encoded_texts), dtype=np.uint8),
+                   offsets=offsets,
+                   bboxes=np.array(bboxes, dtype=np.int32).reshape(-1, 4))
+
+    def get_text(self, index: int) -> str:
+        return self.text_blob[self.offsets[index]:self.offsets[index + 1]].tobytes().decode('utf-8')
+
+    def get_bbox(self, index: int) -> List[Tuple[int, int]]:
+        x0, y0, x1, y1 = self.bboxes[index].tolist()
+        return [(x0, y0), (x1, y1)]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[CompactCanonicalWord, List[CompactCanonicalWord]]:
+        if isinstance(item, slice):
+            return [CompactCanonicalWord(self.commentary, i) for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('word index out of range')
+        return CompactCanonicalWord(self.commentary, item)
+
+
 # 👁️ not very elegant. try to revise.
 def get_tc_type_class(tc_type) -> Type[CanonicalTextContainer]:
     if not tc_type.endswith('s'):
@@ -355,11 +718,12 @@ class CanonicalAnnotation(CanonicalTextContainer):
 
     @lazy_property
     def text(self):
-        return ' '.join([w.text for w in self.children.words])[self.shifts[0]:self.shifts[1]]
+        return self.parents.commentary.get_text(self.word_range)[self.shifts[0]:self.shifts[1]]
 
     def get_text_window(self, window_size=5):
-        return ' '.join(self.parents.commentary.children.words[
-                        self.word_range[0] - window_size:self.word_range[1] + window_size + 1])
+        commentary = self.parents.commentary
+        return commentary.get_text((max(self.word_range[0] - window_size, 0),
+                                    min(self.word_range[1] + window_size, len(commentary.children.words) - 1)))
 
     @lazy_property
     def bbox(self) -> None:
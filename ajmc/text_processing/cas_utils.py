@@ -2,78 +2,104 @@
 ``basic_rebuild``, ``get_iiif_url``, ``compute_image_links``, ``get_cas``, ``rebuild_to_xmi``, ``export_commentaries_to_xmi`` are
 legacy but functional.
 """
+import hashlib
 import json
 import os
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from time import strftime
-from typing import Dict, List, Type, Optional
+from typing import Any, Dict, List, Type, Optional, Sequence, Tuple, TYPE_CHECKING
 
-from cassis import Cas, load_cas_from_xmi, load_typesystem
-from cassis.typesystem import FeatureStructure
 from tqdm import tqdm
 
-from ajmc.commons import variables as vs
-from ajmc.commons.arithmetic import compute_interval_overlap
+from ajmc.commons import tracing, variables as vs
 from ajmc.commons.miscellaneous import aligned_print, get_ajmc_logger
 
+if TYPE_CHECKING:
+    from cassis import Cas, TypeSystem
+    from cassis.typesystem import FeatureStructure
+
+    from ajmc.text_processing.raw_classes import RawCommentary
+
 logger = get_ajmc_logger(__name__)
 AJMC_METADATA_TYPE = 'webanno.custom.AjMCDocumentmetadata'
 
+# The typesystems parsed by ``get_typesystem``, keyed by their path, modification time and size
+_TYPESYSTEMS: Dict[Tuple[str, int, int], 'TypeSystem'] = {}
+
+# The XMI paths of each corpus by page id, keyed by the corpus directory and glob pattern, see ``get_xmi_paths``
+_XMI_PATHS: Dict[Tuple[str, str], Dict[str, Path]] = {}
+
+
+REBUILD_LEVELS = ('regions', 'lines', 'words')
+REBUILD_FIELDS = ('bbox', 'offsets', 'texts')
 
+
+@tracing.traced('basic_rebuild')
 def basic_rebuild(page: dict,
                   region_types: List[str],
-                  string: str = '') -> dict:
-    # 👁️ a light version of this function computing only what you actually need could be useful
-    """Basic rebuild function"""
+                  string: str = '',
+                  levels: Sequence[str] = REBUILD_LEVELS,
+                  fields: Sequence[str] = REBUILD_FIELDS) -> dict:
+    """Basic rebuild function, concatenating the words of the page's regions of the given types into a fulltext.
 
-    coordinates = {'regions': [], 'lines': [], 'words': []}
-    offsets = {'regions': [], 'lines': [], 'words': []}
-    texts = {'regions': [], 'lines': [], 'words': []}
+    Args:
+        page: The page's inception dict, see ``RawPage.to_inception_dict``.
+        region_types: The types of the regions to rebuild, other regions are skipped.
+        string: A text to which the page's fulltext is appended.
+        levels: The levels (among ``REBUILD_LEVELS``) for which to compute the ``fields``, e.g. ``['words']``.
+        fields: The fields (among ``REBUILD_FIELDS``) to compute, e.g. ``['bbox', 'offsets']`` to align annotations.
+
+    Returns:
+        A dict with the page's ``id`` and ``fulltext``, and with each field mapping each level to the list of its
+        elements' bboxes, offsets (as ``[start, end]``, end included) or texts.
+    """
+    coordinates, offsets, texts = [{level: [] for level in levels} if field in fields else {} for field in REBUILD_FIELDS]
+    words = []  # The texts of all the words, joined at the end
+    offset = len(string)
 
     for region in page['regions']:
 
         if region['region_type'] in region_types:
 
-            region_text = ''
-            region_offsets = [len(string)]
+            region_start = offset
+            region_words_start = len(words)
 
             for line in region['lines']:
-                line_text = ''
-                line_offsets = [len(string)]
-
-                for n, word in enumerate(line['words']):
-                    word_offsets = [len(string)]
-
-                    region_text += word['text'] + ' '
-                    line_text += word['text'] + ' '
-                    string += word['text'] + ' '
-
-                    word_offsets.append(len(string) - 1)
-
-                    texts['words'].append(word['text'] + ' ')
-                    offsets['words'].append(word_offsets)
-                    try:
-                        coordinates['words'].append(word['bbox'])
-                    except KeyError:
-                        coordinates['words'].append(word['coords'])  # for old rebuilds
-
-                line_offsets.append(len(string) - 1)
-                offsets['lines'].append(line_offsets)
-                try:
-                    coordinates['lines'].append(line['bbox'])
-                except KeyError:
-                    coordinates['lines'].append(line['coords'])  # for old rebuilds
-                texts['lines'].append(line_text)
-
-            region_offsets.append(len(string) - 1)
-            try:
-                coordinates['regions'].append(region['bbox'])
-            except KeyError:
-                coordinates['regions'].append(region['coords'])  # for old rebuilds
-            offsets['regions'].append(region_offsets)
-            texts['regions'].append(region_text)
-
-    return {'id': page['id'], 'fulltext': string, 'bbox': coordinates, 'offsets': offsets, 'texts': texts}
+                line_start = offset
+                line_words_start = len(words)
+
+                for word in line['words']:
+                    word_start = offset
+                    words.append(word['text'])
+                    offset += len(word['text']) + 1  # Words are followed by a space
+
+                    if 'words' in texts:
+                        texts['words'].append(word['text'] + ' ')
+                    if 'words' in offsets:
+                        offsets['words'].append([word_start, offset - 1])
+                    if 'words' in coordinates:
+                        coordinates['words'].append(word['bbox'] if 'bbox' in word else word['coords'])  # for old rebuilds
+
+                if 'lines' in offsets:
+                    offsets['lines'].append([line_start, offset - 1])
+                if 'lines' in coordinates:
+                    coordinates['lines'].append(line['bbox'] if 'bbox' in line else line['coords'])
+                if 'lines' in texts:
+                    texts['lines'].append(''.join(w + ' ' for w in words[line_words_start:]))
+
+            if 'regions' in coordinates:
+                coordinates['regions'].append(region['bbox'] if 'bbox' in region else region['coords'])
+            if 'regions' in offsets:
+                offsets['regions'].append([region_start, offset - 1])
+            if 'regions' in texts:
+                texts['regions'].append(''.join(w + ' ' for w in words[region_words_start:]))
+
+    rebuild = {'id': page['id'], 'fulltext': string + ''.join(w + ' ' for w in words)}
+    for field, values in zip(REBUILD_FIELDS, [coordinates, offsets, texts]):
+        if field in fields:
+            rebuild[field] = values
+    return rebuild
 
 
 def get_iiif_url(page_id: str,
@@ -151,8 +177,9 @@ def rebuild_to_xmi(page: dict,
         pct_coordinates (bool): if True, coordinates are expressed in percentage
     """
 
-    with open(str(typesystem_path), 'rb') as f:
-        typesystem = load_typesystem(f)  # object for the type system
+    from cassis import Cas
+
+    typesystem = get_typesystem(typesystem_path)  # object for the type system
 
     cas = Cas(typesystem=typesystem)
     cas.sofa_string = page['fulltext']  # str # ``ft`` field in the rebuild CI
@@ -187,16 +214,111 @@ def rebuild_to_xmi(page: dict,
     cas.to_xmi((output_dir / f'{page["id"]}.xmi'), pretty_print=True)
 
 
+# The name of the manifest kept by ``export_commentary_to_xmis`` in its ``xmis_dir``
+XMI_EXPORT_MANIFEST_NAME = 'export_manifest.json'
+
+
+def export_json_to_xmi(json_path: Path,
+                       xmis_dir: Path,
+                       ocr_run_id: str,
+                       region_types: List[str],
+                       typesystem_path: Path = vs.TYPESYSTEM_PATH,
+                       skip_hash: Optional[str] = None) -> Tuple[str, str]:
+    """Rebuilds the inception json at ``json_path`` and exports it to ``xmis_dir``, unless the rebuild is unchanged.
+
+    Args:
+        json_path: The path to the page's inception json, see ``RawPage.to_inception_json``.
+        xmis_dir: The directory in which to write the xmi.
+        ocr_run_id: See ``rebuild_to_xmi``.
+        region_types: See ``rebuild_to_xmi``.
+        typesystem_path: See ``rebuild_to_xmi``.
+        skip_hash: The hash of the rebuild when it was last exported, if its xmi is up to date.
+
+    Returns:
+        The sha256 hash of the rebuild and the status of the export: ``'skipped'`` if the hash is ``skip_hash``,
+        ``'empty'`` if the page has no text in ``region_types`` (no xmi is written), or ``'written'``.
+    """
+    # The rebuild is hashed rather than the json, which holds its creation date
+    rebuild = basic_rebuild(json.loads(json_path.read_text(encoding='utf-8')), region_types)
+    source_hash = hashlib.sha256(json.dumps(rebuild, sort_keys=True).encode('utf-8')).hexdigest()
+    if source_hash == skip_hash:
+        return source_hash, 'skipped'
+
+    if len(rebuild['fulltext']) == 0:  # handles the empty-page case
+        return source_hash, 'empty'
+
+    rebuild_to_xmi(rebuild, xmis_dir, ocr_run_id, region_types, typesystem_path)
+    return source_hash, 'written'
+
+
+def _export_page_to_xmi(page_id: str,
+                        skip_hash: Optional[str],
+                        commentary: Optional['RawCommentary'],
+                        jsons_dir: Path,
+                        xmis_dir: Path,
+                        ocr_run_id: str,
+                        region_types: List[str],
+                        typesystem_path: Path) -> Tuple[str, str, str]:
+    """Writes the page's inception json if a ``commentary`` is given, then exports it to an xmi."""
+    if commentary is not None:
+        page = commentary.get_page(page_id)
+        page.to_inception_json(output_dir=jsons_dir)
+        page.reset()
+    return (page_id, *export_json_to_xmi(jsons_dir / f'{page_id}.json', xmis_dir, ocr_run_id, region_types,
+                                         typesystem_path, skip_hash))
+
+
+# The arguments of ``_export_page_to_xmi`` shared by all the pages of an ``export_commentary_to_xmis`` worker process
+_WORKER_EXPORT_KWARGS: Dict[str, Any] = {}
+
+
+def _init_xmi_export_worker(export_kwargs: Dict[str, Any],
+                            commentary_kwargs: Optional[Dict[str, Any]],
+                            variables: Dict[str, Any]):
+    from ajmc.text_processing.raw_classes import RawCommentary
+
+    for name, value in variables.items():
+        setattr(vs, name, value)
+    get_typesystem(export_kwargs['typesystem_path'])  # Loaded once and shared by all the worker's pages
+    _WORKER_EXPORT_KWARGS.update(export_kwargs)
+    _WORKER_EXPORT_KWARGS['commentary'] = RawCommentary(**commentary_kwargs) if commentary_kwargs else None
+
+
+def _export_worker_page_to_xmi(task: Tuple[str, Optional[str]]) -> Tuple[str, str, str]:
+    return _export_page_to_xmi(*task, **_WORKER_EXPORT_KWARGS)
+
+
+def _read_xmi_export_manifest(manifest_path: Path, metadata: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """Reads the pages of the manifest at ``manifest_path``, which are discarded if they were exported with other
+    ``metadata``."""
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return manifest['pages'] if manifest.get('metadata') == metadata else {}
+
+
+def _write_xmi_export_manifest(manifest_path: Path, metadata: Dict[str, Any], pages: Dict[str, Dict[str, str]]):
+    manifest_path.write_text(json.dumps({'metadata': metadata, 'pages': pages}, indent=2), encoding='utf-8')
+
+
 def export_commentary_to_xmis(commentary: Type['RawCommentary'],
                               make_jsons: bool,
                               make_xmis: bool,
                               jsons_dir: Path,
                               xmis_dir: Path,
                               region_types: List[str],
-                              overwrite: bool = False):
+                              overwrite: bool = False,
+                              workers: int = 1,
+                              typesystem_path: Path = vs.TYPESYSTEM_PATH) -> Dict[str, str]:
     """
     Main function for the pipeline.
-    
+
+    Note:
+        When making xmis, a manifest (``XMI_EXPORT_MANIFEST_NAME``) records the hash of each page's rebuild in
+        ``xmis_dir``. When exporting again to the same ``xmis_dir`` (with ``overwrite=True``), pages whose rebuild, OCR
+        run, region types and typesystem are unchanged since their last export are skipped.
+
     Args:
         commentary: The commentary to convert to xmis, should be an RawCommentary object (not a canonical commentary).
         jsons_dir: Absolute path to the directory in which to write the json files or take them from.
@@ -205,45 +327,148 @@ def export_commentary_to_xmis(commentary: Type['RawCommentary'],
         make_xmis: Whether to create xmis.
         region_types: The desired regions to convert to xmis, eg ``introduction, preface, commentary, footnote``.
         overwrite: Whether to overwrite existing files.
+        workers: The number of processes among which pages are distributed when making xmis. Each worker loads the
+            typesystem once and receives pages one by one.
+        typesystem_path: The path to the typesystem of the xmis.
+
+    Returns:
+        A dict mapping the id of each page to the status of its xmi export (see ``export_json_to_xmi``), empty if
+        ``make_xmis`` is ``False``.
     """
 
-    if make_jsons and make_xmis:
+    if make_jsons:
         jsons_dir.mkdir(parents=True, exist_ok=overwrite)
-        xmis_dir.mkdir(parents=True, exist_ok=overwrite)
 
-        for page in tqdm(commentary.children.pages, desc=f'Building jsons and xmis for {commentary.id}'):
-            page.to_inception_json(output_dir=jsons_dir)
-            rebuild = basic_rebuild(page.to_inception_dict(), region_types)
-            if len(rebuild['fulltext']) > 0:  # handles the empty-page case
-                rebuild_to_xmi(rebuild, xmis_dir, commentary.ocr_run_id, region_types)
+    if not make_xmis:
+        if make_jsons:
+            for page in tqdm(commentary.children.pages, desc=f'Creating jsons for {commentary.id}'):
+                logger.debug('Canonizing page  ' + page.id)
+                page.to_inception_json(output_dir=jsons_dir)
+        return {}
 
-    elif make_jsons:
-        jsons_dir.mkdir(parents=True, exist_ok=overwrite)
-        for page in tqdm(commentary.children.pages, desc=f'Creating jsons for {commentary.id}'):
-            logger.debug('Canonizing page  ' + page.id)
-            page.to_inception_json(output_dir=jsons_dir)
+    xmis_dir.mkdir(parents=True, exist_ok=overwrite)
+
+    if make_jsons:
+        page_ids = [p.id for p in commentary.children.pages]
+    else:
+        page_ids = [json_path.stem for json_path in sorted(jsons_dir.glob('*.json'))]
+
+    # Pages whose rebuild was exported with the same metadata and whose xmi is still there are skipped
+    manifest_path = xmis_dir / XMI_EXPORT_MANIFEST_NAME
+    metadata = {'ocr_run_id': commentary.ocr_run_id,
+                'region_types': list(region_types),
+                'typesystem_hash': hashlib.sha256(Path(typesystem_path).read_bytes()).hexdigest()}
+    manifest_pages = _read_xmi_export_manifest(manifest_path, metadata)
+    tasks = []
+    for page_id in page_ids:
+        entry = manifest_pages.get(page_id)
+        up_to_date = entry is not None and (entry['status'] == 'empty' or (xmis_dir / f'{page_id}.xmi').exists())
+        tasks.append((page_id, entry['source_hash'] if up_to_date else None))
+
+    export_kwargs = {'jsons_dir': jsons_dir,
+                     'xmis_dir': xmis_dir,
+                     'ocr_run_id': commentary.ocr_run_id,
+                     'region_types': region_types,
+                     'typesystem_path': typesystem_path}
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from ajmc.text_processing.raw_classes import _get_worker_variables
+        executor = ProcessPoolExecutor(max_workers=workers,
+                                       initializer=_init_xmi_export_worker,
+                                       initargs=(export_kwargs, commentary._get_init_kwargs() if make_jsons else None,
+                                                 _get_worker_variables()))
+        results = executor.map(_export_worker_page_to_xmi, tasks)
+    else:
+        executor = None
+        results = (_export_page_to_xmi(*task, commentary=commentary if make_jsons else None, **export_kwargs)
+                   for task in tasks)
+
+    statuses = {}
+    try:
+        for page_id, source_hash, status in tqdm(results, total=len(tasks), desc=f'Building xmis for {commentary.id}'):
+            statuses[page_id] = status
+            if status != 'skipped':
+                manifest_pages[page_id] = {'source_hash': source_hash, 'status': status}
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        _write_xmi_export_manifest(manifest_path, metadata, manifest_pages)  # Also keeps track of interrupted exports
+        _XMI_PATHS.clear()  # New xmis may have been written to an indexed corpus
+
+    return statuses
+
+
+def get_typesystem(xml_path: Path) -> 'TypeSystem':
+    """Loads the typesystem at ``xml_path``, which is parsed only once for as long as the file is not modified.
+
+    Warning:
+        The returned typesystem is shared by all the CASes loaded with it and must not be modified.
+    """
+    from cassis import load_typesystem
 
-    elif make_xmis:
-        xmis_dir.mkdir(parents=True, exist_ok=overwrite)
+    xml_path = Path(xml_path)
+    stat = xml_path.stat()
+    key = (str(xml_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if key not in _TYPESYSTEMS:
+        for outdated_key in [k for k in _TYPESYSTEMS if k[0] == key[0]]:
+            del _TYPESYSTEMS[outdated_key]
+        with tracing.span('load_typesystem'), open(xml_path, 'rb') as f:
+            _TYPESYSTEMS[key] = load_typesystem(f)
+    return _TYPESYSTEMS[key]
 
-        for json_path in tqdm(jsons_dir.glob('*.json'), desc=f'Building xmis for {commentary.id}'):
-            page = json.loads(json_path.read_text(encoding='utf-8'))
-            logger.debug('Xmi-ing page  ' + page['id'])
-            rebuild = basic_rebuild(page, region_types)
-            if len(rebuild['fulltext']) > 0:  # handles the empty-page case
-                rebuild_to_xmi(rebuild, xmis_dir, commentary.ocr_run_id, region_types)
 
+def get_xmi_paths(corpus_dir: Path, pattern: str) -> Dict[str, Path]:
+    """Maps page ids to the XMIs of a corpus, scanning ``corpus_dir`` for ``pattern`` only on the first call.
+
+    Note:
+        If a page has several XMIs, the first one found is kept. Call ``clear_caches`` if XMIs are added to the corpus.
+
+    Args:
+        corpus_dir: The directory of the corpus, e.g. ``vs.NE_CORPUS_DIR``.
+        pattern: The glob pattern of the XMIs, relative to ``corpus_dir``, e.g. ``'data/preparation/corpus/*/curated/*.xmi'``.
+    """
+    key = (str(corpus_dir), pattern)
+    if key not in _XMI_PATHS:
+        xmi_paths = {}
+        with tracing.span('index_xmis', corpus_dir=str(corpus_dir)):
+            for xmi_path in sorted(Path(corpus_dir).glob(pattern)):
+                xmi_paths.setdefault(xmi_path.stem, xmi_path)
+        _XMI_PATHS[key] = xmi_paths
+    return _XMI_PATHS[key]
+
+
+def clear_caches():
+    """Clears the cached typesystems and XMI paths."""
+    _TYPESYSTEMS.clear()
+    _XMI_PATHS.clear()
+
+
+@tracing.traced('load_cas')
+def get_cas(xmi_path: Path, xml_path: Path) -> 'Cas':
+    from cassis import load_cas_from_xmi
 
-def get_cas(xmi_path: Path, xml_path: Path) -> Cas:
     # ⚠️ for some reason, passing to ``load_cas_from_xmi()`` the file object
     # works just fine, while passing to it the path (``str``) raises an
     # exception of empty XMI files (very strange!) 
     with open(xmi_path, 'rb') as inputfile:
-        cas = load_cas_from_xmi(inputfile, typesystem=load_typesystem(xml_path))
+        cas = load_cas_from_xmi(inputfile, typesystem=get_typesystem(xml_path))
     return cas
 
 
-def align_cas_annotation(cas_annotation, rebuild, verbose: bool = False):
+def get_word_bounds(rebuild: dict) -> Tuple[List[int], List[int]]:
+    """Gets the start and end offsets of the words of ``rebuild``.
+
+    Note:
+        As words are laid out one after the other, both lists are sorted and can be searched with ``bisect``. They can
+        be computed once per rebuild and passed to ``align_cas_annotation`` for each of its annotations.
+    """
+    return ([offsets[0] for offsets in rebuild['offsets']['words']],
+            [offsets[1] for offsets in rebuild['offsets']['words']])
+
+
+def align_cas_annotation(cas_annotation, rebuild, verbose: bool = False,
+                         word_bounds: Optional[Tuple[List[int], List[int]]] = None):
     # We define empty lists to store the annotation.
     bboxes, shifts, warnings = [], [], []
 
@@ -257,10 +482,12 @@ def align_cas_annotation(cas_annotation, rebuild, verbose: bool = False):
     else:
         transcript = cas_annotation.sofa.sofaString[cas_annotation.begin:cas_annotation.end]
 
-    # We then find the words included in the annotation and retrieve their bboxes
+    # We then find the words overlapping the annotation (borders included) and retrieve their bboxes. As the words are
+    # sorted, these are the words ending after the annotation's begin and starting before its end.
+    starts, ends = word_bounds if word_bounds is not None else get_word_bounds(rebuild)
+    first, last = bisect_left(ends, cas_annotation.begin), bisect_right(starts, cas_annotation.end)
     ann_words = [{'bbox': bbox, 'offsets': offsets}
-                 for bbox, offsets in zip(rebuild['bbox']['words'], rebuild['offsets']['words'])
-                 if compute_interval_overlap((cas_annotation.begin, cas_annotation.end), offsets) > 0]
+                 for bbox, offsets in zip(rebuild['bbox']['words'][first:last], rebuild['offsets']['words'][first:last])]
 
     # If the annotation words are not found in the page dictionary. This is a problem, should not happen
     if ann_words:
@@ -279,7 +506,20 @@ def align_cas_annotation(cas_annotation, rebuild, verbose: bool = False):
     return bboxes, shifts, transcript, text_window, warnings
 
 
-def get_cas_metadata(cas: Cas):
+def align_cas_annotations(cas_annotations: List['FeatureStructure'], rebuild: dict, verbose: bool = False) -> List[tuple]:
+    """Aligns all the annotations of a page with the words of its rebuild, computing the words' bounds only once.
+
+    Returns:
+        The alignment of each annotation, as returned by ``align_cas_annotation``.
+    """
+    if not cas_annotations:
+        return []
+    word_bounds = get_word_bounds(rebuild)
+    return [align_cas_annotation(cas_annotation, rebuild, verbose, word_bounds=word_bounds)
+            for cas_annotation in cas_annotations]
+
+
+def get_cas_metadata(cas: 'Cas'):
     metadata = cas.select(AJMC_METADATA_TYPE)[0]
     return {'ocr_run_id': metadata.ocr_run_id,
             'xmi_creation_date': metadata.xmi_creation_date,
@@ -287,12 +527,18 @@ def get_cas_metadata(cas: Cas):
             'region_types': metadata.region_types.split(', ')}
 
 
-def import_page_rebuild(page_id: str, annotation_type: str):
+@tracing.traced('import_page_rebuild')
+def import_page_rebuild(page_id: str,
+                        annotation_type: str,
+                        levels: Sequence[str] = REBUILD_LEVELS,
+                        fields: Sequence[str] = REBUILD_FIELDS):
     """Finds and rebuild the inception json of the fgiven ``page_id``.
 
     Args:
         page_id: The id of the page to rebuild.
         annotation_type: The type of annotation to rebuild, either ``ner`` or ``lemlink``.
+        levels: See ``basic_rebuild``.
+        fields: See ``basic_rebuild``.
     """
     comm_id = page_id.split('_')[0]
 
@@ -302,7 +548,9 @@ def import_page_rebuild(page_id: str, annotation_type: str):
         if comm_id == 'sophoclesplaysa05campgoog' and page_id in vs.MINIREF_PAGES:
             rebuild_path = vs.get_comm_ner_jsons_dir(comm_id, '1bm0b4_tess_final') / (page_id + '.json')
         return basic_rebuild(page=json.loads(rebuild_path.read_text('utf-8')),
-                             region_types=vs.IDS_TO_REGIONS[comm_id])
+                             region_types=vs.IDS_TO_REGIONS[comm_id],
+                             levels=levels,
+                             fields=fields)
 
     elif annotation_type == 'lemmas':
         run_dir = [dir_ for dir_ in (vs.get_comm_root_dir(comm_id) / vs.COMM_LEMLINK_ANN_REL_DIR).glob('*') if dir_.is_dir()][0]
@@ -320,36 +568,71 @@ def import_page_rebuild(page_id: str, annotation_type: str):
                 raise FileNotFoundError(f'No metadata file nor xmi found for {page_id}')
 
         return basic_rebuild(page=json.loads(rebuild_path.read_text('utf-8')),
-                             region_types=region_types)
+                             region_types=region_types,
+                             levels=levels,
+                             fields=fields)
 
 
+@tracing.traced('import_page_cas')
 def import_page_cas(page_id: str,
-                    annotation_type: str) -> Optional[Cas]:
-    """Finds and rebuild the inception ``.xmi`` of the fgiven ``page_id``, returning ``None`` if not found."""
+                    annotation_type: str) -> Optional['Cas']:
+    """Finds and rebuild the inception ``.xmi`` of the fgiven ``page_id``, returning ``None`` if not found.
+
+    Note:
+        XMIs are looked up in an index of their corpus, built on the first call (see ``get_xmi_paths``).
+    """
 
     if annotation_type in ['entities', 'sentences', 'hyphenations']:
         xml_path = vs.NE_CORPUS_DIR / 'data/preparation/TypeSystem.xml'
-        candidate_xmi_paths = list(vs.NE_CORPUS_DIR.glob(f'data/preparation/corpus/*/curated/{page_id}.xmi'))
-        if candidate_xmi_paths:
-            xmi_path = candidate_xmi_paths[0]
-            return get_cas(xmi_path, xml_path)
-        else:
-            return
+        xmi_path = get_xmi_paths(vs.NE_CORPUS_DIR, 'data/preparation/corpus/*/curated/*.xmi').get(page_id)
 
     elif annotation_type == 'lemmas':
         xml_path = vs.LEMLINK_XMI_DIR / 'TypeSystem.xml'
-        xmi_path = vs.LEMLINK_XMI_DIR / (f'{page_id}.xmi')
-        if xmi_path.exists():
-            return get_cas(xmi_path, xml_path)
-        else:
-            return
+        xmi_path = get_xmi_paths(vs.LEMLINK_XMI_DIR, '*.xmi').get(page_id)
+
+    else:
+        return
+
+    if xmi_path is not None:
+        return get_cas(xmi_path, xml_path)
+
+
+@tracing.traced('import_page_annotations')
+def import_page_annotations(page_id: str,
+                            annotation_types: List[str]) -> Tuple[Optional[dict], Dict[str, List['FeatureStructure']]]:
+    """Imports the rebuild and the annotations of several annotation types of a page, parsing its files only once.
+
+    Args:
+        page_id: The id of the page.
+        annotation_types: The types of annotations to import, which must come from the same corpus, i.e. be taken
+            either from ``['entities', 'sentences', 'hyphenations']`` or from ``['lemmas']``.
+
+    Returns:
+        The rebuild of the page (``None`` if not found), with only the words' bboxes and offsets needed to align the
+        annotations, and a dict mapping each annotation type to its annotations, which are empty if the page has no
+        rebuild or no CAS.
+    """
+    try:
+        rebuild = import_page_rebuild(page_id, annotation_type=annotation_types[0],
+                                      levels=['words'], fields=['bbox', 'offsets'])
+    except:
+        logger.debug(f'Looking for {annotation_types}: No rebuild file found for page {page_id}')
+        return None, {annotation_type: [] for annotation_type in annotation_types}
+
+    cas = import_page_cas(page_id, annotation_types[0])
+    if cas is None:
+        return rebuild, {annotation_type: [] for annotation_type in annotation_types}
+
+    return rebuild, {annotation_type: safe_import_page_annotations(page_id, cas, rebuild,
+                                                                   vs.ANNOTATION_LAYERS[annotation_type])
+                     for annotation_type in annotation_types}
 
 
 def safe_import_page_annotations(page_id,
                                  cas,
                                  rebuild,
                                  annotation_layer: str,
-                                 manual_safe_check: bool = False) -> List[FeatureStructure]:
+                                 manual_safe_check: bool = False) -> List['FeatureStructure']:
     if manual_safe_check and cas.sofa_string != rebuild['fulltext']:
         print(f'Alignment error, skipping: {page_id}')
         print('REBUILD**************************')
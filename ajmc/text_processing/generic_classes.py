@@ -1,16 +1,15 @@
 import re
 from abc import abstractmethod
 from pathlib import Path
-from typing import List, Optional, Type, Union, Callable
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 import cv2
-import unicodedata
 from lazy_objects.lazy_objects import lazy_property, LazyObject
 
 from ajmc.commons import variables as vs, image as ajmc_img
 from ajmc.commons.docstrings import docstring_formatter, docstrings
 from ajmc.commons.miscellaneous import get_ajmc_logger
-from ajmc.ocr import variables as ocr_vs
+from ajmc.ocr.data_processing.line_shards import export_line_pairs
 
 logger = get_ajmc_logger(__name__)
 
@@ -89,7 +88,38 @@ class Commentary(TextContainer):
 
     def get_page(self, page_id: str) -> Optional[vs.PageType]:
         """A simple shortcut to get a page from its id."""
-        return [p for p in self.children.pages if p.id == page_id][0]
+        return self.get_id_map('pages').get(page_id)
+
+    def get_image(self, image_id: str) -> Optional[ajmc_img.AjmcImage]:
+        """A simple shortcut to get an image from its id."""
+        return self._get_id_map('images', self.images).get(image_id)
+
+    @docstring_formatter(**docstrings)
+    def get_id_map(self, children_type: str) -> Dict[str, Type['TextContainer']]:
+        """Maps the ids of ``self.children.<children_type>`` to the corresponding ``TextContainer``s.
+
+        Note:
+            The mapping is cached and rebuilt whenever ``self.children.<children_type>`` is reassigned. If several
+            children share an id, the first one is kept.
+
+        Args:
+            children_type: {children_type}
+        """
+        return self._get_id_map(children_type, getattr(self.children, children_type))
+
+    def _get_id_map(self, key: str, objects: List[Any]) -> Dict[str, Any]:
+        objects_list, id_map = self._id_maps.get(key, (None, None))
+        if objects_list is not objects:
+            id_map = {}
+            for obj in objects:
+                id_map.setdefault(obj.id, obj)
+            self._id_maps[key] = (objects, id_map)
+        return id_map
+
+    @lazy_property
+    def _id_maps(self) -> Dict[str, Tuple[List[Any], Dict[str, Any]]]:
+        """Maps keys to the list of objects they were computed from and to their id mapping."""
+        return {}
 
     def get_section(self, section_type: str) -> Optional[Type['TextContainer']]:
         """A simple shortcut to get a section from its type."""
@@ -100,7 +130,9 @@ class Commentary(TextContainer):
 
     def export_ocr_gt_file_pairs(self,
                                  output_dir: Optional[Union[str, Path]] = None,
-                                 unicode_format: str = 'NFC'):
+                                 unicode_format: str = 'NFC',
+                                 shard_size: Optional[int] = None,
+                                 workers: int = 8):
         """Exports png-txt file pairs for each line in each ocr groundtruth page of the commentary.
 
         Args:
@@ -108,18 +140,13 @@ class Commentary(TextContainer):
             default output directory (``vs.get_comm_ocr_gt_pairs_dir``).
             unicode_format: The unicode format to which the text should be normalized. See
             https://docs.python.org/3/library/unicodedata.html#unicodedata.normalize for more information.
+            shard_size: If given, pairs are written to tar shards of ``shard_size`` lines with an index, rather than as
+            loose files. See ``ajmc.ocr.data_processing.line_shards``.
+            workers: The number of threads encoding the line images.
         """
-
         # Define output directory
         output_dir = vs.get_comm_ocr_gt_pairs_dir(self.id) if output_dir is None else Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Iterate over groundtruth pages
-        for page in self.ocr_gt_pages:
-            for i, line in enumerate(page.children.lines):
-                line.image.write(output_dir / f'{page.id}_{i}{ocr_vs.IMG_EXTENSION}')
-                (output_dir / f'{page.id}_{i}{ocr_vs.GT_TEXT_EXTENSION}').write_text(unicodedata.normalize(unicode_format, line.text),
-                                                                                     encoding='utf-8')
+        export_line_pairs(self.ocr_gt_pages, output_dir, unicode_format=unicode_format, shard_size=shard_size, workers=workers)
 
     @lazy_property
     def root_dir(self) -> Path:
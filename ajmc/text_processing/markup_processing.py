@@ -3,23 +3,28 @@ This module contains all the functions to read OCR- and OLR-output, for all the
 formats (json, hocr, page-XML...)
 """
 
-from typing import List, Union
+import re
+from pathlib import Path
+from typing import List, Tuple, TYPE_CHECKING, Union
 
-import bs4
+from lxml import etree
 
 from ajmc.commons import variables as vs
 from ajmc.commons.geometry import Shape
 
+if TYPE_CHECKING:
+    import bs4
+
 
 # ===========================  COORDS EXTRACTERS  ============================
-def get_hocr_element_bbox(element: bs4.element.Tag) -> Shape:
+def get_hocr_element_bbox(element: 'bs4.element.Tag') -> Shape:
     """Extract bbox from ``title='...; bbox X1 Y1 X2 Y2; ...'``"""
     coords = [int(num) for el in element['title'].split(';') if el.strip().startswith('bbox')
               for num in el.strip().split()[1:]]
     return Shape([(coords[0], coords[1]), (coords[2], coords[3])])
 
 
-def get_pagexml_element_bbox(element: bs4.element.Tag) -> Shape:
+def get_pagexml_element_bbox(element: 'bs4.element.Tag') -> Shape:
     points = element.find('pc:Coords')['points'].split()  # A List[str]
     return Shape([tuple(int(coord) for coord in point.split(',')) for point in points])
 
@@ -28,7 +33,7 @@ def get_json_element_bbox(element: dict) -> Shape:
     return Shape.from_xyxy(*element['xyxy'])
 
 
-def get_element_bbox(element: Union[bs4.element.Tag, dict], ocr_format: str = 'hocr') -> Shape:
+def get_element_bbox(element: Union['bs4.element.Tag', dict], ocr_format: str = 'hocr') -> Shape:
     """Generic extractor. Extracts the bbox of a markup element."""
     if ocr_format in ['hocr', 'html']:
         return get_hocr_element_bbox(element)
@@ -44,7 +49,7 @@ def get_element_bbox(element: Union[bs4.element.Tag, dict], ocr_format: str = 'h
 
 
 # =========================  TEXT EXTRACTERS  =================================
-def get_element_text(element: Union[bs4.element.Tag, dict], ocr_format: str = 'hocr') -> str:
+def get_element_text(element: Union['bs4.element.Tag', dict], ocr_format: str = 'hocr') -> str:
     """Generic extractor. Extracts the text from a markup element."""
     if ocr_format in ['hocr', 'html']:
         return element.text
@@ -57,7 +62,7 @@ def get_element_text(element: Union[bs4.element.Tag, dict], ocr_format: str = 'h
 
 
 # ===========================  ELEMENT EXTRACTERS  ============================
-def find_all_tesshocr_elements(element: bs4.element.Tag, name: str) -> List[bs4.element.Tag]:
+def find_all_tesshocr_elements(element: 'bs4.element.Tag', name: str) -> List['bs4.element.Tag']:
     """Finds all sub-elements with ``name`` in ``element``.
 
     Args:
@@ -76,7 +81,7 @@ def find_all_tesshocr_elements(element: bs4.element.Tag, name: str) -> List[bs4.
         raise NotImplementedError("""Accepted elements are 'lines' and 'words'.""")
 
 
-def find_all_krakenhocr_elements(element: bs4.element.Tag, name: str) -> List[bs4.element.Tag]:
+def find_all_krakenhocr_elements(element: 'bs4.element.Tag', name: str) -> List['bs4.element.Tag']:
     """Finds all sub-elements with ``name`` in ``element``.
 
     Args:
@@ -95,7 +100,7 @@ def find_all_krakenhocr_elements(element: bs4.element.Tag, name: str) -> List[bs
         raise NotImplementedError("""Accepted elements are 'lines' and 'words'.""")
 
 
-def find_all_pagexml_elements(element: bs4.element.Tag, name: str) -> List[bs4.element.Tag]:
+def find_all_pagexml_elements(element: 'bs4.element.Tag', name: str) -> List['bs4.element.Tag']:
     """Finds all sub-elements with ``name`` in ``element``.
 
     Args:
@@ -133,8 +138,8 @@ def find_all_json_elements(element: dict, name: str) -> List[dict]:
         raise NotImplementedError("""Accepted elements are 'lines' and 'words'.""")
 
 
-def find_all_elements(element: Union[bs4.element.Tag, bs4.BeautifulSoup, dict], name: str, format: str = 'hocr') -> List[
-    Union[bs4.element.Tag, dict]]:
+def find_all_elements(element: Union['bs4.element.Tag', 'bs4.BeautifulSoup', dict], name: str, format: str = 'hocr') -> List[
+    Union['bs4.element.Tag', dict]]:
     """Generic extractor. Finds all sub-elements with ``name`` in ``element``.
 
     Args:
@@ -156,3 +161,77 @@ def find_all_elements(element: Union[bs4.element.Tag, bs4.BeautifulSoup, dict],
         return find_all_json_elements(element, name)
     else:
         raise NotImplementedError(f'Accepted formats are {vs.OCR_OUTPUTS_EXTENSIONS}.')
+
+
+# ===========================  PAGE PARSERS  ==================================
+def parse_ocr_lines_with_bs4(markup: Union['bs4.BeautifulSoup', dict], ocr_format: str = 'hocr') -> List[List[Tuple[str, Shape]]]:
+    """Parses the lines and words of an OCR output with the generic bs4 extractors above.
+
+    Args:
+        markup: The page's markup, as a ``bs4.BeautifulSoup`` (or a ``dict`` for json outputs).
+        ocr_format: The ocr-output format to consider, e.g. 'hocr', 'html' or 'xml'.
+
+    Returns:
+        A list of lines, each being a list of words' ``(text, bbox)``.
+    """
+    return [[(get_element_text(w_markup, ocr_format), get_element_bbox(w_markup, ocr_format))
+             for w_markup in find_all_elements(l_markup, 'word', ocr_format)]
+            for l_markup in find_all_elements(markup, 'line', ocr_format)]
+
+
+def _get_class_predicate(classes: List[str]) -> str:
+    return ' or '.join([f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')" for c in classes])
+
+
+_HOCR_LINE_PREDICATE = _get_class_predicate(['ocr_line', 'ocrx_line', 'ocr_textfloat', 'ocr_header'])
+
+# The compiled XPaths to find lines in a page and words in a line, for each lxml-parsable ocr format
+LXML_XPATHS = {'hocr': (etree.XPath(f'//*[{_HOCR_LINE_PREDICATE}]'),
+                        etree.XPath(f"descendant::*[{_get_class_predicate(['ocrx_word'])}]")),
+               'html': (etree.XPath(f'//*[{_HOCR_LINE_PREDICATE}]'),
+                        etree.XPath(f"descendant::*[{_get_class_predicate(['ocr_word'])}]")),
+               'xml': (etree.XPath("//*[local-name()='TextLine']"),
+                       etree.XPath("descendant::*[local-name()='Word']"))}
+
+_PAGEXML_COORDS_XPATH = etree.XPath("(descendant::*[local-name()='Coords'])[1]/@points")
+_PAGEXML_TEXT_XPATH = etree.XPath("(*[local-name()='TextEquiv'])[1]/*[local-name()='Unicode'][1]")
+_HOCR_BBOX_PATTERN = re.compile(r'(?:^|;)\s*bbox\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)')
+_LXML_PARSER = etree.XMLParser(huge_tree=True, resolve_entities=False, no_network=True)
+
+
+def _get_lxml_word(element: etree._Element, ocr_format: str) -> Tuple[str, Shape]:
+    """Gets the ``(text, bbox)`` of a word element. Raises ``ValueError`` if it can't be parsed."""
+
+    if ocr_format == 'xml':
+        unicode_elements = _PAGEXML_TEXT_XPATH(element)
+        points = _PAGEXML_COORDS_XPATH(element)
+        if not unicode_elements or unicode_elements[0].text is None or not points:
+            raise ValueError('PAGE-XML word without text or coords.')
+        return unicode_elements[0].text, Shape([tuple(int(coord) for coord in point.split(',')) for point in points[0].split()])
+
+    match = _HOCR_BBOX_PATTERN.search(element.get('title', ''))
+    if match is None:
+        raise ValueError('hOCR word without bbox.')
+    x1, y1, x2, y2 = [int(coord) for coord in match.groups()]
+    return ''.join(element.itertext()), Shape([(x1, y1), (x2, y2)])
+
+
+def parse_ocr_lines_with_lxml(ocr_path: Union[str, Path], ocr_format: str = 'hocr') -> List[List[Tuple[str, Shape]]]:
+    """Parses the lines and words of an OCR output with lxml and compiled XPaths, without building a bs4 tree.
+
+    Note:
+        This is a faster equivalent of ``parse_ocr_lines_with_bs4`` for the formats in ``LXML_XPATHS``. Elements are
+        matched namespace-agnostically. Malformed files (e.g. html entities, missing bboxes) raise an error, so that
+        callers can fall back to bs4.
+
+    Args:
+        ocr_path: The path to the OCR output.
+        ocr_format: The ocr-output format to consider, e.g. 'hocr', 'html' or 'xml'.
+
+    Returns:
+        A list of lines, each being a list of words' ``(text, bbox)``.
+    """
+    find_lines, find_words = LXML_XPATHS[ocr_format]
+    root = etree.parse(str(ocr_path), parser=_LXML_PARSER).getroot()
+    return [[_get_lxml_word(w_element, ocr_format) for w_element in find_words(l_element)]
+            for l_element in find_lines(root)]
@@ -0,0 +1,144 @@
+"""A persistent cache of parsed OCR outputs, used by ``RawPage`` to avoid re-parsing unchanged OCR files.
+
+Each OCR file gets a sidecar ``.npz`` entry in the cache directory, named after the hash of the file's resolved path. An
+entry stores the words' texts (a utf-8 blob and its byte offsets), their bbox points, the number of words per line, and
+the signature (mtime, size and cache version) of the OCR file it was computed from. Entries whose signature no longer
+matches are recomputed on access.
+
+Use ``python -m ajmc.text_processing.ocr_cache --prune`` to remove the entries whose OCR file no longer exists or has
+changed.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from ajmc.commons import variables as vs
+from ajmc.commons.geometry import Shape
+from ajmc.commons.miscellaneous import get_ajmc_logger
+
+logger = get_ajmc_logger(__name__)
+
+PARSED_OCR_CACHE_VERSION = 1  # Increment this whenever the parsing of OCR outputs changes
+
+
+def get_entry_path(ocr_path: Union[str, Path], cache_dir: Union[str, Path]) -> Path:
+    """Gets the path to the cache entry of ``ocr_path`` in ``cache_dir``."""
+    return Path(cache_dir) / (hashlib.sha1(str(Path(ocr_path).resolve()).encode('utf-8')).hexdigest() + '.npz')
+
+
+def get_signature(ocr_path: Union[str, Path]) -> np.ndarray:
+    """Gets the signature of an OCR file, i.e. its mtime (in ns), its size and the current cache version."""
+    stat = os.stat(ocr_path)
+    return np.array([stat.st_mtime_ns, stat.st_size, PARSED_OCR_CACHE_VERSION], dtype=np.int64)
+
+
+def save_parsed_ocr(ocr_path: Union[str, Path],
+                    lines: List[List[Tuple[str, Shape]]],
+                    cache_dir: Union[str, Path]):
+    """Saves the parsed lines of ``ocr_path`` to ``cache_dir``.
+
+    Args:
+        ocr_path: The path to the parsed OCR file.
+        lines: A list of lines, each being a list of words' ``(text, bbox)``, as returned by
+            ``markup_processing.parse_ocr_lines_with_lxml``.
+        cache_dir: The cache directory.
+    """
+    words = [word for line in lines for word in line]
+    encoded_texts = [text.encode('utf-8') for text, _ in words]
+
+    text_offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum([len(t) for t in encoded_texts], out=text_offsets[1:])
+    points_offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum([len(bbox.points) for _, bbox in words], out=points_offsets[1:])
+
+    entry_path = get_entry_path(ocr_path, cache_dir)
+    entry_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = entry_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez(f,
+                 ocr_path=np.array(str(Path(ocr_path).resolve())),
+                 signature=get_signature(ocr_path),
+                 text_blob=np.frombuffer(b''.join(encoded_texts), dtype=np.uint8),
+                 text_offsets=text_offsets,
+                 points=np.array([xy for _, bbox in words for xy in bbox.points], dtype=np.int64).reshape(-1, 2),
+                 points_offsets=points_offsets,
+                 line_lengths=np.array([len(line) for line in lines], dtype=np.int64))
+    os.replace(tmp_path, entry_path)  # Atomic, so that concurrent readers never see a partial entry
+
+
+def load_parsed_ocr(ocr_path: Union[str, Path], cache_dir: Union[str, Path]) -> Optional[List[List[Tuple[str, Shape]]]]:
+    """Loads the parsed lines of ``ocr_path`` from ``cache_dir``.
+
+    Returns:
+        A list of lines, each being a list of words' ``(text, bbox)``, or ``None`` if there is no valid entry.
+    """
+    entry_path = get_entry_path(ocr_path, cache_dir)
+    if not entry_path.is_file():
+        return None
+
+    try:
+        with np.load(entry_path, allow_pickle=False) as entry:
+            if not np.array_equal(entry['signature'], get_signature(ocr_path)):
+                return None
+            text_blob = entry['text_blob'].tobytes()
+            text_offsets = entry['text_offsets'].tolist()
+            points = [tuple(xy) for xy in entry['points'].tolist()]
+            points_offsets = entry['points_offsets'].tolist()
+            line_lengths = entry['line_lengths'].tolist()
+    except Exception as e:
+        logger.debug(f'Could not read cache entry {entry_path} ({e}).')
+        return None
+
+    lines = []
+    w_count = 0
+    for line_length in line_lengths:
+        lines.append([(text_blob[text_offsets[i]:text_offsets[i + 1]].decode('utf-8'),
+                       Shape(points[points_offsets[i]:points_offsets[i + 1]]))
+                      for i in range(w_count, w_count + line_length)])
+        w_count += line_length
+
+    return lines
+
+
+def prune_parsed_ocr_cache(cache_dir: Optional[Union[str, Path]] = None) -> List[Path]:
+    """Removes the entries of ``cache_dir`` (defaults to ``variables.PARSED_OCR_CACHE_DIR``) whose OCR file no longer
+    exists or has changed.
+
+    Returns:
+        The paths of the removed entries.
+    """
+    cache_dir = vs.PARSED_OCR_CACHE_DIR if cache_dir is None else cache_dir
+    removed = []
+    for entry_path in Path(cache_dir).glob('*.npz'):
+        try:
+            with np.load(entry_path, allow_pickle=False) as entry:
+                ocr_path = Path(str(entry['ocr_path']))
+                is_valid = ocr_path.is_file() and np.array_equal(entry['signature'], get_signature(ocr_path))
+        except Exception:
+            is_valid = False
+
+        if not is_valid:
+            entry_path.unlink()
+            removed.append(entry_path)
+
+    return removed
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manage the cache of parsed OCR outputs.')
+    parser.add_argument('--cache_dir', type=str, help='The cache directory. Defaults to variables.PARSED_OCR_CACHE_DIR.')
+    parser.add_argument('--prune', action='store_true',
+                        help='Remove the entries whose OCR file no longer exists (e.g. deleted OCR runs) or has changed.')
+
+    args = parser.parse_args()
+    args.cache_dir = args.cache_dir or vs.PARSED_OCR_CACHE_DIR  # Only evaluated if needed, as it requires AJMC_DATA_DIR
+
+    if args.prune:
+        removed = prune_parsed_ocr_cache(args.cache_dir)
+        print(f'Removed {len(removed)} entries from {args.cache_dir}.')
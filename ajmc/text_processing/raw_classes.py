@@ -9,28 +9,30 @@ import re
 from abc import abstractmethod
 from pathlib import Path
 from time import strftime
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, TYPE_CHECKING
 
-import bs4.element
-import jsonschema
 from lazy_objects.lazy_objects import lazy_property, LazyObject
 from tqdm import tqdm
 
-from ajmc.commons import variables as vs
+from ajmc.commons import tracing, variables as vs
 from ajmc.commons.docstrings import docstring_formatter, docstrings
 from ajmc.commons.file_management import get_commit_hash
 from ajmc.commons.geometry import adjust_bbox_to_included_contours, get_bbox_from_points, is_bbox_within_bbox, \
     is_bbox_within_bbox_with_threshold, Shape, are_bboxes_overlapping_with_threshold
 from ajmc.commons.image import AjmcImage
 from ajmc.commons.miscellaneous import get_ajmc_logger
+from ajmc.commons.spatial_index import GridIndex
 from ajmc.olr.utils import sort_to_reading_order
-from ajmc.text_processing import cas_utils
+from ajmc.text_processing import cas_utils, ocr_cache
 from ajmc.text_processing.canonical_classes import CanonicalCommentary, CanonicalEntity, CanonicalHyphenation, \
     CanonicalLine, CanonicalPage, CanonicalRegion, CanonicalSection, CanonicalSentence, CanonicalWord, CanonicalLemma
 from ajmc.text_processing.generic_classes import Commentary, Page, TextContainer
-from ajmc.text_processing.markup_processing import find_all_elements, get_element_bbox, get_element_text
+from ajmc.text_processing.markup_processing import LXML_XPATHS, parse_ocr_lines_with_bs4, parse_ocr_lines_with_lxml
 from ajmc.text_processing.via import ViaProject
 
+if TYPE_CHECKING:
+    import bs4
+
 logger = get_ajmc_logger(__name__)
 
 
@@ -72,7 +74,8 @@ class RawCommentary(Commentary):
 
         super().__init__(id=id, ocr_run_id=vs.get_ocr_run_id_from_pattern(id, ocr_run_id), **kwargs)
 
-    def to_canonical(self) -> CanonicalCommentary:
+    @tracing.traced('to_canonical')
+    def to_canonical(self, workers: int = 1) -> CanonicalCommentary:
         """Export the commentary to a ``CanonicalCommentary`` object.
 
         Note:
@@ -80,6 +83,11 @@ class RawCommentary(Commentary):
             is empty, or that coordinates are fuzzy. It hence relies on RawPage.optimize() to fix these issues. Though this code
             is far from elegant, I wouldn't recommend touching it unless you are 100% sure of what you are doing.
 
+        Args:
+            workers: The number of processes among which pages are distributed. Each page is parsed, optimised and
+                aligned with its annotations in a worker (see ``get_canonical_page_data``), and results are then merged
+                in order, so that the output is identical to the serial one (``workers=1``).
+
         Returns:
             A ``CanonicalCommentary`` object.
         """
@@ -96,91 +104,72 @@ class RawCommentary(Commentary):
                                   lemlink_gt_page_ids=self.lemlink_gt_page_ids,
                                   metadata=self.metadata, )
 
+        # We compute the pages' data, either serially or in a pool of workers
+        sections = self.children.sections
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           initializer=_init_canonization_worker,
+                                           initargs=(self._get_init_kwargs(), _get_worker_variables(),
+                                                     tracing.is_enabled()))
+            pages_data = executor.map(_get_worker_canonical_page_data,
+                                      [p.id for section in sections for p in section.children.pages])
+        else:
+            executor = None
+            pages_data = (get_canonical_page_data(p) for section in sections for p in section.children.pages)
+
         # We now populate the children and images
         children = {k: [] for k in vs.CHILD_TYPES}
         w_count = 0
-        for section in self.children.sections:
-            section_start = w_count
-            for page in tqdm(section.children.pages, desc=f'Canonizing section {section.section_title}...'):
-                page = page.get_ocr_gt_page()
-                page.optimise()
-                p_start = w_count
-                for r in page.children.regions:
-                    r_start = w_count
-                    for l in r.children.lines:
-                        l_start = w_count
-                        for w in l.children.words:
-                            w.index = w_count  # for later use with annotations
-                            children['words'].append(CanonicalWord(text=w.text, bbox=w.bbox.bbox, commentary=can))
-                            w_count += 1  # Hence w_count - 1 below
-
-                        children['lines'].append(CanonicalLine(word_range=(l_start, w_count - 1), commentary=can))
-
-                    children['regions'].append(CanonicalRegion(word_range=(r_start, w_count - 1),
-                                                               commentary=can,
-                                                               region_type=r.region_type,
-                                                               is_ocr_gt=r.is_ocr_gt))
-
-                children['pages'].append(CanonicalPage(id=page.id, word_range=(p_start, w_count - 1), commentary=can))
-
-                # Adding images
-                can.images.append(AjmcImage(id=page.id, path=Path(page.img_path), word_range=(p_start, w_count - 1)))
-
-                # Adding entities
-                for ent in page.children.entities:
-                    if ent.children.words:
-                        children['entities'].append(
-                                CanonicalEntity(word_range=(ent.children.words[0].index, ent.children.words[-1].index),
-                                                commentary=can,
-                                                shifts=ent.shifts,
-                                                transcript=ent.transcript,
-                                                label=ent.label,
-                                                wikidata_id=ent.wikidata_id))
-                    else:
-                        print(f'WARNING: NO WORDS. {page.id} ent {ent.transcript}')  # Todo remove
-                # Adding sentences
-                for s in page.children.sentences:
-                    if s.children.words:
-                        children['sentences'].append(
-                                CanonicalSentence(word_range=(s.children.words[0].index, s.children.words[-1].index),
-                                                  commentary=can,
-                                                  shifts=s.shifts,
-                                                  corrupted=s.corrupted,
-                                                  incomplete_continuing=s.incomplete_continuing,
-                                                  incomplete_truncated=s.incomplete_truncated))
-                    else:
-                        print(f'WARNING: NO WORDS. {page.id} sentence')  # Todo remove
-
-                # Adding hyphenations
-                for h in page.children.hyphenations:
-                    if h.children.words:
-                        children['hyphenations'].append(
-                                CanonicalHyphenation(word_range=(h.children.words[0].index, h.children.words[-1].index),
-                                                     commentary=can,
-                                                     shifts=h.shifts))
-                    else:
-                        print(f'WARNING: NO WORDS. {page.id} hyphen')  # Todo remove
-
-                for l in page.children.lemmas:
-                    if l.children.words:
-                        children['lemmas'].append(CanonicalLemma(word_range=(l.children.words[0].index, l.children.words[-1].index),
-                                                                 commentary=can,
-                                                                 shifts=l.shifts,
-                                                                 label=l.value,
-                                                                 transcript=l.transcript,
-                                                                 anchor_target=l.anchor_target))
-                    else:
-                        print(f'WARNING: NO WORDS. {page.id} lemma {l.transcript}')  # Todo remove
-
-                # We reset the page to free up memory
-                page.reset()
-
-            # Adding sections
-            children['sections'].append(
-                    CanonicalSection(word_range=(section_start, w_count - 1),
-                                     commentary=can,
-                                     section_types=section.section_types,
-                                     section_title=section.section_title))
+        try:
+            for section in sections:
+                section_start = w_count
+                for _ in tqdm(section.children.pages, desc=f'Canonizing section {section.section_title}...'):
+                    page_data = next(pages_data)
+                    tracing.add_events(page_data.pop('trace_events', []))
+                    p_start = w_count
+
+                    for text, bbox in page_data['words']:
+                        children['words'].append(CanonicalWord(text=text, bbox=bbox, commentary=can))
+
+                    for (start, end) in page_data['lines']:
+                        children['lines'].append(CanonicalLine(word_range=(p_start + start, p_start + end), commentary=can))
+
+                    for (start, end), region_type, is_ocr_gt in page_data['regions']:
+                        children['regions'].append(CanonicalRegion(word_range=(p_start + start, p_start + end),
+                                                                   commentary=can,
+                                                                   region_type=region_type,
+                                                                   is_ocr_gt=is_ocr_gt))
+
+                    w_count += len(page_data['words'])
+                    children['pages'].append(CanonicalPage(id=page_data['id'], word_range=(p_start, w_count - 1), commentary=can))
+
+                    # Adding images
+                    can.images.append(AjmcImage(id=page_data['id'], path=Path(page_data['img_path']), word_range=(p_start, w_count - 1)))
+
+                    # Adding entities, sentences, hyphenations and lemmas
+                    for annotation_type, annotation_class in [('entities', CanonicalEntity),
+                                                              ('sentences', CanonicalSentence),
+                                                              ('hyphenations', CanonicalHyphenation),
+                                                              ('lemmas', CanonicalLemma)]:
+                        for (start, end), kwargs in page_data[annotation_type]:
+                            children[annotation_type].append(
+                                    annotation_class(word_range=(p_start + start, p_start + end), commentary=can, **kwargs))
+
+                # Adding sections
+                children['sections'].append(
+                        CanonicalSection(word_range=(section_start, w_count - 1),
+                                         commentary=can,
+                                         section_types=section.section_types,
+                                         section_title=section.section_title))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # We set indices eagerly, as ``CanonicalTextContainer.index`` would otherwise scan the children lists
+        for tcs in children.values():
+            for i, tc in enumerate(tcs):
+                tc.index = i
 
         # We now populate the children of the commentary
         can.children = LazyObject((lambda x: x), constrained_attrs=vs.CHILD_TYPES, **children)
@@ -190,6 +179,17 @@ class RawCommentary(Commentary):
 
         return can
 
+    def _get_init_kwargs(self) -> Dict[str, Any]:
+        """Gets the keyword arguments needed to re-instantiate the commentary, e.g. in another process."""
+        return {'id': self.id,
+                'ocr_run_id': self.ocr_run_id,
+                'ocr_dir': self.ocr_dir,
+                'via_path': self.via_path,
+                'sections_path': self.sections_path,
+                'img_dir': self.img_dir,
+                'ocr_parser': self.ocr_parser,
+                'ocr_cache_dir': self.ocr_cache_dir}
+
     def _get_children(self, children_type):
 
         if children_type == 'pages':
@@ -208,6 +208,16 @@ class RawCommentary(Commentary):
         """The directory containing the ocr files."""
         return vs.get_comm_ocr_outputs_dir(self.id, self.ocr_run_id)
 
+    @lazy_property
+    def ocr_parser(self) -> str:
+        """The backend used to parse hocr, html and xml OCR outputs, either ``'lxml'`` (faster) or ``'bs4'``."""
+        return vs.DEFAULT_OCR_PARSER
+
+    @lazy_property
+    def ocr_cache_dir(self) -> Optional[Path]:
+        """The directory caching parsed OCR outputs (see ``ajmc.text_processing.ocr_cache``). Set to ``None`` to disable."""
+        return vs.PARSED_OCR_CACHE_DIR
+
     @lazy_property
     def via_path(self) -> Path:
         """The path to the commentary's VIA project."""
@@ -318,6 +328,125 @@ class RawCommentary(Commentary):
         self.children.pages = [p.get_ocr_gt_page() for p in self.children.pages]
 
 
+@tracing.traced('canonize_page')
+def get_canonical_page_data(page: 'RawPage') -> Dict[str, Any]:
+    """Parses, optimises and aligns a page with its annotations, returning the data needed to canonize it.
+
+    Note:
+        Word ranges are local to the page (i.e. its first word has index 0). They are renumbered by
+        ``RawCommentary.to_canonical`` when merging pages. The returned data is made of builtins only, so that it can be
+        cheaply sent back from a worker process.
+
+    Args:
+        page: The ``RawPage`` to canonize. Its OCR groundtruth is used instead if available.
+
+    Returns:
+        A dict with the page's ``id``, ``img_path``, ``words`` (as ``(text, bbox)`` tuples), ``lines``, ``regions``
+        (as ``(word_range, region_type, is_ocr_gt)`` tuples) and annotations (as ``(word_range, kwargs)`` tuples).
+    """
+    page = page.get_ocr_gt_page()
+    page.optimise()
+
+    data = {'id': page.id, 'img_path': str(page.img_path), 'words': [], 'lines': [], 'regions': []}
+    w_count = 0
+    for r in page.children.regions:
+        r_start = w_count
+        for l in r.children.lines:
+            l_start = w_count
+            for w in l.children.words:
+                w.index = w_count  # for later use with annotations
+                data['words'].append((w.text, w.bbox.bbox))
+                w_count += 1  # Hence w_count - 1 below
+
+            data['lines'].append((l_start, w_count - 1))
+
+        data['regions'].append(((r_start, w_count - 1), r.region_type, r.is_ocr_gt))
+
+    tracing.count('pages')
+    tracing.count('words', w_count)
+
+    # Adding entities
+    data['entities'] = []
+    for ent in page.children.entities:
+        if ent.children.words:
+            data['entities'].append(((ent.children.words[0].index, ent.children.words[-1].index),
+                                     {'shifts': ent.shifts,
+                                      'transcript': ent.transcript,
+                                      'label': ent.label,
+                                      'wikidata_id': ent.wikidata_id}))
+        else:
+            print(f'WARNING: NO WORDS. {page.id} ent {ent.transcript}')  # Todo remove
+
+    # Adding sentences
+    data['sentences'] = []
+    for s in page.children.sentences:
+        if s.children.words:
+            data['sentences'].append(((s.children.words[0].index, s.children.words[-1].index),
+                                      {'shifts': s.shifts,
+                                       'corrupted': s.corrupted,
+                                       'incomplete_continuing': s.incomplete_continuing,
+                                       'incomplete_truncated': s.incomplete_truncated}))
+        else:
+            print(f'WARNING: NO WORDS. {page.id} sentence')  # Todo remove
+
+    # Adding hyphenations
+    data['hyphenations'] = []
+    for h in page.children.hyphenations:
+        if h.children.words:
+            data['hyphenations'].append(((h.children.words[0].index, h.children.words[-1].index), {'shifts': h.shifts}))
+        else:
+            print(f'WARNING: NO WORDS. {page.id} hyphen')  # Todo remove
+
+    # Adding lemmas
+    data['lemmas'] = []
+    for l in page.children.lemmas:
+        if l.children.words:
+            data['lemmas'].append(((l.children.words[0].index, l.children.words[-1].index),
+                                   {'shifts': l.shifts,
+                                    'label': l.value,
+                                    'transcript': l.transcript,
+                                    'anchor_target': l.anchor_target}))
+        else:
+            print(f'WARNING: NO WORDS. {page.id} lemma {l.transcript}')  # Todo remove
+
+    # We reset the page to free up memory
+    page.reset()
+
+    return data
+
+
+# The commentary of a ``RawCommentary.to_canonical`` worker process, set by ``_init_canonization_worker``
+_WORKER_COMMENTARY: Optional[RawCommentary] = None
+
+# The variables which must be shared with worker processes, as they may have been changed at runtime
+# ``AJMC_DATA_DIR`` comes first, so that the other paths are derived from it in workers which evaluate them lazily
+_WORKER_VARIABLES_NAMES = ['AJMC_DATA_DIR', 'COMMS_DATA_DIR', 'NE_CORPUS_DIR', 'LEMLINK_CORPUS_DIR', 'LEMLINK_XMI_DIR',
+                           'PARSED_OCR_CACHE_DIR', 'CONTOURS_CACHE_DIR']
+
+
+def _get_worker_variables() -> Dict[str, Any]:
+    # Variables which have been set or evaluated in the parent are forwarded, as spawned workers do not inherit them.
+    # The others are left to be evaluated lazily by the workers themselves, from the forwarded ``AJMC_DATA_DIR``.
+    return {name: vars(vs)[name] for name in _WORKER_VARIABLES_NAMES if name in vars(vs)}
+
+
+def _init_canonization_worker(commentary_kwargs: Dict[str, Any], variables: Dict[str, Any], trace: bool = False):
+    global _WORKER_COMMENTARY
+    for name, value in variables.items():
+        setattr(vs, name, value)
+    tracing.reset()  # Forked workers inherit the events of their parent
+    if trace:
+        tracing.enable()
+    _WORKER_COMMENTARY = RawCommentary(**commentary_kwargs)
+
+
+def _get_worker_canonical_page_data(page_id: str) -> Dict[str, Any]:
+    data = get_canonical_page_data(_WORKER_COMMENTARY.get_page(page_id))
+    if tracing.is_enabled():  # The worker's events are sent back with the page, see ``RawCommentary.to_canonical``
+        data['trace_events'] = tracing.pop_events()
+    return data
+
+
 class RawSection(TextContainer):
 
     def __init__(self,
@@ -382,15 +511,15 @@ class RawPage(Page, TextContainer):
                 w_count = 0
                 lines = []
                 words = []
-                for l_markup in find_all_elements(self.markup, 'line', self.ocr_format):
+                for ocr_line in self._parse_ocr_lines():
                     line = RawLine(page=self, word_ids=[])
-                    for w_markup in find_all_elements(l_markup, 'word', self.ocr_format):
+                    for text, bbox in ocr_line:
                         line.word_ids.append(w_count)
                         words.append(RawWord(id=w_count,
-                                             text=get_element_text(element=w_markup, ocr_format=self.ocr_format),
+                                             text=text,
                                              page=self,
                                              line=line,
-                                             bbox=get_element_bbox(w_markup, self.ocr_format)))
+                                             bbox=bbox))
                         w_count += 1
                     lines.append(line)
 
@@ -408,51 +537,28 @@ class RawPage(Page, TextContainer):
                             if not r['region_attributes']['label'].startswith(vs.OLR_PREFIX)]
 
 
-        elif children_type in ['entities', 'sentences', 'hyphenations']:
-            try:
-                rebuild = cas_utils.import_page_rebuild(self.id, annotation_type=children_type)
-            except:
-                logger.debug(f'Looking for {children_type}: No rebuild file found for page {self.id}')
+        # Annotations of the same corpus must be retrieved together, so that their files are parsed only once
+        elif children_type in ['entities', 'sentences', 'hyphenations', 'lemmas']:
+            annotation_types = ['lemmas'] if children_type == 'lemmas' else ['entities', 'sentences', 'hyphenations']
+            rebuild, annotations = cas_utils.import_page_annotations(self.id, annotation_types)
+            if rebuild is None:  # The page is not annotated
+                for annotation_type in annotation_types:
+                    setattr(self.children, annotation_type, [])
                 return []
-            cas = cas_utils.import_page_cas(self.id, children_type)
-            if cas is not None:
-                annotations = cas_utils.safe_import_page_annotations(self.id, cas, rebuild,
-                                                                     vs.ANNOTATION_LAYERS[children_type])
 
-                child_class = {'entities': RawEntity, 'sentences': RawSentence, 'hyphenations': RawHyphenation}[children_type]
+            for annotation_type, type_annotations in annotations.items():
+                child_class = {'entities': RawEntity, 'sentences': RawSentence,
+                               'hyphenations': RawHyphenation, 'lemmas': RawLemma}[annotation_type]
                 children = []
-                for cas_ann in annotations:
-                    child = child_class.from_cas_annotation(self, cas_ann, rebuild)
-                    if not child.warnings:
-                        children.append(child)
-                return children
-
-            else:
-                return []
-
-        elif children_type == 'lemmas':
-            try:
-                rebuild = cas_utils.import_page_rebuild(self.id, annotation_type=children_type)
-            except:
-                logger.debug(f'Looking for {children_type}: No rebuild file found for page {self.id}')
-                return []
-
-            cas = cas_utils.import_page_cas(self.id, children_type)
+                with tracing.span('align_annotations', annotation_type=annotation_type):
+                    alignments = cas_utils.align_cas_annotations(type_annotations, rebuild)
+                    for cas_ann, alignment in zip(type_annotations, alignments):
+                        child = child_class.from_cas_annotation(self, cas_ann, rebuild, alignment=alignment)
+                        if not child.warnings:
+                            children.append(child)
+                setattr(self.children, annotation_type, children)
 
-            if cas is not None:
-                annotations = cas_utils.safe_import_page_annotations(page_id=self.id, cas=cas, rebuild=rebuild,
-                                                                     annotation_layer=vs.ANNOTATION_LAYERS[children_type])
-
-                children = []
-                for cas_ann in annotations:
-                    child = RawLemma.from_cas_annotation(self, cas_ann, rebuild)
-                    if not child.warnings:
-                        children.append(child)
-
-                return children
-
-            else:
-                return []
+            return getattr(self.children, children_type)
 
         else:
             return []
@@ -489,6 +595,8 @@ class RawPage(Page, TextContainer):
 
     def to_inception_json(self, output_dir: Path, schema_path: Path = vs.SCHEMA_PATH):
         """Validate ``self.to_inception_dict`` and serializes it to json."""
+        import jsonschema
+
         inception_dict = self.to_inception_dict()
         schema = json.loads(schema_path.read_text('utf-8'))
         jsonschema.validate(instance=inception_dict, schema=schema)
@@ -501,7 +609,31 @@ class RawPage(Page, TextContainer):
         delattr(self, 'children')
         delattr(self, 'image')
         delattr(self, 'text')
+        delattr(self, '_spatial_indices')
 
+    @lazy_property
+    def _spatial_indices(self) -> Dict[str, Tuple[List['RawTextContainer'], GridIndex]]:
+        return {}
+
+    def get_spatial_index(self, children_type: str) -> GridIndex:
+        """Gets the ``GridIndex`` of the bboxes of ``self.children.<children_type>``.
+
+        Note:
+            Indices are built once per children type and cached. They are rebuilt whenever ``self.children`` or
+            ``self.children.<children_type>`` is reassigned, but not if the list or its elements' bboxes are modified in
+            place.
+
+        Args:
+            children_type: The type of children to index, e.g. ``'words'`` or ``'lines'``.
+        """
+        children = getattr(self.children, children_type)
+        children_list, index = self._spatial_indices.get(children_type, (None, None))
+        if children_list is not children:
+            index = GridIndex([tc.bbox.bbox for tc in children])
+            self._spatial_indices[children_type] = (children, index)
+        return index
+
+    @tracing.traced('optimise')
     def optimise(self, debug_dir: Optional[Path] = None):
         """Optimises coordinates and reading order.
 
@@ -528,24 +660,24 @@ class RawPage(Page, TextContainer):
         # Process words
         self.children.words = [w for w in self.children.words if re.sub(r'\s+', '', w.text) != '']
         clean_words = []
-        clean_word_bboxes = []
+        clean_word_bboxes = set()
         for w in self.children.words:
             w.text = w.text.strip()  # Remove leading and trailing whitespace (happens sometimes)
             w.adjust_bbox()
             if w.bbox.bbox not in clean_word_bboxes:
                 clean_words.append(w)
-                clean_word_bboxes.append(w.bbox.bbox)
+                clean_word_bboxes.add(w.bbox.bbox)
         self.children.words = clean_words
 
         # Process lines
         clean_lines = []
-        clean_line_bboxes = []
+        clean_line_bboxes = set()
         self.children.lines = [l for l in self.children.lines if l.children.words]
         for l in self.children.lines:
             l.adjust_bbox()
             if l.bbox.bbox not in clean_line_bboxes:
                 clean_lines.append(l)
-                clean_line_bboxes.append(l.bbox.bbox)
+                clean_line_bboxes.add(l.bbox.bbox)
         self.children.lines = clean_lines
 
         # Create fake lines for words without lines
@@ -554,9 +686,17 @@ class RawPage(Page, TextContainer):
                 logger.debug(f'Word without line at page {self.id}: "{word.text}" at {word.bbox.bbox}')
                 self.children.lines.append(RawLine(page=self, word_ids=[word.id], bbox=word.bbox))
 
-        # Process regions
+        # Process regions. Their words are only searched among the words overlapping with them.
+        words_index = self.get_spatial_index('words')
+        for r in self.children.regions:
+            if r.region_type not in vs.EXCLUDED_REGION_TYPES and 'words' not in r.children.__dict__:
+                r.children.words = [self.children.words[i] for i in words_index.query_overlapping(r.bbox.bbox)
+                                    if is_bbox_within_bbox_with_threshold(contained=self.children.words[i].bbox.bbox,
+                                                                          container=r.bbox.bbox,
+                                                                          threshold=r._inclusion_threshold)]
+
         clean_regions = []
-        clean_region_bboxes = []
+        clean_region_bboxes = set()
         self.children.regions = [r for r in self.children.regions
                                  if r.region_type not in vs.EXCLUDED_REGION_TYPES
                                  and r.children.words]
@@ -564,14 +704,16 @@ class RawPage(Page, TextContainer):
             r.adjust_bbox()
             if r.bbox.bbox not in clean_region_bboxes:
                 clean_regions.append(r)
-                clean_region_bboxes.append(r.bbox.bbox)
+                clean_region_bboxes.add(r.bbox.bbox)
         self.children.regions = clean_regions
 
-        # Cut lines according to regions
+        # Cut lines according to regions. Lines can only shrink while being cut, so the lines which do not overlap
+        # with a region's bbox in ``lines_index`` cannot be (even partially) within it.
+        lines_index = self.get_spatial_index('lines')
         for r in self.children.regions:
             r.children.lines = []
 
-            for l in self.children.lines:
+            for l in [self.children.lines[i] for i in lines_index.query_overlapping(r.bbox.bbox)]:
                 if 'region' in l.parents.__dict__ and l.parents.region != r:
                     continue
                 # If the line is entirely in the region, append it
@@ -623,6 +765,36 @@ class RawPage(Page, TextContainer):
         self.is_optimised = True
 
 
+    @tracing.traced('parse_ocr')
+    def _parse_ocr_lines(self) -> List[List[Tuple[str, Shape]]]:
+        """Parses the OCR output's lines as lists of words' ``(text, bbox)``, using the commentary's ``ocr_parser``.
+
+        Note:
+            Parsed lines are read from and written to the commentary's ``ocr_cache_dir``, if any. If lxml fails to
+            parse the file, this falls back to bs4.
+        """
+        cache_dir = self.parents.commentary.ocr_cache_dir
+        if cache_dir is not None:
+            lines = ocr_cache.load_parsed_ocr(self.ocr_path, cache_dir)
+            if lines is None:
+                lines = self._parse_ocr_lines_uncached()
+                try:
+                    ocr_cache.save_parsed_ocr(self.ocr_path, lines, cache_dir)
+                except OSError as e:
+                    logger.debug(f'Could not cache the parsed {self.ocr_path} ({e}).')
+            return lines
+
+        return self._parse_ocr_lines_uncached()
+
+    def _parse_ocr_lines_uncached(self) -> List[List[Tuple[str, Shape]]]:
+        if self.parents.commentary.ocr_parser == 'lxml' and self.ocr_format in LXML_XPATHS:
+            try:
+                return parse_ocr_lines_with_lxml(self.ocr_path, self.ocr_format)
+            except Exception as e:
+                logger.debug(f'Could not parse {self.ocr_path} with lxml ({e}), falling back to bs4.')
+
+        return parse_ocr_lines_with_bs4(self.markup, self.ocr_format)
+
     def get_ocr_gt_page(self) -> 'RawPage':
         """Returns the OCR groundtruth of the page if available. If not, returns self."""
         if self.id in self.parents.commentary.ocr_gt_page_ids:
@@ -658,7 +830,9 @@ class RawPage(Page, TextContainer):
         return AjmcImage(id=self.id, path=self.img_path)
 
     @lazy_property
-    def markup(self) -> bs4.BeautifulSoup:
+    def markup(self) -> 'bs4.BeautifulSoup':
+        import bs4
+
         if self.ocr_path is not None:
             if self.ocr_format != 'json':
                 return bs4.BeautifulSoup(self.ocr_path.read_text('utf-8'), 'xml')
@@ -726,8 +900,10 @@ class RawRegion(RawTextContainer):
                    is_ocr_gt=vs.OCR_GT_PREFIX in via_dict['region_attributes']['label'])
 
     def _get_children(self, children_type):
-        return [el for el in getattr(self.parents.page.children, children_type)
-                if is_bbox_within_bbox_with_threshold(contained=el.bbox.bbox,
+        # Children are only searched among the page's elements overlapping with ``self``
+        candidates = getattr(self.parents.page.children, children_type)
+        return [candidates[i] for i in self.parents.page.get_spatial_index(children_type).query_overlapping(self.bbox.bbox)
+                if is_bbox_within_bbox_with_threshold(contained=candidates[i].bbox.bbox,
                                                       container=self.bbox.bbox,
                                                       threshold=self._inclusion_threshold)]
 
@@ -741,16 +917,19 @@ class RawLine(RawTextContainer):
 
     def _get_children(self, children_type):
         if children_type == 'words':
-            return [w for w in self.parents.page.children.words if w.id in self.word_ids]
+            word_ids = set(self.word_ids)
+            return [w for w in self.parents.page.children.words if w.id in word_ids]
         else:
-            return [c for c in getattr(self.parents.page.children, children_type)
-                    if is_bbox_within_bbox_with_threshold(contained=c.bbox.bbox, container=self.bbox.bbox,
+            candidates = getattr(self.parents.page.children, children_type)
+            return [candidates[i] for i in self.parents.page.get_spatial_index(children_type).query_overlapping(self.bbox.bbox)
+                    if is_bbox_within_bbox_with_threshold(contained=candidates[i].bbox.bbox, container=self.bbox.bbox,
                                                           threshold=vs.PARAMETERS['words_line_inclusion_threshold'])]
 
     @lazy_property
     def word_ids(self) -> List[Union[str, int]]:
         word_ids = []
-        for w in self.parents.page.children.words:
+        words = self.parents.page.children.words
+        for w in [words[i] for i in self.parents.page.get_spatial_index('words').query_overlapping(self.bbox.bbox)]:
             if 'line' in w.parents.__dict__ and w.parents.line is not self:
                 continue
             if is_bbox_within_bbox_with_threshold(contained=w.bbox.bbox, container=self.bbox.bbox,
@@ -792,7 +971,9 @@ class RawWord(RawTextContainer):
 
 
     def adjust_bbox(self):
-        self.bbox = adjust_bbox_to_included_contours(self.bbox.bbox, self.parents.page.image.contours)
+        image = self.parents.page.image
+        overlapping_contours = image.contours_array[image.contours_index.query_overlapping(self.bbox.bbox)]
+        self.bbox = adjust_bbox_to_included_contours(self.bbox.bbox, overlapping_contours)
 
 
 class RawAnnotation(TextContainer):
@@ -834,8 +1015,10 @@ class RawAnnotation(TextContainer):
 
         # We first get the children based on overlap with the bboxes
         # Notice that there is no bijection between the set of bboxes and the set of children (i.e. there can be 3 bboxes but 4 words and vice-versa)
-        children = [c for c in getattr(self.parents.page.children, children_type)
-                    if any([is_bbox_within_bbox_with_threshold(contained=c.bbox.bbox, container=bbox.bbox,
+        candidates = getattr(self.parents.page.children, children_type)
+        index = self.parents.page.get_spatial_index(children_type)
+        children = [candidates[i] for i in sorted({i for bbox in self.bboxes for i in index.query_overlapping(bbox.bbox)})
+                    if any([is_bbox_within_bbox_with_threshold(contained=candidates[i].bbox.bbox, container=bbox.bbox,
                                                                threshold=vs.PARAMETERS['word_annotation_inclusion_threshold'])
                             for bbox in self.bboxes])]
 
@@ -866,10 +1049,11 @@ class RawEntity(RawAnnotation):
     """Class for cas imported entities."""
 
     @classmethod
-    def from_cas_annotation(cls, page, cas_annotation, rebuild, verbose: bool = False):
-        # Get general text-alignment-related about the annotation
-        bboxes, shifts, transcript, text_window, warnings = cas_utils.align_cas_annotation(cas_annotation=cas_annotation,
-                                                                                           rebuild=rebuild, verbose=verbose)
+    def from_cas_annotation(cls, page, cas_annotation, rebuild, verbose: bool = False, alignment: Optional[tuple] = None):
+        # Get general text-alignment-related about the annotation, unless given by ``align_cas_annotations``
+        if alignment is None:
+            alignment = cas_utils.align_cas_annotation(cas_annotation=cas_annotation, rebuild=rebuild, verbose=verbose)
+        bboxes, shifts, transcript, text_window, warnings = alignment
         return cls(page,
                    bboxes=[Shape.from_xywh(*bbox) for bbox in bboxes],
                    shifts=shifts,
@@ -884,10 +1068,11 @@ class RawSentence(RawAnnotation):
     """Class for cas imported gold sentences."""
 
     @classmethod
-    def from_cas_annotation(cls, page, cas_annotation, rebuild, verbose: bool = False):
-        # Get general text-alignment-related about the annotation
-        bboxes, shifts, transcript, text_window, warnings = cas_utils.align_cas_annotation(cas_annotation=cas_annotation,
-                                                                                           rebuild=rebuild, verbose=verbose)
+    def from_cas_annotation(cls, page, cas_annotation, rebuild, verbose: bool = False, alignment: Optional[tuple] = None):
+        # Get general text-alignment-related about the annotation, unless given by ``align_cas_annotations``
+        if alignment is None:
+            alignment = cas_utils.align_cas_annotation(cas_annotation=cas_annotation, rebuild=rebuild, verbose=verbose)
+        bboxes, shifts, transcript, text_window, warnings = alignment
         return cls(page,
                    bboxes=[Shape.from_xywh(*bbox) for bbox in bboxes],
                    shifts=shifts,
@@ -902,10 +1087,11 @@ class RawHyphenation(RawAnnotation):
     """Class for cas imported hyphenations."""
 
     @classmethod
-    def from_cas_annotation(cls, page, cas_annotation, rebuild, verbose: bool = False):
-        # Get general text-alignment-related about the annotation
-        bboxes, shifts, transcript, text_window, warnings = cas_utils.align_cas_annotation(cas_annotation=cas_annotation,
-                                                                                           rebuild=rebuild, verbose=verbose)
+    def from_cas_annotation(cls, page, cas_annotation, rebuild, verbose: bool = False, alignment: Optional[tuple] = None):
+        # Get general text-alignment-related about the annotation, unless given by ``align_cas_annotations``
+        if alignment is None:
+            alignment = cas_utils.align_cas_annotation(cas_annotation=cas_annotation, rebuild=rebuild, verbose=verbose)
+        bboxes, shifts, transcript, text_window, warnings = alignment
         return cls(page,
                    bboxes=[Shape.from_xywh(*bbox) for bbox in bboxes],
                    shifts=shifts,
@@ -917,10 +1103,11 @@ class RawLemma(RawAnnotation):
     """Class for cas imported entities."""
 
     @classmethod
-    def from_cas_annotation(cls, page, cas_annotation, rebuild, verbose: bool = False):
-        # Get general text-alignment-related about the annotation
-        bboxes, shifts, transcript, text_window, warnings = cas_utils.align_cas_annotation(cas_annotation=cas_annotation,
-                                                                                           rebuild=rebuild, verbose=verbose)
+    def from_cas_annotation(cls, page, cas_annotation, rebuild, verbose: bool = False, alignment: Optional[tuple] = None):
+        # Get general text-alignment-related about the annotation, unless given by ``align_cas_annotations``
+        if alignment is None:
+            alignment = cas_utils.align_cas_annotation(cas_annotation=cas_annotation, rebuild=rebuild, verbose=verbose)
+        bboxes, shifts, transcript, text_window, warnings = alignment
 
         return cls(page,
                    bboxes=[Shape.from_xywh(*bbox) for bbox in bboxes],
@@ -183,54 +183,55 @@ class ViaProject:
         self.project_dict['_via_image_id_list'].append(image_name)
 
 
-    def _is_not_duplicate(self, region, texts, bboxes):
-        region_bbox = geom.Shape.from_via(region)
-        for bbox, text in zip(bboxes, texts):
-            if (bbox == region_bbox.bbox or (geom.are_bboxes_overlapping_with_threshold(region_bbox.bbox, bbox.bbox, 0.7)
-                                             and region['region_attributes']['label'] == text)):
-                return False
+    @staticmethod
+    def _is_not_duplicate(region, boxes_by_text: Dict[str, List[geom.Shape]]) -> bool:
+        """Checks that ``region`` does not overlap, to 0.7, a kept region with the same label.
 
-        return True
+        Args:
+            region: The via region to check.
+            boxes_by_text: The bboxes of the kept regions, grouped by label, so that only the regions with the same label
+                are compared.
+        """
+        same_text_boxes = boxes_by_text.get(region['region_attributes']['label'])
+        if not same_text_boxes:
+            return True
+        region_array = geom.ShapeArray.from_bboxes([geom.Shape.from_via(region).bbox])
+        return not region_array.overlapping_with_threshold(geom.ShapeArray.from_shapes(same_text_boxes), 0.7).any()
 
 
     def check_page_duplicates(self, page_dict: Dict[str, Any]):
 
         pruned_words = []
-        words_boxes = []
-        words_texts = []
+        words_boxes = {}
 
         pruned_lines = []
-        lines_boxes = []
-        lines_texts = []
+        lines_boxes = {}
 
         pruned_regions = []
-        regions_boxes = []
-        regions_texts = []
+        regions_boxes = {}
 
         total_words = 0
         total_lines = 0
         total_regions = 0
 
         for region in page_dict['regions']:
-            if region['region_attributes']['label'].startswith(vs.OLR_PREFIX):
-                if 'line_region' in region['region_attributes']['label']:
+            label = region['region_attributes']['label']
+            if label.startswith(vs.OLR_PREFIX):
+                if 'line_region' in label:
                     total_lines += 1
-                    if self._is_not_duplicate(region, lines_texts, lines_boxes):
+                    if self._is_not_duplicate(region, lines_boxes):
                         pruned_lines.append(region)
-                        lines_boxes.append(geom.Shape.from_via(region))
-                        lines_texts.append(region['region_attributes']['label'])
+                        lines_boxes.setdefault(label, []).append(geom.Shape.from_via(region))
                 else:
                     total_regions += 1
-                    if self._is_not_duplicate(region, regions_texts, regions_boxes):
+                    if self._is_not_duplicate(region, regions_boxes):
                         pruned_regions.append(region)
-                        regions_boxes.append(geom.Shape.from_via(region))
-                        regions_texts.append(region['region_attributes']['label'])
+                        regions_boxes.setdefault(label, []).append(geom.Shape.from_via(region))
             else:
                 total_words += 1
-                if self._is_not_duplicate(region, words_texts, words_boxes):
+                if self._is_not_duplicate(region, words_boxes):
                     pruned_words.append(region)
-                    words_boxes.append(geom.Shape.from_via(region))
-                    words_texts.append(region['region_attributes']['label'])
+                    words_boxes.setdefault(label, []).append(geom.Shape.from_via(region))
 
         diffs = {'words': total_words - len(pruned_words),
                  'lines': total_lines - len(pruned_lines),
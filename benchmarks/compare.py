@@ -0,0 +1,71 @@
+"""Compares two results files written by ``benchmarks.run``, e.g. for two commits.
+
+Benchmarks are compared on their best time and on their peak memory. A benchmark regresses if its new value exceeds the
+base value by more than ``--threshold``, in which case the script exits with a non-zero status.
+
+Usage:
+    python -m benchmarks.compare base.json new.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+def compare_results(base: Dict[str, Any],
+                    new: Dict[str, Any],
+                    threshold: float = 0.1) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Compares the benchmarks present in both ``base`` and ``new``.
+
+    Args:
+        base: The base results, as written by ``benchmarks.run``.
+        new: The new results.
+        threshold: The relative increase of time or memory above which a benchmark is considered as regressing.
+
+    Returns:
+        A list of rows, one per benchmark, with the base and new best times and peak memories and their ratios, and the
+        list of the names of the regressing benchmarks.
+    """
+    rows, regressions = [], []
+    for name in [name for name in new['benchmarks'] if name in base['benchmarks']]:
+        base_bench, new_bench = base['benchmarks'][name], new['benchmarks'][name]
+        row = {'name': name,
+               'base_time': base_bench['min'],
+               'new_time': new_bench['min'],
+               'time_ratio': new_bench['min'] / base_bench['min'] if base_bench['min'] else float('inf'),
+               'base_memory': base_bench['peak_memory_mb'],
+               'new_memory': new_bench['peak_memory_mb'],
+               'memory_ratio': (new_bench['peak_memory_mb'] / base_bench['peak_memory_mb']
+                                if base_bench['peak_memory_mb'] else float('inf'))}
+        rows.append(row)
+        if row['time_ratio'] > 1 + threshold or row['memory_ratio'] > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare two benchmark results files.')
+    parser.add_argument('base', type=str, help='The base results file.')
+    parser.add_argument('new', type=str, help='The new results file.')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.base).read_text(encoding='utf-8'))
+    new = json.loads(Path(args.new).read_text(encoding='utf-8'))
+
+    for key in ['commit', 'dirty', 'python', 'platform']:
+        print(f'{key:<10}{str(base["environment"][key]):<44}{str(new["environment"][key])}')
+    if base['config'] != new['config']:
+        print(f'Warning: the configurations differ ({base["config"]} vs {new["config"]}).')
+    print()
+
+    rows, regressions = compare_results(base, new, args.threshold)
+    print(f'{"benchmark":<36}{"base (ms)":>12}{"new (ms)":>12}{"ratio":>8}{"base (MB)":>12}{"new (MB)":>12}{"ratio":>8}')
+    for row in rows:
+        flag = '  <- regression' if row['name'] in regressions else ''
+        print(f'{row["name"]:<36}{row["base_time"] * 1000:>12.1f}{row["new_time"] * 1000:>12.1f}{row["time_ratio"]:>8.2f}'
+              f'{row["base_memory"]:>12.1f}{row["new_memory"]:>12.1f}{row["memory_ratio"]:>8.2f}{flag}')
+
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,273 @@
+"""Times and memory-profiles ajmc's hot paths on a synthetic commentary, writing the results to a json file.
+
+Each benchmark is made of a setup, which is not measured (e.g. instantiating a fresh ``RawCommentary``), and of the
+measured call. The call is timed ``--repeats`` times, each after a new setup, and is then run once more under
+``tracemalloc`` to record its peak memory allocation. Caches (parsed OCR, contours) are disabled, so that every run
+does the full work.
+
+The synthetic commentary (see ``benchmarks.synthetic``) is generated in a temporary directory, or in ``--data_dir``
+where it is kept and reused as long as its configuration does not change. Results hold the commit, the environment
+and the configuration, so that two results files can be compared with ``benchmarks.compare``.
+
+Usage:
+    python -m benchmarks.run --pages 10 --words_per_page 300 --annotations_per_page 10 --output results.json
+    python -m benchmarks.run --benchmarks raw.to_canonical ocr.commentary_evaluation --repeats 5
+    python -m benchmarks.run --benchmarks raw.to_canonical --repeats 1 --trace trace.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from ajmc.commons import tracing, variables as vs
+from ajmc.commons.miscellaneous import ROOT_LOGGER
+
+SetupFunction = Callable[[Dict[str, Any]], Callable[[], Any]]
+
+
+def setup_from_json(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.text_processing.canonical_classes import CanonicalCommentary
+    return lambda: CanonicalCommentary.from_json(context['canonical_path'])
+
+
+def setup_from_json_compact(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.text_processing.canonical_classes import CanonicalCommentary
+    return lambda: CanonicalCommentary.from_json(context['canonical_path'], compact=True)
+
+
+def setup_to_json(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.text_processing.canonical_classes import CanonicalCommentary
+    commentary = CanonicalCommentary.from_json(context['canonical_path'])
+    return lambda: commentary.to_json(context['scratch_dir'] / 'commentary.json')
+
+
+def setup_from_binary(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.text_processing.canonical_classes import CanonicalCommentary
+
+    def from_binary():
+        commentary = CanonicalCommentary.from_binary(context['binary_dir'])
+        return [getattr(commentary.children, child_type) for child_type in vs.CHILD_TYPES]
+
+    return from_binary
+
+
+def setup_canonical_texts(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.text_processing.canonical_classes import CanonicalCommentary
+    commentary = CanonicalCommentary.from_json(context['canonical_path'])
+    return lambda: [tc.text for child_type in ['pages', 'regions', 'lines', 'sentences']
+                    for tc in getattr(commentary.children, child_type)]
+
+
+def setup_parse_ocr(context: Dict[str, Any]) -> Callable[[], Any]:
+    from benchmarks.synthetic import get_synthetic_raw_commentary
+    commentary = get_synthetic_raw_commentary()
+    return lambda: [p.children.words for p in commentary.children.pages]
+
+
+def setup_optimise(context: Dict[str, Any]) -> Callable[[], Any]:
+    from benchmarks.synthetic import get_synthetic_raw_commentary
+    pages = get_synthetic_raw_commentary().children.pages
+    for page in pages:  # Parsing is measured by ``raw.parse_ocr``
+        _ = page.children.words
+    return lambda: [p.optimise() for p in pages]
+
+
+def setup_annotations(context: Dict[str, Any]) -> Callable[[], Any]:
+    from benchmarks.synthetic import get_synthetic_raw_commentary
+    pages = get_synthetic_raw_commentary().children.pages
+    return lambda: [getattr(p.children, annotation_type) for p in pages
+                    for annotation_type in ['entities', 'sentences', 'hyphenations', 'lemmas']]
+
+
+def setup_to_canonical(context: Dict[str, Any]) -> Callable[[], Any]:
+    from benchmarks.synthetic import get_synthetic_raw_commentary
+    commentary = get_synthetic_raw_commentary()
+    return lambda: commentary.to_canonical(workers=context['workers'])
+
+
+def setup_commentary_evaluation(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.ocr.evaluation import commentary_evaluation
+    from benchmarks.synthetic import get_synthetic_raw_commentary
+    commentary = get_synthetic_raw_commentary()
+    return lambda: commentary_evaluation(commentary, write_files=False)
+
+
+def setup_chunk_string_by_charsets(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.commons.unicode_utils import chunk_string_by_charsets
+    return lambda: chunk_string_by_charsets(context['text'])
+
+
+def setup_count_chars_by_charsets(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.commons.unicode_utils import count_chars_by_charsets
+    return lambda: count_chars_by_charsets(context['text'])
+
+
+def setup_harmonise_unicode(context: Dict[str, Any]) -> Callable[[], Any]:
+    from ajmc.commons.unicode_utils import harmonise_unicode
+    return lambda: harmonise_unicode(context['text'])
+
+
+BENCHMARKS: Dict[str, SetupFunction] = {
+    'canonical.from_json': setup_from_json,
+    'canonical.from_json_compact': setup_from_json_compact,
+    'canonical.to_json': setup_to_json,
+    'canonical.from_binary': setup_from_binary,
+    'canonical.texts': setup_canonical_texts,
+    'raw.parse_ocr': setup_parse_ocr,
+    'raw.optimise': setup_optimise,
+    'raw.annotations': setup_annotations,
+    'raw.to_canonical': setup_to_canonical,
+    'ocr.commentary_evaluation': setup_commentary_evaluation,
+    'unicode.chunk_string_by_charsets': setup_chunk_string_by_charsets,
+    'unicode.count_chars_by_charsets': setup_count_chars_by_charsets,
+    'unicode.harmonise_unicode': setup_harmonise_unicode,
+}
+
+RAW_BENCHMARKS = ['raw.parse_ocr', 'raw.optimise', 'raw.annotations', 'raw.to_canonical', 'ocr.commentary_evaluation']
+
+
+def run_benchmark(setup: SetupFunction, context: Dict[str, Any], repeats: int) -> Dict[str, Any]:
+    """Times ``repeats`` calls to the function returned by ``setup``, then measures its peak memory allocation.
+
+    Returns:
+        A dict with the ``times`` of each call and their ``min``, ``median`` and ``mean`` (in seconds), and the
+        ``peak_memory_mb`` allocated during the call, as traced by ``tracemalloc``.
+    """
+    times = []
+    for _ in range(repeats):
+        function = setup(context)
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    function = setup(context)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'times': times,
+            'min': min(times),
+            'median': statistics.median(times),
+            'mean': statistics.mean(times),
+            'peak_memory_mb': peak_memory / 2 ** 20}
+
+
+def get_environment() -> Dict[str, Any]:
+    """Gets the commit of ajmc, whether its working tree is dirty, and the versions of python and of the platform."""
+
+    def git(*args: str) -> str:
+        try:
+            return subprocess.check_output(['git', *args], cwd=vs.PACKAGE_DIR, stderr=subprocess.DEVNULL).decode().strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ''
+
+    return {'commit': git('rev-parse', 'HEAD'),
+            'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'date': datetime.now().isoformat(timespec='seconds')}
+
+
+def prepare_data(data_dir: Path, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Points ``vs`` to ``data_dir``, generates the synthetic commentary there if needed and builds the benchmarks'
+    context."""
+    vs.AJMC_DATA_DIR = data_dir
+    vs.PARSED_OCR_CACHE_DIR = None
+    vs.CONTOURS_CACHE_DIR = None
+
+    from ajmc.text_processing.canonical_classes import CanonicalCommentary
+    from benchmarks import synthetic
+
+    config_path = data_dir / 'synthetic_config.json'
+    canonical_path = vs.get_comm_canonical_dir(synthetic.SYNTHETIC_COMM_ID) / f'{synthetic.SYNTHETIC_OCR_RUN_ID}.json'
+    if not config_path.exists() or json.loads(config_path.read_text(encoding='utf-8')) != config:
+        start = time.perf_counter()
+        canonical_path = synthetic.write_synthetic_commentary(pages=config['pages'],
+                                                              words_per_page=config['words_per_page'],
+                                                              annotations_per_page=config['annotations_per_page'],
+                                                              raw=config['raw'],
+                                                              seed=config['seed'])
+        config_path.write_text(json.dumps(config), encoding='utf-8')
+        print(f'Generated the synthetic commentary in {data_dir} ({time.perf_counter() - start:.1f}s).')
+    synthetic.register_synthetic_commentary()
+
+    scratch_dir = data_dir / 'scratch'
+    scratch_dir.mkdir(exist_ok=True)
+    commentary = CanonicalCommentary.from_json(canonical_path)
+    return {'canonical_path': canonical_path,
+            'binary_dir': commentary.to_binary(scratch_dir / 'binary'),
+            'text': commentary.text,
+            'scratch_dir': scratch_dir}
+
+
+def run_benchmarks(names: List[str], context: Dict[str, Any], repeats: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name in names:
+        results[name] = run_benchmark(BENCHMARKS[name], context, repeats)
+        print(f'{name:<36}{results[name]["min"] * 1000:>12.1f} ms{results[name]["peak_memory_mb"]:>12.1f} MB')
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark ajmc on a synthetic commentary.')
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--words_per_page', type=int, default=300)
+    parser.add_argument('--annotations_per_page', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1, help='The number of workers used by ``raw.to_canonical``.')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help='The benchmarks to run, defaults to all of them.')
+    parser.add_argument('--canonical_only', action='store_true',
+                        help='Only generate the canonical commentary and skip the benchmarks of raw commentaries.')
+    parser.add_argument('--data_dir', type=str, default=None,
+                        help='A directory in which to keep the synthetic data between runs, defaults to a temporary one.')
+    parser.add_argument('--output', type=str, default=None, help='The json file to write the results to.')
+    parser.add_argument('--trace', type=str, default=None,
+                        help='A json file to write a Chrome trace of the benchmarks\' stages to, also printing a summary of '
+                             'the stages. Tracing adds some overhead to the timings.')
+    args = parser.parse_args()
+
+    ROOT_LOGGER.setLevel('WARNING')  # Pipelines log every page at the info level
+    config = {'pages': args.pages,
+              'words_per_page': args.words_per_page,
+              'annotations_per_page': args.annotations_per_page,
+              'raw': not args.canonical_only,
+              'seed': args.seed}
+    names = [name for name in args.benchmarks if not (args.canonical_only and name in RAW_BENCHMARKS)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = Path(args.data_dir) if args.data_dir else Path(tmp_dir)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        context = prepare_data(data_dir, config)
+        context['workers'] = args.workers
+        if args.trace:
+            tracing.enable()
+        results = {'environment': get_environment(),
+                   'config': {**config, 'repeats': args.repeats, 'workers': args.workers, 'argv': sys.argv[1:]},
+                   'benchmarks': run_benchmarks(names, context, args.repeats)}
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f'Results written to {args.output}.')
+
+    if args.trace:
+        tracing.export_chrome_trace(args.trace)
+        print(f'\n{tracing.format_summary()}\nTrace written to {args.trace}.')
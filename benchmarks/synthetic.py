@@ -0,0 +1,486 @@
+"""Generation of synthetic commentaries of configurable size, used by the benchmarks.
+
+A synthetic commentary is written to the locations given by ``ajmc.commons.variables`` (so point
+``vs.AJMC_DATA_DIR`` or ``vs.COMMS_DATA_DIR``, ``vs.NE_CORPUS_DIR`` and ``vs.LEMLINK_XMI_DIR`` to a scratch directory
+first). It comes in two flavours, generated from the same page layouts:
+
+    - a raw commentary: page images, tesseract-like hOCR outputs (with OCR noise and jittered bboxes), a VIA project
+      with the OLR and, for the first pages, the OCR groundtruth, a sections file and, if ``annotations_per_page`` is
+      not zero, INCEpTION rebuilds and XMIs of entities, sentences, hyphenations and lemmas, as in the annotation corpora.
+    - a canonical commentary, written directly as a canonical json with the same annotations.
+
+Pages are made of a running header, a page number, a primary text and a commentary region. Words are drawn as a row of
+black glyph-like boxes, so that contours and their adjustment behave as on real scans.
+"""
+
+import html
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+from ajmc.commons import variables as vs
+from ajmc.commons.geometry import Shape
+from ajmc.text_processing import cas_utils
+from ajmc.text_processing.raw_classes import RawCommentary
+from ajmc.text_processing.via import ViaProject
+
+if TYPE_CHECKING:
+    from cassis import TypeSystem
+
+SYNTHETIC_COMM_ID = 'synthetic'
+SYNTHETIC_OCR_RUN_ID = 'synthetic_tess'
+SYNTHETIC_REGION_TYPES = ['running_header', 'page_number', 'primary_text', 'commentary']
+
+LATIN_WORDS = ['the', 'of', 'and', 'to', 'is', 'in', 'that', 'which', 'with', 'here', 'sense', 'passage', 'meaning',
+               'Ajax', 'Sophocles', 'Athena', 'Odysseus', 'Teucer', 'Tecmessa', 'chorus', 'verse', 'scholiast',
+               'Hom.', 'Il.', 'Od.', 'Eur.', 'Aesch.', 'cf.', 'schol.', 'v.', 'sc.', 'i.e.', 'Jebb', 'Hermann']
+GREEK_WORDS = ['ὁ', 'ἡ', 'τὸ', 'καὶ', 'δὲ', 'μὲν', 'γὰρ', 'οὐ', 'τὸν', 'τῆς', 'Αἴας', 'Ἀθάνα', 'Ὀδυσσεύς', 'θεὸς',
+               'λόγος', 'ἐστί', 'ἀνήρ', 'πόλεμος', 'ὀφθαλμοῖς', 'φρονεῖν', 'ἔχει', 'ἄνακτες', 'ξίφος', 'τέκνον']
+NUMBERS = ['1', '7', '23', '84', '145', '388', '1034']
+PUNCTUATION = [',', '.', ';', ':', ']', ')']
+
+ENTITY_LABELS = vs.GENERIC_FINE_ENTITY_TYPES
+LEMMA_LABELS = ['word-anchor', 'scope-anchor']
+
+PAGE_WIDTH = 1400
+MARGIN = 100
+CHAR_WIDTH = 16
+GLYPH_GAP = 3
+WORD_GAP = 16
+WORD_HEIGHT = 28
+LINE_PITCH = 44
+REGION_GAP = 40
+
+
+def get_synthetic_word(rng: random.Random) -> str:
+    """Draws a word from a mixed greek, latin and numeric vocabulary, sometimes followed by a punctuation mark."""
+    draw = rng.random()
+    if draw < 0.3:
+        word = rng.choice(GREEK_WORDS)
+    elif draw < 0.35:
+        word = rng.choice(NUMBERS)
+    else:
+        word = rng.choice(LATIN_WORDS)
+    if rng.random() < 0.15:
+        word += rng.choice(PUNCTUATION)
+    return word
+
+
+def add_ocr_noise(text: str, rng: random.Random, error_rate: float) -> str:
+    """Adds substitutions, deletions and insertions to ``text`` at the rate of ``error_rate`` per character."""
+    alphabet = ''.join(LATIN_WORDS + GREEK_WORDS)
+    chars = []
+    for char in text:
+        if rng.random() >= error_rate:
+            chars.append(char)
+            continue
+        operation = rng.random()
+        if operation < 0.5:
+            chars.append(rng.choice(alphabet))
+        elif operation < 0.75:
+            chars.append(char + rng.choice(alphabet))
+    return ''.join(chars) or text
+
+
+def _get_line_layouts(words: List[str], x_start: int, y_start: int, width: int) -> List[Dict[str, Any]]:
+    """Lays ``words`` out in lines of at most ``width`` pixels, starting at ``(x_start, y_start)``."""
+    lines = []
+    x, y = x_start, y_start - LINE_PITCH
+    for text in words:
+        word_width = len(text) * CHAR_WIDTH - GLYPH_GAP
+        if not lines or (x > x_start and x + word_width > x_start + width):
+            x, y = x_start, y + LINE_PITCH
+            lines.append({'words': []})
+        lines[-1]['words'].append({'text': text, 'bbox': (x, y, x + word_width - 1, y + WORD_HEIGHT - 1)})
+        x += word_width + WORD_GAP
+
+    for line in lines:
+        line['bbox'] = line['words'][0]['bbox'][:2] + line['words'][-1]['bbox'][2:]
+    return lines
+
+
+def generate_page_layout(page_id: str,
+                         words_per_page: int,
+                         rng: random.Random,
+                         is_ocr_gt: bool = False,
+                         ocr_error_rate: float = 0.05) -> Dict[str, Any]:
+    """Generates the layout of a synthetic page.
+
+    Args:
+        page_id: The id of the page, e.g. ``synthetic_0001``.
+        words_per_page: The total number of words on the page.
+        rng: The random generator to draw words and OCR noise from.
+        is_ocr_gt: Whether the page is part of the OCR groundtruth.
+        ocr_error_rate: The rate of OCR errors per character, see ``add_ocr_noise``.
+
+    Returns:
+        A dict with the page's ``id``, ``width``, ``height``, ``is_ocr_gt`` and ``regions``. Each region has a
+        ``region_type``, a ``bbox`` and ``lines``, each line has a ``bbox`` and ``words``, and each word has a ``bbox``,
+        a (groundtruth) ``text`` and an ``ocr_text``. Bboxes are in the ``x1, y1, x2, y2`` format.
+    """
+    page_number = page_id.split('_')[-1].lstrip('0') or '0'
+    header_words = [get_synthetic_word(rng) for _ in range(3)]
+    body_words = [get_synthetic_word(rng) for _ in range(max(0, words_per_page - len(header_words) - 1))]
+    primary_text_words, commentary_words = body_words[:len(body_words) // 6], body_words[len(body_words) // 6:]
+    text_width = PAGE_WIDTH - 2 * MARGIN
+
+    regions = [{'region_type': 'running_header',
+                'lines': _get_line_layouts(header_words, MARGIN + text_width // 3, MARGIN, text_width // 3)},
+               {'region_type': 'page_number',
+                'lines': _get_line_layouts([page_number], PAGE_WIDTH - MARGIN - 4 * CHAR_WIDTH, MARGIN, 4 * CHAR_WIDTH)}]
+
+    y = MARGIN + LINE_PITCH + REGION_GAP
+    for region_type, words in [('primary_text', primary_text_words), ('commentary', commentary_words)]:
+        if words:
+            regions.append({'region_type': region_type, 'lines': _get_line_layouts(words, MARGIN, y, text_width)})
+            y = regions[-1]['lines'][-1]['bbox'][3] + REGION_GAP
+
+    for region in regions:
+        region['bbox'] = (min(l['bbox'][0] for l in region['lines']) - 5, region['lines'][0]['bbox'][1] - 5,
+                          max(l['bbox'][2] for l in region['lines']) + 5, region['lines'][-1]['bbox'][3] + 5)
+        for line in region['lines']:
+            for word in line['words']:
+                word['ocr_text'] = add_ocr_noise(word['text'], rng, ocr_error_rate)
+
+    return {'id': page_id, 'width': PAGE_WIDTH, 'height': y + MARGIN, 'is_ocr_gt': is_ocr_gt, 'regions': regions}
+
+
+def iter_layout_words(layout: Dict[str, Any]):
+    """Iterates over the words of a page layout, in reading order."""
+    for region in layout['regions']:
+        for line in region['lines']:
+            for word in line['words']:
+                yield word
+
+
+def draw_page_image(layout: Dict[str, Any]) -> np.ndarray:
+    """Draws the page as a grayscale image, each character being a black box spanning the height of its word."""
+    image = np.full((layout['height'], layout['width']), 255, dtype=np.uint8)
+    for word in iter_layout_words(layout):
+        x1, y1, _, y2 = word['bbox']
+        for i in range(len(word['text'])):
+            image[y1:y2 + 1, x1 + i * CHAR_WIDTH:x1 + (i + 1) * CHAR_WIDTH - GLYPH_GAP] = 0
+    return image
+
+
+def _jitter_bbox(bbox: Tuple[int, int, int, int], rng: random.Random, amplitude: int = 3) -> Tuple[int, int, int, int]:
+    """Loosens ``bbox`` by up to ``amplitude`` pixels on each side, as OCR engines do."""
+    x1, y1, x2, y2 = bbox
+    return (max(0, x1 - rng.randint(0, amplitude)), max(0, y1 - rng.randint(0, amplitude)),
+            x2 + rng.randint(0, amplitude), y2 + rng.randint(0, amplitude))
+
+
+def get_page_hocr(layout: Dict[str, Any], rng: random.Random) -> str:
+    """Writes the page's OCR as a tesseract-like hOCR, with noisy texts and jittered word bboxes."""
+    page_id = layout['id']
+    markup = ['<?xml version="1.0" encoding="UTF-8"?>',
+              '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">',
+              ' <head>',
+              '  <title></title>',
+              '  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>',
+              "  <meta name='ocr-system' content='synthetic' />",
+              "  <meta name='ocr-capabilities' content='ocr_page ocr_carea ocr_par ocr_line ocrx_word'/>",
+              ' </head>',
+              ' <body>',
+              f"  <div class='ocr_page' id='page_1' title='image \"{page_id}.png\"; bbox 0 0 {layout['width']} "
+              f"{layout['height']}; ppageno 0'>"]
+
+    word_count, line_count = 0, 0
+    for i, region in enumerate(layout['regions'], start=1):
+        markup.append(f"   <div class='ocr_carea' id='block_1_{i}' title=\"bbox {' '.join(map(str, region['bbox']))}\">")
+        markup.append(f"    <p class='ocr_par' id='par_1_{i}' title=\"bbox {' '.join(map(str, region['bbox']))}\">")
+        for line in region['lines']:
+            line_count += 1
+            markup.append(f"     <span class='ocr_line' id='line_1_{line_count}' "
+                          f"title=\"bbox {' '.join(map(str, line['bbox']))}\">")
+            for word in line['words']:
+                word_count += 1
+                markup.append(f"      <span class='ocrx_word' id='word_1_{word_count}' title='bbox "
+                              f"{' '.join(map(str, _jitter_bbox(word['bbox'], rng)))}; x_wconf 90'>"
+                              f"{html.escape(word['ocr_text'])}</span>")
+            markup.append('     </span>')
+        markup.append('    </p>')
+        markup.append('   </div>')
+
+    markup += ['  </div>', ' </body>', '</html>', '']
+    return '\n'.join(markup)
+
+
+def get_page_via_regions(layout: Dict[str, Any]) -> Tuple[List[Shape], List[Dict[str, str]]]:
+    """Gets the VIA regions of a page: its OLR regions and, if the page is groundtruth, its lines and words."""
+    shapes, attributes = [], []
+    ocr_gt_prefix = vs.OCR_GT_PREFIX if layout['is_ocr_gt'] else ''
+    for region in layout['regions']:
+        shapes.append(Shape.from_xyxy(*region['bbox']))
+        attributes.append({'label': vs.OLR_PREFIX + ocr_gt_prefix + region['region_type']})
+        if layout['is_ocr_gt']:
+            for line in region['lines']:
+                shapes.append(Shape.from_xyxy(*line['bbox']))
+                attributes.append({'label': vs.OLR_PREFIX + 'line_region'})
+                for word in line['words']:
+                    shapes.append(Shape.from_xyxy(*word['bbox']))
+                    attributes.append({'label': word['text']})
+    return shapes, attributes
+
+
+def get_page_inception_dict(layout: Dict[str, Any]) -> Dict[str, Any]:
+    """Gets the page's data as exported for INCEpTION (see ``RawPage.to_inception_dict``), from the texts which would
+    be canonized, i.e. the groundtruth on groundtruth pages and the OCR elsewhere."""
+    text_key = 'text' if layout['is_ocr_gt'] else 'ocr_text'
+    return {'iiif': 'None',
+            'id': layout['id'],
+            'cdate': '',
+            'regions': [{'region_type': region['region_type'],
+                         'bbox': list(Shape.from_xyxy(*region['bbox']).xywh),
+                         'lines': [{'bbox': list(Shape.from_xyxy(*line['bbox']).xywh),
+                                    'words': [{'bbox': list(Shape.from_xyxy(*word['bbox']).xywh),
+                                               'text': word[text_key]}
+                                              for word in line['words']]}
+                                   for line in region['lines']]}
+                        for region in layout['regions']]}
+
+
+def generate_page_annotations(words_count: int,
+                              annotations_per_page: int,
+                              rng: random.Random) -> Dict[str, List[Tuple[int, int, Dict[str, Any]]]]:
+    """Generates annotations over a page of ``words_count`` words.
+
+    Returns:
+        A dict mapping each annotation type to a list of ``(first_word, last_word, attributes)`` tuples, where word
+        indices are local to the page. Sentences cover the whole page, while ``annotations_per_page`` entities and
+        lemmas and a tenth as many hyphenations are spread over it.
+    """
+    annotations = {'entities': [], 'sentences': [], 'hyphenations': [], 'lemmas': []}
+    if not annotations_per_page or not words_count:
+        return annotations
+
+    start = 0
+    while start < words_count:
+        end = min(words_count, start + rng.randint(10, 30)) - 1
+        annotations['sentences'].append((start, end, {'corrupted': False,
+                                                      'incomplete_continuing': end == words_count - 1,
+                                                      'incomplete_truncated': False}))
+        start = end + 1
+
+    for _ in range(annotations_per_page):
+        start = rng.randrange(words_count)
+        annotations['entities'].append((start, min(words_count - 1, start + rng.randint(0, 2)),
+                                        {'label': rng.choice(ENTITY_LABELS),
+                                         'wikidata_id': f'http://www.wikidata.org/entity/Q{rng.randint(1, 10 ** 6)}'}))
+        start = rng.randrange(words_count)
+        annotations['lemmas'].append((start, min(words_count - 1, start + rng.randint(0, 1)),
+                                      {'label': rng.choice(LEMMA_LABELS), 'anchor_target': None}))
+
+    for _ in range(max(1, annotations_per_page // 10)):
+        start = rng.randrange(words_count)
+        annotations['hyphenations'].append((start, min(words_count - 1, start + 1), {}))
+
+    # Sorted as ``cas.select`` returns them
+    return {annotation_type: sorted(type_annotations, key=lambda a: a[:2])
+            for annotation_type, type_annotations in annotations.items()}
+
+
+def get_typesystem(typesystem_path: Path = vs.TYPESYSTEM_PATH) -> 'TypeSystem':
+    """Loads the ajmc typesystem, completed with the gold sentences and hyphenations layers of the NE-corpus."""
+    from cassis import load_typesystem
+
+    with open(typesystem_path, 'rb') as f:
+        typesystem = load_typesystem(f)
+
+    if not typesystem.contains_type(vs.ANNOTATION_LAYERS['sentences']):
+        sentence_type = typesystem.create_type(vs.ANNOTATION_LAYERS['sentences'])
+        for feature in ['corrupted', 'incomplete_continuing', 'incomplete_truncated']:
+            typesystem.create_feature(sentence_type, feature, 'uima.cas.Boolean')
+    if not typesystem.contains_type(vs.ANNOTATION_LAYERS['hyphenations']):
+        typesystem.create_type(vs.ANNOTATION_LAYERS['hyphenations'])
+
+    return typesystem
+
+
+def write_page_xmi(rebuild: Dict[str, Any],
+                   annotations: Dict[str, List[Tuple[int, int, Dict[str, Any]]]],
+                   annotation_types: List[str],
+                   xmis_dir: Path,
+                   typesystem_path: Path):
+    """Writes the XMI of a page to ``xmis_dir``, as exported by ``cas_utils.rebuild_to_xmi`` and annotated in INCEpTION."""
+    cas_utils.rebuild_to_xmi(rebuild, xmis_dir, SYNTHETIC_OCR_RUN_ID, SYNTHETIC_REGION_TYPES,
+                             typesystem_path=typesystem_path)
+
+    xmi_path = xmis_dir / f'{rebuild["id"]}.xmi'
+    cas = cas_utils.get_cas(xmi_path, typesystem_path)
+    offsets = rebuild['offsets']['words']
+    for annotation_type in annotation_types:
+        annotation_class = cas.typesystem.get_type(vs.ANNOTATION_LAYERS[annotation_type])
+        for start, end, attributes in annotations[annotation_type]:
+            attributes = {'value' if k == 'label' else k: v for k, v in attributes.items()}
+            cas.add(annotation_class(begin=offsets[start][0], end=offsets[end][1], **attributes))
+    cas.to_xmi(xmi_path)
+
+
+def _get_canonical_children(layouts: List[Dict[str, Any]],
+                            annotations: List[Dict[str, List[Tuple[int, int, Dict[str, Any]]]]]) -> Dict[str, list]:
+    children = {child_type: [] for child_type in vs.CHILD_TYPES}
+    w_count = 0
+    for layout, page_annotations in zip(layouts, annotations):
+        text_key = 'text' if layout['is_ocr_gt'] else 'ocr_text'
+        page_start = w_count
+        for region in layout['regions']:
+            region_start = w_count
+            for line in region['lines']:
+                line_start = w_count
+                for word in line['words']:
+                    children['words'].append({'bbox': [list(word['bbox'][:2]), list(word['bbox'][2:])],
+                                              'text': word[text_key]})
+                    w_count += 1
+                children['lines'].append({'word_range': [line_start, w_count - 1]})
+            children['regions'].append({'word_range': [region_start, w_count - 1],
+                                        'region_type': region['region_type'],
+                                        'is_ocr_gt': layout['is_ocr_gt']})
+        children['pages'].append({'id': layout['id'], 'word_range': [page_start, w_count - 1]})
+
+        for annotation_type, page_type_annotations in page_annotations.items():
+            for start, end, attributes in page_type_annotations:
+                annotation = {'word_range': [page_start + start, page_start + end], 'shifts': [0, 0]}
+                if annotation_type in ['entities', 'lemmas']:
+                    annotation['transcript'] = ' '.join(w['text'] for w in children['words'][page_start + start:page_start + end + 1])
+                children[annotation_type].append({**annotation, **attributes})
+
+    children['sections'] = [{'id': 'section_0', 'section_types': ['commentary'], 'section_title': 'Commentary',
+                             'word_range': [0, w_count - 1]}]
+    return children
+
+
+def write_synthetic_commentary(comm_id: str = SYNTHETIC_COMM_ID,
+                               ocr_run_id: str = SYNTHETIC_OCR_RUN_ID,
+                               pages: int = 10,
+                               words_per_page: int = 300,
+                               annotations_per_page: int = 10,
+                               ocr_gt_pages: int = 2,
+                               ocr_error_rate: float = 0.05,
+                               raw: bool = True,
+                               seed: int = 0) -> Path:
+    """Writes a synthetic commentary to the ajmc folder structure.
+
+    Note:
+        Annotated raw commentaries need ``comm_id`` to be registered in ``vs.IDS_TO_NER_RUNS`` and
+        ``vs.IDS_TO_REGIONS``, which is done here but only holds for the current process (see
+        ``register_synthetic_commentary``).
+
+    Args:
+        comm_id: The id of the commentary, which must not contain underscores.
+        ocr_run_id: The id of the synthetic OCR run.
+        pages: The number of pages.
+        words_per_page: The number of words on each page.
+        annotations_per_page: The number of entities and lemmas on each page. Set to 0 to write no annotations at all.
+        ocr_gt_pages: The number of pages, from the first one, which are part of the OCR groundtruth.
+        ocr_error_rate: The rate of OCR errors per character.
+        raw: Whether to write the raw commentary (images, OCR, VIA, sections and annotations), or only the canonical
+            json, which is much faster for large commentaries.
+        seed: The seed of the random generator, so that the same arguments always give the same commentary.
+
+    Returns:
+        The path to the canonical json.
+    """
+    rng = random.Random(seed)
+    register_synthetic_commentary(comm_id, ocr_run_id)
+
+    page_ids = [f'{comm_id}_{i:04d}' for i in range(1, pages + 1)]
+    layouts = [generate_page_layout(page_id, words_per_page, rng, is_ocr_gt=i < ocr_gt_pages, ocr_error_rate=ocr_error_rate)
+               for i, page_id in enumerate(page_ids)]
+    annotations = [generate_page_annotations(len(list(iter_layout_words(layout))), annotations_per_page, rng)
+                   for layout in layouts]
+
+    if raw:
+        _write_raw_commentary(comm_id, ocr_run_id, layouts, annotations, annotations_per_page > 0, rng)
+
+    canonical_path = vs.get_comm_canonical_dir(comm_id) / f'{ocr_run_id}.json'
+    canonical_path.parent.mkdir(parents=True, exist_ok=True)
+    canonical_path.write_text(json.dumps({'id': comm_id,
+                                          'metadata': {'ocr_run_id': ocr_run_id},
+                                          'ocr_gt_page_ids': page_ids[:ocr_gt_pages],
+                                          'olr_gt_page_ids': page_ids,
+                                          'ner_gt_page_ids': page_ids if annotations_per_page else [],
+                                          'lem_link_gt_page_ids': page_ids if annotations_per_page else [],
+                                          'children': _get_canonical_children(layouts, annotations)},
+                                         ensure_ascii=False), encoding='utf-8')
+    return canonical_path
+
+
+def _write_raw_commentary(comm_id: str,
+                          ocr_run_id: str,
+                          layouts: List[Dict[str, Any]],
+                          annotations: List[Dict[str, List[Tuple[int, int, Dict[str, Any]]]]],
+                          write_annotations: bool,
+                          rng: random.Random):
+    root_dir = vs.get_comm_root_dir(comm_id)
+    img_dir = vs.get_comm_img_dir(comm_id)
+    ocr_dir = vs.get_comm_ocr_runs_dir(comm_id) / ocr_run_id / 'outputs'
+    for dir_ in [img_dir, ocr_dir]:
+        dir_.mkdir(parents=True, exist_ok=True)
+
+    via_project = ViaProject(comm_id, img_dir, [{'name': 'label', 'level': 'region', 'type': 'text'},
+                                                {'name': 'is_ground_truth', 'level': 'file', 'type': 'checkbox',
+                                                 'options': {'ocr': '', 'olr': ''}}])
+    for layout in layouts:
+        cv2.imwrite(str(img_dir / (layout['id'] + vs.DEFAULT_IMG_EXTENSION)), draw_page_image(layout))
+        (ocr_dir / (layout['id'] + '.hocr')).write_text(get_page_hocr(layout, rng), encoding='utf-8')
+        shapes, attributes = get_page_via_regions(layout)
+        via_project.add_image(Path(layout['id'] + vs.DEFAULT_IMG_EXTENSION), shapes, attributes,
+                              {'is_ground_truth': {'ocr': layout['is_ocr_gt'], 'olr': True}})
+    via_project.save(vs.get_comm_via_path(comm_id))
+
+    page_numbers = [layout['id'].split('_')[-1] for layout in layouts]
+    vs.get_comm_sections_path(comm_id).write_text(json.dumps([{'section_types': ['commentary'],
+                                                                   'section_title': 'Commentary',
+                                                                   'start': page_numbers[0],
+                                                                   'end': page_numbers[-1]}]), encoding='utf-8')
+
+    if not write_annotations:
+        return
+
+    # Entities, sentences and hyphenations live in the NE-corpus, lemmas in the lemma-linkage corpus
+    ner_jsons_dir = vs.get_comm_ner_jsons_dir(comm_id, ocr_run_id)
+    ner_xmis_dir = vs.NE_CORPUS_DIR / 'data/preparation/corpus/synthetic/curated'
+    lemlink_run_dir = root_dir / vs.COMM_LEMLINK_ANN_REL_DIR / ocr_run_id
+    for dir_ in [ner_jsons_dir, ner_xmis_dir, lemlink_run_dir / 'jsons', lemlink_run_dir / 'xmis', vs.LEMLINK_XMI_DIR]:
+        dir_.mkdir(parents=True, exist_ok=True)
+
+    typesystem = get_typesystem()
+    for typesystem_path in [vs.NE_CORPUS_DIR / 'data/preparation/TypeSystem.xml', vs.LEMLINK_XMI_DIR / 'TypeSystem.xml']:
+        typesystem.to_xml(typesystem_path)
+    (lemlink_run_dir / 'xmis' / 'metadata.json').write_text(json.dumps({'region_types': SYNTHETIC_REGION_TYPES}),
+                                                            encoding='utf-8')
+
+    for layout, page_annotations in zip(layouts, annotations):
+        inception_dict = get_page_inception_dict(layout)
+        for jsons_dir in [ner_jsons_dir, lemlink_run_dir / 'jsons']:
+            (jsons_dir / (layout['id'] + '.json')).write_text(json.dumps(inception_dict, ensure_ascii=False), encoding='utf-8')
+
+        rebuild = cas_utils.basic_rebuild(inception_dict, SYNTHETIC_REGION_TYPES)
+        write_page_xmi(rebuild, page_annotations, ['entities', 'sentences', 'hyphenations'],
+                       ner_xmis_dir, vs.NE_CORPUS_DIR / 'data/preparation/TypeSystem.xml')
+        write_page_xmi(rebuild, page_annotations, ['lemmas'],
+                       vs.LEMLINK_XMI_DIR, vs.LEMLINK_XMI_DIR / 'TypeSystem.xml')
+
+    cas_utils.clear_caches()  # The corpora's XMIs may have been indexed before being written
+
+
+def register_synthetic_commentary(comm_id: str = SYNTHETIC_COMM_ID, ocr_run_id: str = SYNTHETIC_OCR_RUN_ID):
+    """Registers the annotation run and region types of a synthetic commentary, as ``cas_utils`` looks them up in
+    ``vs.IDS_TO_NER_RUNS`` and ``vs.IDS_TO_REGIONS``."""
+    vs.IDS_TO_NER_RUNS[comm_id] = ocr_run_id
+    vs.IDS_TO_REGIONS[comm_id] = SYNTHETIC_REGION_TYPES
+
+
+def get_synthetic_raw_commentary(comm_id: str = SYNTHETIC_COMM_ID,
+                                 ocr_run_id: str = SYNTHETIC_OCR_RUN_ID,
+                                 ocr_cache_dir: Optional[Path] = None) -> RawCommentary:
+    """Instantiates a synthetic ``RawCommentary``, with metadata that do not require the data directories to be git
+    repositories."""
+    register_synthetic_commentary(comm_id, ocr_run_id)
+    return RawCommentary(id=comm_id, ocr_run_id=ocr_run_id, ocr_cache_dir=ocr_cache_dir,
+                         metadata={'ocr_run_id': ocr_run_id})
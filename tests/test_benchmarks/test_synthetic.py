@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from ajmc.commons import variables as vs
+from ajmc.text_processing import cas_utils
+from ajmc.text_processing.canonical_classes import CanonicalCommentary
+from benchmarks import synthetic
+from benchmarks.compare import compare_results
+
+
+@pytest.fixture
+def synthetic_data_dir(tmp_path, monkeypatch):
+    for name in ['COMMS_DATA_DIR', 'NE_CORPUS_DIR', 'LEMLINK_XMI_DIR']:
+        monkeypatch.setattr(vs, name, tmp_path / name, raising=False)
+    monkeypatch.setattr(vs, 'CONTOURS_CACHE_DIR', None, raising=False)
+    monkeypatch.setitem(vs.IDS_TO_NER_RUNS, synthetic.SYNTHETIC_COMM_ID, synthetic.SYNTHETIC_OCR_RUN_ID)
+    monkeypatch.setitem(vs.IDS_TO_REGIONS, synthetic.SYNTHETIC_COMM_ID, synthetic.SYNTHETIC_REGION_TYPES)
+    return tmp_path
+
+
+def test_synthetic_commentary(synthetic_data_dir):
+    tmp_path = synthetic_data_dir
+    canonical_path = synthetic.write_synthetic_commentary(pages=2, words_per_page=60, annotations_per_page=5,
+                                                          ocr_gt_pages=1)
+    expected = json.loads(canonical_path.read_text(encoding='utf-8'))
+    assert len(expected['children']['words']) == 120
+    assert all(expected['children'][annotation_type] for annotation_type in ['entities', 'sentences', 'lemmas'])
+
+    # Canonizing the raw commentary, with its OCR noise and annotations, gives back the canonical commentary
+    commentary = synthetic.get_synthetic_raw_commentary().to_canonical()
+    commentary.to_json(tmp_path / 'canonical.json')
+    canonized = json.loads((tmp_path / 'canonical.json').read_text(encoding='utf-8'))
+    assert canonized['children'] == expected['children']
+    assert canonized['ocr_gt_page_ids'] == expected['ocr_gt_page_ids']
+    assert canonized['ner_gt_page_ids'] == expected['ner_gt_page_ids']
+
+    binary_commentary = CanonicalCommentary.from_binary(commentary.to_binary(tmp_path / 'binary'))
+    assert [e.to_json() for e in binary_commentary.children.entities] == \
+           [e.to_json() for e in commentary.children.entities]
+
+
+def test_page_annotations_are_imported_together(synthetic_data_dir, monkeypatch):
+    synthetic.write_synthetic_commentary(pages=1, words_per_page=60, annotations_per_page=5, ocr_gt_pages=0)
+    loaded_xmis = []
+    get_cas = cas_utils.get_cas
+
+    def get_counted_cas(xmi_path, xml_path):
+        loaded_xmis.append(xmi_path)
+        return get_cas(xmi_path, xml_path)
+
+    monkeypatch.setattr(cas_utils, 'get_cas', get_counted_cas)
+
+    page = synthetic.get_synthetic_raw_commentary().children.pages[0]
+    assert page.children.entities and page.children.sentences and page.children.hyphenations
+    assert len(loaded_xmis) == 1
+    assert page.children.lemmas
+    assert len(loaded_xmis) == 2
+
+
+def test_compare_results():
+    base = {'benchmarks': {'a': {'min': 1.0, 'peak_memory_mb': 10.0}, 'b': {'min': 1.0, 'peak_memory_mb': 10.0}}}
+    new = {'benchmarks': {'a': {'min': 1.05, 'peak_memory_mb': 10.0}, 'b': {'min': 0.5, 'peak_memory_mb': 20.0},
+                          'c': {'min': 1.0, 'peak_memory_mb': 1.0}}}
+    rows, regressions = compare_results(base, new, threshold=0.1)
+    assert [row['name'] for row in rows] == ['a', 'b']
+    assert rows[1]['time_ratio'] == 0.5 and rows[1]['memory_ratio'] == 2
+    assert regressions == ['b']
@@ -23,3 +23,15 @@ def test_are_intervals_within_intervals():
     assert not ar.are_intervals_within_intervals(so.sample_interval_lists['non_overlapping'],
                                                  so.sample_interval_lists['base'])
 
+
+
+def test_interval_index():
+    intervals = [so.sample_intervals[k] for k in ['base', 'included', 'overlapping', 'non_overlapping']]
+    index = ar.IntervalIndex(intervals)
+    assert len(index) == len(intervals)
+
+    for query in intervals:
+        assert index.get_contained(query) == [i for i, interval in enumerate(intervals)
+                                              if ar.is_interval_within_interval(interval, query)]
+        assert index.get_containers(query) == [i for i, interval in enumerate(intervals)
+                                               if ar.is_interval_within_interval(query, interval)]
@@ -73,3 +73,28 @@ def test_adjust_bbox_to_included_contours():
     contours_2 = [geo.Shape(points[k]) for k in ['base', 'horizontally_overlapping']]
     assert geo.adjust_bbox_to_included_contours(bboxes['base'], contours_1).bbox == \
            geo.adjust_bbox_to_included_contours(bboxes['base'], contours_2).bbox
+    # Test with a ``ShapeArray`` of contours
+    assert geo.adjust_bbox_to_included_contours(bboxes['base'], geo.ShapeArray.from_shapes(contours_1)).bbox == \
+           geo.adjust_bbox_to_included_contours(bboxes['base'], contours_1).bbox
+
+
+def test_shape_array():
+    shape_array = geo.ShapeArray.from_bboxes(bboxes.values())
+    assert len(shape_array) == len(bboxes)
+    assert [s.bbox for s in shape_array.to_shapes()] == list(bboxes.values())
+    assert shape_array[0].bbox == bboxes['base']
+    assert shape_array.areas.tolist() == [geo.compute_bbox_area(b) for b in bboxes.values()]
+
+    # Compare pairwise matrices with their scalar counterparts, on sample and random bboxes
+    random_xyxy = np.random.RandomState(0).randint(0, 50, size=(40, 4))
+    random_xyxy[:, 2:] += random_xyxy[:, :2]
+    for array in [shape_array, geo.ShapeArray(random_xyxy)]:
+        bboxes_ = [s.bbox for s in array.to_shapes()]
+        assert array.overlap_areas(array).tolist() == [[geo.compute_bbox_overlap_area(b1, b2) for b2 in bboxes_] for b1 in bboxes_]
+        assert array.within(array).tolist() == [[geo.is_bbox_within_bbox(b1, b2) for b2 in bboxes_] for b1 in bboxes_]
+        assert array.overlapping(array).tolist() == [[geo.are_bboxes_overlapping(b1, b2) for b2 in bboxes_] for b1 in bboxes_]
+        assert array.within_with_threshold(array, 0.5).tolist() == \
+               [[geo.is_bbox_within_bbox_with_threshold(b1, b2, 0.5) for b2 in bboxes_] for b1 in bboxes_]
+        assert array.overlapping_with_threshold(array, 0.3).tolist() == \
+               [[geo.are_bboxes_overlapping_with_threshold(b1, b2, 0.3) for b2 in bboxes_] for b1 in bboxes_]
+        assert np.allclose(np.diag(array.ious(array)), 1)
@@ -23,3 +23,60 @@ def test_remove_artifacts_from_contours(art_size):
 def test_ajmcimage():
     assert isinstance(so.sample_img.matrix, np.ndarray)
     assert isinstance(so.sample_img.crop(so.sample_bboxes['base']), img.AjmcImage)
+
+
+def test_ajmcimage_contours_cache(tmp_path):
+    cache_dir = tmp_path / 'contours'
+    image = img.AjmcImage(path=so.sample_img_path)
+    image.contours_cache_dir = cache_dir
+    expected_contours = img.find_contours(image.matrix)
+    expected_bboxes = [c.bbox for c in expected_contours]
+    assert [c.bbox for c in image.contours_array.to_shapes()] == expected_bboxes
+    assert len(list(cache_dir.glob('*.npz'))) == 1
+
+    # ``contours`` keeps the contours' polygons
+    assert [c.points for c in image.contours] == [c.points for c in expected_contours]
+
+    # A new image reads its contours' bboxes and size from the cache
+    cached_image = img.AjmcImage(path=so.sample_img_path)
+    cached_image.contours_cache_dir = cache_dir
+    assert [c.bbox for c in cached_image.contours_array.to_shapes()] == expected_bboxes
+    assert (cached_image.height, cached_image.width) == image.matrix.shape[:2]
+
+
+def test_image_cache():
+    matrix_bytes = img.AjmcImage(path=so.sample_img_path).matrix.nbytes
+    cache = img.ImageCache(max_bytes=matrix_bytes)
+    matrix = cache.get_matrix(so.sample_img_path)
+    assert cache.get_matrix(so.sample_img_path) is matrix
+    assert not matrix.flags.writeable
+    assert cache.current_bytes == matrix_bytes
+
+    # Caching another image evicts the least recently used one
+    other_path = next(p for p in so.sample_img_path.parent.glob('*.png') if p != so.sample_img_path)
+    cache.get_matrix(other_path)
+    assert other_path in cache and so.sample_img_path not in cache
+    assert cache.current_bytes <= cache.max_bytes
+
+    # Images with the same path share their matrix, and crops are views of it
+    image = img.AjmcImage(path=so.sample_img_path)
+    assert image.matrix is img.AjmcImage(path=so.sample_img_path).matrix
+    assert np.shares_memory(image.crop(so.sample_bboxes['base']).matrix, image.matrix)
+
+
+def test_ajmcimage_decode_modes():
+    image = img.AjmcImage(path=so.sample_img_path)
+    height, width = image.matrix.shape[:2]
+    assert image.get_matrix('grayscale').shape == (height, width)
+    assert set(np.unique(image.get_matrix('binarized')).tolist()) <= {0, 255}
+    assert image.get_matrix('grayscale', reduction=2).shape == (height // 2, width // 2)
+    assert image.get_matrix('color', reduction=4).shape == (height // 4, width // 4, 3)
+    assert image.get_matrix('grayscale') is image.get_matrix('grayscale')  # Each mode is cached
+
+    # Images built from a matrix convert it
+    matrix_image = img.AjmcImage(matrix=image.matrix)
+    assert np.array_equal(matrix_image.get_matrix('grayscale'), image.get_matrix('grayscale'))
+    assert matrix_image.get_matrix('color', reduction=4).shape == image.get_matrix('color', reduction=4).shape
+
+    with pytest.raises(ValueError):
+        image.get_matrix('sepia')
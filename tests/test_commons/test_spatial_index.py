@@ -0,0 +1,27 @@
+import random
+
+from ajmc.commons import geometry
+from ajmc.commons.spatial_index import GridIndex
+from tests import sample_objects as so
+
+
+def test_grid_index():
+    bboxes = list(so.sample_bboxes.values())
+    index = GridIndex(bboxes)
+    assert len(index) == len(bboxes)
+    for bbox in bboxes:
+        assert index.query_overlapping(bbox) == [i for i, b in enumerate(bboxes) if geometry.are_bboxes_overlapping(b, bbox)]
+
+    random.seed(0)
+    bboxes = [((x, y), (x + random.randint(0, 30), y + random.randint(0, 10)))
+              for x, y in [(random.randint(0, 500), random.randint(0, 500)) for _ in range(300)]]
+    index = GridIndex(bboxes)
+    for bbox in bboxes[:50] + [((0, 0), (500, 500)), ((600, 600), (700, 700))]:
+        assert index.query_overlapping(bbox) == [i for i, b in enumerate(bboxes) if geometry.are_bboxes_overlapping(b, bbox)]
+        assert index.query_contained(bbox) == [i for i, b in enumerate(bboxes) if geometry.is_bbox_within_bbox(b, bbox)]
+    for point in [(0, 0), (250, 250), (499, 3), (1000, 1000)]:
+        assert index.query_containing(point) == [i for i, b in enumerate(bboxes) if geometry.is_point_within_bbox(point, b)]
+
+    # Test the alternative constructors
+    shapes = [geometry.Shape(b) for b in bboxes]
+    assert GridIndex.from_shapes(shapes).xyxys == GridIndex.from_shape_array(geometry.ShapeArray.from_shapes(shapes)).xyxys == index.xyxys
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from ajmc.commons import tracing
+from ajmc.text_processing.raw_classes import get_canonical_page_data
+from tests import sample_objects as so
+
+
+@pytest.fixture
+def enabled_tracing():
+    tracing.reset()
+    tracing.enable()
+    yield
+    tracing.disable()
+    tracing.reset()
+
+
+def test_disabled_tracing():
+    tracing.reset()
+    assert not tracing.is_enabled()
+    with tracing.span('stage', page='a') as span:
+        span.set(words=3)
+    tracing.count('words', 3)
+    assert tracing.get_events() == []
+
+
+def test_spans_and_counters(enabled_tracing, tmp_path):
+    @tracing.traced('decorated')
+    def decorated(x):
+        return x * 2
+
+    with tracing.span('outer', page='a') as span:
+        assert decorated(2) == 4
+        span.set(words=3)
+    tracing.count('words', 3)
+    tracing.count('words', 2)
+
+    events = tracing.get_events()
+    assert [e['name'] for e in events] == ['decorated', 'outer', 'words', 'words']
+    outer = events[1]
+    assert outer['ph'] == 'X' and outer['args']['page'] == 'a' and outer['args']['words'] == 3
+    assert outer['ts'] <= events[0]['ts'] and outer['dur'] >= events[0]['dur']
+
+    summary = tracing.get_summary()
+    assert summary['stages']['outer']['calls'] == 1
+    assert summary['counters'] == {'words': 5}
+    assert 'outer' in tracing.format_summary()
+
+    trace_path = tracing.export_chrome_trace(tmp_path / 'trace.json')
+    assert json.loads(trace_path.read_text(encoding='utf-8'))['traceEvents'] == events
+
+    assert tracing.pop_events() == events
+    assert tracing.get_events() == []
+
+
+def test_summary_counters_across_processes():
+    events = [{'name': 'words', 'ph': 'C', 'ts': 0, 'pid': 1, 'tid': 1, 'args': {'words': 3}},
+              {'name': 'words', 'ph': 'C', 'ts': 1, 'pid': 1, 'tid': 1, 'args': {'words': 5}},
+              {'name': 'words', 'ph': 'C', 'ts': 0, 'pid': 2, 'tid': 1, 'args': {'words': 4}}]
+    assert tracing.get_summary(events)['counters'] == {'words': 9}
+
+
+def test_canonization_stages(enabled_tracing):
+    data = get_canonical_page_data(so.sample_raw_commentary.get_page(so.sample_page_id))
+    stages = tracing.get_summary()['stages']
+    assert stages['canonize_page']['calls'] == 1
+    assert all(stage in stages for stage in ['optimise', 'import_page_rebuild', 'basic_rebuild', 'import_page_cas'])
+    assert tracing.get_summary()['counters']['words'] == len(data['words'])
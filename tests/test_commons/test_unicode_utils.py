@@ -7,3 +7,37 @@ def test_count_chars_by_charset():
     assert uu.count_chars_by_charset(string, 'greek') == 3
     assert uu.count_chars_by_charset(string, 'numeral') == 3
     assert uu.count_chars_by_charset(string, 'punctuation') == 3
+
+
+def test_count_chars_by_charsets():
+    string = 'abdεθ-:123ξ,·'
+    assert uu.count_chars_by_charsets(string) == {'latin': 3, 'greek': 4, 'numeral': 3, 'punctuation': 4}
+    assert uu.count_chars_by_charsets('') == {'latin': 0, 'greek': 0, 'numeral': 0, 'punctuation': 0}
+
+
+def test_get_char_charset():
+    assert uu.get_char_charset('a') == 'latin'
+    assert uu.get_char_charset('ῶ') == 'greek'
+    assert uu.get_char_charset('·') == 'greek'  # Greek and punctuation, the first charset wins
+    assert uu.get_char_charset('中') == 'fallback'
+    assert uu.get_char_charset('😀', fallback='latin') == 'latin'
+
+
+def test_chunk_string_by_charsets():
+    assert uu.chunk_string_by_charsets('Hello Γειά σου Κόσμε World') == [('Hello ', 'latin'),
+                                                                         ('Γειά σου Κόσμε ', 'greek'),
+                                                                         ('World', 'latin')]
+    assert uu.chunk_string_by_charsets('αβ, 12') == [('αβ', 'greek'), (', ', 'punctuation'), ('12', 'numeral')]
+
+
+def test_harmonise_unicode():
+    assert uu.harmonise_unicode('ﬁne  ʼ…\t🄰⸗ x') == "fine '... A— x"
+    assert uu.harmonise_unicode('ﬁne  ʼ…', harmonise_functions=(uu.harmonise_ligatures,)) == 'fine ʼ…'
+    # Functions without a mapping are applied one after the other
+    assert uu.harmonise_unicode('ﬁne  ʼ', harmonise_functions=(uu.harmonise_ligatures, str.upper)) == 'FINE ʼ'
+    assert uu.harmonise_non_printable('a\x00b\xad') == 'ab-'
+
+
+def test_remove_diacritics():
+    assert uu.remove_diacritics('μῆνιν ἄειδε, θεά') == 'μηνιν αειδε, θεα'
+    assert uu.remove_diacritics('Œuvre réﬁnée 😀') == 'Œuvre refinee 😀'
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+from ajmc.commons import variables as vs
+
+CORE_MODULES = ['ajmc.commons.variables', 'ajmc.commons.arithmetic', 'ajmc.commons.geometry',
+                'ajmc.commons.spatial_index', 'ajmc.commons.unicode_utils', 'ajmc.commons.miscellaneous',
+                'ajmc.commons.file_management', 'ajmc.commons.image', 'ajmc.text_processing.raw_classes',
+                'ajmc.text_processing.canonical_classes']
+
+HEAVY_MODULES = ['bs4', 'cassis', 'fontTools', 'jinja2', 'jsonschema', 'lunr', 'matplotlib', 'pandas', 'PIL', 'torch',
+                 'transformers']
+
+
+def run_without_data_dir(code: str) -> subprocess.CompletedProcess:
+    """Runs ``code`` in a fresh interpreter, without ``AJMC_DATA_DIR`` and without stdin (so that prompts fail)."""
+    env = {k: v for k, v in os.environ.items() if k != 'AJMC_DATA_DIR'}
+    env['PYTHONPATH'] = os.pathsep.join([str(vs.PACKAGE_DIR)] + [p for p in [os.getenv('PYTHONPATH')] if p])
+    return subprocess.run([sys.executable, '-c', code], env=env, stdin=subprocess.DEVNULL, capture_output=True,
+                          text=True, timeout=120)
+
+
+def test_core_modules_import_time():
+    code = f"""
+import json, sys, time
+start = time.perf_counter()
+for module in {CORE_MODULES!r}:
+    __import__(module)
+print(json.dumps({{'time': time.perf_counter() - start,
+                  'heavy_modules': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+    result = run_without_data_dir(code)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.splitlines()[-1])
+    assert report['heavy_modules'] == []
+    assert report['time'] < 3  # A generous budget, which should only be exceeded by eager heavy imports
+
+
+def test_lazy_data_dir():
+    code = """
+from pathlib import Path
+from ajmc.commons import variables as vs
+try:
+    vs.COMMS_DATA_DIR
+except RuntimeError:
+    print('raised')
+vs.AJMC_DATA_DIR = Path('/data')
+print(vs.COMMS_DATA_DIR, vs.LEMLINK_XMI_DIR, vs.get_comm_root_dir('comm'))
+"""
+    result = run_without_data_dir(code)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ['raised',
+                                          '/data/commentaries_data '
+                                          '/data/lemma-linkage-corpus/data/preparation/corpus/annotated '
+                                          '/data/commentaries_data/comm']
@@ -15,6 +15,18 @@ def test_count_errors_by_charset():
     assert ocr_eval.count_errors_by_charset(gt_string, ts_string, 'punctuation') == 1
 
 
+def test_count_errors_by_charsets():
+    gt_string = 'abdεθ-:123ξ,'
+    ts_string = 'aaedεx-x1x3ξ,'
+    assert ocr_eval.count_errors_by_charsets(gt_string, ts_string) == {'latin': 2, 'greek': 1, 'numeral': 1,
+                                                                       'punctuation': 1}
+    assert ocr_eval.count_errors_by_charsets('', ts_string) == {'latin': 0, 'greek': 0, 'numeral': 0, 'punctuation': 0}
+
+    # Backslashes are punctuation
+    assert ocr_eval.count_errors_by_charsets('a\\b', 'a/b') == {'latin': 0, 'greek': 0, 'numeral': 0, 'punctuation': 1}
+    assert ocr_eval.count_errors_by_charset('a\\b', 'a/b', 'punctuation') == 1
+
+
 def test_bag_of_word_evaluation():
     gt_bag = ['soleil', 'maison', 'je', '122', 'courage']
     pr_bag_1 = ['soleil', 'maeson', 'je', '122.cou']
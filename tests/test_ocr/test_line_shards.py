@@ -0,0 +1,31 @@
+import cv2
+import numpy as np
+
+from ajmc.ocr.data_processing import line_shards
+from tests import sample_objects as so
+
+
+def test_export_line_pairs(tmp_path):
+    pages = so.sample_can_commentary.ocr_gt_pages[:2]
+    loose_dir, shards_dir = tmp_path / 'loose', tmp_path / 'shards'
+
+    count = line_shards.export_line_pairs(pages, loose_dir, workers=2)
+    assert count == sum(len(p.children.lines) for p in pages)
+    assert len(list(loose_dir.glob('*.png'))) == len(list(loose_dir.glob('*.txt'))) == count
+
+    # Exported images are the crops of ``line.image``
+    line = pages[0].children.lines[0]
+    assert np.array_equal(cv2.imread(str(loose_dir / f'{pages[0].id}_0.png')), line.image.matrix)
+
+    # Shards contain the same pairs as loose files
+    line_shards.export_line_pairs(pages, shards_dir, shard_size=10, workers=2)
+    assert len(list(shards_dir.glob('*.tar'))) == -(-count // 10)
+    sharded_lines = line_shards.read_line_shards_index(shards_dir)
+    assert len(sharded_lines) == count
+    for sharded_line in sharded_lines:
+        img_bytes, text = sharded_line.read()
+        assert img_bytes == (loose_dir / f'{sharded_line.key}.png').read_bytes()
+        assert text == (loose_dir / f'{sharded_line.key}.txt').read_text(encoding='utf-8')
+
+    streamed = [l for shard_path in sorted(shards_dir.glob('*.tar')) for l in line_shards.iter_line_shard(shard_path)]
+    assert [(k, i, t) for k, i, t in streamed] == [(l.key, *l.read()) for l in sharded_lines]
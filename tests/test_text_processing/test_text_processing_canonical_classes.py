@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from lazy_objects.lazy_objects import LazyObject
 
@@ -45,3 +47,95 @@ def test_canonical_textcontainer(tc):
         parent = getattr(tc.parents, parent_type)
         if parent is not None:
             assert tc in getattr(parent.children, vs.TC_TYPES_TO_CHILD_TYPES[tc.type])
+
+
+def test_canonical_commentary_interval_index():
+    commentary = so.sample_can_commentary
+    for tc_type in vs.CHILD_TYPES:
+        tcs = getattr(commentary.children, tc_type)
+        assert commentary.get_interval_index(tc_type) is commentary.get_interval_index(tc_type)
+        assert len(commentary.get_interval_index(tc_type)) == len(tcs)
+
+    # Reassigning a children list must invalidate its index
+    index = commentary.get_interval_index('regions')
+    commentary.children.regions = list(commentary.children.regions)
+    assert commentary.get_interval_index('regions') is not index
+
+
+@pytest.mark.parametrize('commentary', [so.sample_can_commentary,
+                                        so.sample_cancommentary_from_json])
+def test_canonical_commentary_indices_and_ids(commentary):
+    for tc_type in vs.CHILD_TYPES:
+        for i, tc in enumerate(getattr(commentary.children, tc_type)):
+            assert tc.index == i
+            assert commentary.get_id_map(tc_type)[tc.id] is tc
+
+    for page in commentary.children.pages:
+        assert commentary.get_page(page.id) is page
+        assert page.image is commentary.get_image(page.id)
+    assert commentary.get_page('not_a_page_id') is None
+
+
+def test_canonical_commentary_binary(tmp_path):
+    binary_dir = so.sample_can_commentary.to_binary(tmp_path / (so.sample_ocr_run_id + vs.CANONICAL_BINARY_SUFFIX))
+    commentary = cc.CanonicalCommentary.from_binary(binary_dir)
+
+    assert commentary.id == so.sample_can_commentary.id
+    assert [img.id for img in commentary.images] == [img.id for img in so.sample_can_commentary.images]
+    for tc_type in vs.CHILD_TYPES:
+        assert [tc.to_json() for tc in getattr(commentary.children, tc_type)] == \
+               [tc.to_json() for tc in getattr(so.sample_can_commentary.children, tc_type)]
+    assert commentary.children.pages[0].text == so.sample_can_commentary.children.pages[0].text
+
+
+def test_canonical_commentary_binary_with_annotations(tmp_path):
+    # ``sample_can_commentary`` has no annotations, so we add some of every type
+    so.sample_can_commentary.to_json(tmp_path / 'commentary.json')
+    can_json = json.loads((tmp_path / 'commentary.json').read_text(encoding='utf-8'))
+    can_json['children']['entities'] = [{'word_range': [2, 3], 'shifts': [0, -1], 'transcript': 'Sophocles',
+                                         'label': 'pers.author', 'wikidata_id': 'Q7235'},
+                                        {'word_range': [10, 10], 'shifts': [0, 0], 'transcript': None,
+                                         'label': 'loc', 'wikidata_id': None}]
+    can_json['children']['sentences'] = [{'word_range': [0, 12], 'shifts': [0, 0], 'corrupted': False,
+                                          'incomplete_continuing': True, 'incomplete_truncated': False}]
+    can_json['children']['hyphenations'] = [{'word_range': [5, 6], 'shifts': [0, 0]}]
+    can_json['children']['lemmas'] = [{'word_range': [7, 8], 'shifts': [1, 0], 'transcript': None,
+                                       'label': 'primary-full', 'anchor_target': None}]
+    (tmp_path / 'commentary.json').write_text(json.dumps(can_json), encoding='utf-8')
+    expected = cc.CanonicalCommentary.from_json(tmp_path / 'commentary.json')
+
+    commentary = cc.CanonicalCommentary.from_binary(expected.to_binary(tmp_path / 'binary'))
+    for tc_type in ['entities', 'sentences', 'hyphenations', 'lemmas']:
+        children = getattr(commentary.children, tc_type)
+        assert json.dumps([tc.to_json() for tc in children]) == \
+               json.dumps([tc.to_json() for tc in getattr(expected.children, tc_type)])
+        assert [tc.index for tc in children] == list(range(len(can_json['children'][tc_type])))
+
+
+def test_canonical_commentary_compact(tmp_path):
+    binary_dir = so.sample_can_commentary.to_binary(tmp_path / (so.sample_ocr_run_id + vs.CANONICAL_BINARY_SUFFIX))
+    for commentary in [cc.CanonicalCommentary.from_json(so.sample_canonical_path, compact=True),
+                       cc.CanonicalCommentary.from_binary(binary_dir, compact=True)]:
+        words = commentary.children.words
+        assert isinstance(words, cc.CanonicalWordsView)
+        assert len(words) == len(so.sample_can_commentary.children.words)
+        assert [w.to_json() for w in words] == [w.to_json() for w in so.sample_can_commentary.children.words]
+
+        word = words[-1]
+        assert word == words[len(words) - 1] and word.index == len(words) - 1
+        assert word.parents.page.id == so.sample_can_commentary.children.words[-1].parents.page.id
+        assert word in word.parents.line.children.words
+        assert commentary.children.pages[0].text == so.sample_can_commentary.children.pages[0].text
+
+
+def test_canonical_commentary_text_buffer():
+    commentary = so.sample_cancommentary_from_json
+    for tc_type in vs.CHILD_TYPES:
+        for tc in getattr(commentary.children, tc_type):
+            if not isinstance(tc, cc.CanonicalAnnotation):
+                assert tc.text == ' '.join([w.text for w in tc.children.words])
+
+    for i, word in enumerate(commentary.children.words[:50]):
+        start, end = commentary.get_char_range(word.word_range)
+        assert commentary.text[start:end] == word.text
+        assert commentary.get_word_index(start) == i
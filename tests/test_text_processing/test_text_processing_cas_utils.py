@@ -1,21 +1,22 @@
+import json
 import shutil
+from types import SimpleNamespace
+from typing import List
 
 import pytest
 
 import ajmc.commons.variables
 from ajmc.commons import variables as vs
+from ajmc.commons.arithmetic import compute_interval_overlap
 from ajmc.text_processing import cas_utils as casu
 from tests import sample_objects as so
 
 
 @pytest.mark.parametrize('ocr_commentary', [so.sample_raw_commentary])
-def test_export_commentary_to_xmis(ocr_commentary):
-    base_xmi_dir = so.sample_comm_root_dir / vs.COMM_NER_ANN_REL_DIR
-    output_xmi_dir = base_xmi_dir / so.sample_ocr_run_id / 'xmis'
-    output_json_dir = output_xmi_dir.parent / 'jsons'
-
-    # remove existing files before creating new output
-    shutil.rmtree(output_xmi_dir, ignore_errors=True)
+def test_export_commentary_to_xmis(ocr_commentary, tmp_path):
+    # The export writes a manifest along with the xmis, so it is kept out of the test data
+    output_xmi_dir = tmp_path / 'xmis'
+    output_json_dir = tmp_path / 'jsons'
 
     casu.export_commentary_to_xmis(
             ocr_commentary,
@@ -43,3 +44,151 @@ def test_get_cas():
     assert metadata.get('ocr_run_id') is not None
     assert metadata.get('region_types').split(',') is not None
     assert metadata.get('xmi_creation_date') is not None
+
+
+def test_get_typesystem(tmp_path):
+    typesystem_path = tmp_path / 'TypeSystem.xml'
+    shutil.copy(vs.TYPESYSTEM_PATH, typesystem_path)
+    typesystem = casu.get_typesystem(typesystem_path)
+    assert casu.get_typesystem(typesystem_path) is typesystem
+
+    # A modified typesystem is parsed again
+    typesystem_path.write_text(typesystem_path.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+    assert casu.get_typesystem(typesystem_path) is not typesystem
+
+
+def test_get_xmi_paths(tmp_path):
+    for language, page_id in [('de', 'comm_0001'), ('en', 'comm_0001'), ('en', 'comm_0002')]:
+        (tmp_path / language / 'curated').mkdir(parents=True, exist_ok=True)
+        (tmp_path / language / 'curated' / f'{page_id}.xmi').touch()
+
+    xmi_paths = casu.get_xmi_paths(tmp_path, '*/curated/*.xmi')
+    assert xmi_paths == {'comm_0001': tmp_path / 'de/curated/comm_0001.xmi',
+                         'comm_0002': tmp_path / 'en/curated/comm_0002.xmi'}
+
+    # The corpus is only scanned again once the caches are cleared
+    (tmp_path / 'en/curated/comm_0003.xmi').touch()
+    assert 'comm_0003' not in casu.get_xmi_paths(tmp_path, '*/curated/*.xmi')
+    casu.clear_caches()
+    assert 'comm_0003' in casu.get_xmi_paths(tmp_path, '*/curated/*.xmi')
+
+
+def test_align_cas_annotation():
+    rebuild = casu.basic_rebuild(so.sample_ocr_page.to_inception_dict(), vs.IDS_TO_REGIONS[so.sample_comm_id])
+    sofa = SimpleNamespace(sofaString=rebuild['fulltext'])
+    text_length = len(rebuild['fulltext'])
+    cas_annotations = [SimpleNamespace(begin=begin, end=min(begin + length, text_length), sofa=sofa)
+                       for begin in range(0, text_length, 7) for length in [0, 1, 5, 40]]
+
+    word_bounds = casu.get_word_bounds(rebuild)
+    for cas_annotation in cas_annotations:
+        bboxes, shifts, transcript, _, warnings = casu.align_cas_annotation(cas_annotation, rebuild, word_bounds=word_bounds)
+        assert casu.align_cas_annotation(cas_annotation, rebuild)[:2] == (bboxes, shifts)
+        # The words are those found by comparing the annotation with every word
+        expected = [i for i, offsets in enumerate(rebuild['offsets']['words'])
+                    if compute_interval_overlap((cas_annotation.begin, cas_annotation.end), offsets) > 0]
+        assert bboxes == [rebuild['bbox']['words'][i] for i in expected]
+        assert transcript == rebuild['fulltext'][cas_annotation.begin:cas_annotation.end]
+        if expected:
+            assert shifts == [cas_annotation.begin - rebuild['offsets']['words'][expected[0]][0],
+                              cas_annotation.end - rebuild['offsets']['words'][expected[-1]][1]]
+        else:
+            assert warnings == ['no words']
+
+
+def test_align_cas_annotations():
+    rebuild = casu.basic_rebuild(so.sample_ocr_page.to_inception_dict(), vs.IDS_TO_REGIONS[so.sample_comm_id])
+    sofa = SimpleNamespace(sofaString=rebuild['fulltext'])
+    cas_annotations = [SimpleNamespace(begin=begin, end=begin + 20, sofa=sofa)
+                       for begin in range(0, len(rebuild['fulltext']) - 20, 13)]
+
+    assert casu.align_cas_annotations(cas_annotations, rebuild) == [casu.align_cas_annotation(cas_annotation, rebuild)
+                                                                    for cas_annotation in cas_annotations]
+    assert casu.align_cas_annotations([], None) == []
+
+
+def _legacy_basic_rebuild(page: dict, region_types: List[str], string: str = '') -> dict:
+    """The former, quadratic implementation of ``basic_rebuild``, against which its output is checked."""
+    coordinates = {'regions': [], 'lines': [], 'words': []}
+    offsets = {'regions': [], 'lines': [], 'words': []}
+    texts = {'regions': [], 'lines': [], 'words': []}
+
+    for region in page['regions']:
+        if region['region_type'] in region_types:
+            region_text = ''
+            region_offsets = [len(string)]
+            for line in region['lines']:
+                line_text = ''
+                line_offsets = [len(string)]
+                for word in line['words']:
+                    word_offsets = [len(string)]
+                    region_text += word['text'] + ' '
+                    line_text += word['text'] + ' '
+                    string += word['text'] + ' '
+                    word_offsets.append(len(string) - 1)
+                    texts['words'].append(word['text'] + ' ')
+                    offsets['words'].append(word_offsets)
+                    coordinates['words'].append(word['bbox'] if 'bbox' in word else word['coords'])
+                line_offsets.append(len(string) - 1)
+                offsets['lines'].append(line_offsets)
+                coordinates['lines'].append(line['bbox'] if 'bbox' in line else line['coords'])
+                texts['lines'].append(line_text)
+            region_offsets.append(len(string) - 1)
+            coordinates['regions'].append(region['bbox'] if 'bbox' in region else region['coords'])
+            offsets['regions'].append(region_offsets)
+            texts['regions'].append(region_text)
+
+    return {'id': page['id'], 'fulltext': string, 'bbox': coordinates, 'offsets': offsets, 'texts': texts}
+
+
+@pytest.mark.parametrize('region_types', [vs.IDS_TO_REGIONS[so.sample_comm_id], vs.ROIS])
+def test_basic_rebuild(region_types):
+    json_paths = sorted(so.sample_comm_root_dir.glob('*/annotation/*/jsons/*.json'))
+    pages = [json.loads(path.read_text(encoding='utf-8')) for path in json_paths]
+    assert pages
+    for page in pages + [so.sample_ocr_page.to_inception_dict()]:
+        expected = _legacy_basic_rebuild(page, region_types)
+        assert casu.basic_rebuild(page, region_types) == expected
+        assert casu.basic_rebuild(page, region_types, string='abc ') == _legacy_basic_rebuild(page, region_types, 'abc ')
+
+        light_rebuild = casu.basic_rebuild(page, region_types, levels=['words'], fields=['bbox', 'offsets'])
+        assert light_rebuild == {'id': expected['id'],
+                                 'fulltext': expected['fulltext'],
+                                 'bbox': {'words': expected['bbox']['words']},
+                                 'offsets': {'words': expected['offsets']['words']}}
+
+
+def test_export_commentary_to_xmis_with_workers(tmp_path):
+    jsons_dir = tmp_path / 'jsons'
+    shutil.copytree(so.sample_comm_root_dir / vs.COMM_NER_ANN_REL_DIR / so.sample_ocr_run_id / 'jsons', jsons_dir)
+    export_kwargs = {'make_jsons': False, 'make_xmis': True, 'jsons_dir': jsons_dir,
+                     'region_types': vs.IDS_TO_REGIONS[so.sample_comm_id], 'overwrite': True}
+
+    statuses = casu.export_commentary_to_xmis(so.sample_raw_commentary, xmis_dir=tmp_path / 'serial', **export_kwargs)
+    assert statuses and set(statuses.values()) == {'written'}
+    assert casu.export_commentary_to_xmis(so.sample_raw_commentary, xmis_dir=tmp_path / 'parallel', workers=2,
+                                          **export_kwargs) == statuses
+    for page_id in statuses:
+        serial_cas = casu.get_cas(tmp_path / 'serial' / f'{page_id}.xmi', vs.TYPESYSTEM_PATH)
+        parallel_cas = casu.get_cas(tmp_path / 'parallel' / f'{page_id}.xmi', vs.TYPESYSTEM_PATH)
+        assert serial_cas.sofa_string == parallel_cas.sofa_string
+        for layer in ['tokens', 'segments']:
+            assert len(serial_cas.select(vs.ANNOTATION_LAYERS[layer])) == len(parallel_cas.select(vs.ANNOTATION_LAYERS[layer]))
+
+    # Unchanged pages are skipped, changed or missing ones are exported again
+    changed_id, removed_id = sorted(statuses)[:2]
+    page = json.loads((jsons_dir / f'{changed_id}.json').read_text(encoding='utf-8'))
+    page['cdate'] = 'another date'  # Not part of the rebuild
+    (jsons_dir / f'{changed_id}.json').write_text(json.dumps(page), encoding='utf-8')
+    statuses = casu.export_commentary_to_xmis(so.sample_raw_commentary, xmis_dir=tmp_path / 'parallel', **export_kwargs)
+    assert set(statuses.values()) == {'skipped'}
+
+    word = next(w for r in page['regions'] if r['region_type'] in export_kwargs['region_types']
+                for l in r['lines'] for w in l['words'])
+    word['text'] += 'x'
+    (jsons_dir / f'{changed_id}.json').write_text(json.dumps(page), encoding='utf-8')
+    (tmp_path / 'parallel' / f'{removed_id}.xmi').unlink()
+    statuses = casu.export_commentary_to_xmis(so.sample_raw_commentary, xmis_dir=tmp_path / 'parallel', workers=2,
+                                              **export_kwargs)
+    assert {page_id for page_id, status in statuses.items() if status == 'written'} == {changed_id, removed_id}
+    assert all(status == 'skipped' for page_id, status in statuses.items() if page_id not in [changed_id, removed_id])
@@ -0,0 +1,25 @@
+import shutil
+
+from ajmc.text_processing import markup_processing, ocr_cache
+from tests import sample_objects as so
+
+
+def test_parsed_ocr_cache(tmp_path):
+    ocr_path = tmp_path / so.sample_ocr_page_path.name
+    shutil.copy(so.sample_ocr_page_path, ocr_path)
+    cache_dir = tmp_path / 'cache'
+
+    lines = markup_processing.parse_ocr_lines_with_lxml(ocr_path)
+    assert ocr_cache.load_parsed_ocr(ocr_path, cache_dir) is None
+
+    ocr_cache.save_parsed_ocr(ocr_path, lines, cache_dir)
+    cached_lines = ocr_cache.load_parsed_ocr(ocr_path, cache_dir)
+    assert [[(t, b.points) for t, b in l] for l in cached_lines] == [[(t, b.points) for t, b in l] for l in lines]
+    assert ocr_cache.prune_parsed_ocr_cache(cache_dir) == []
+
+    # Changed or deleted OCR files invalidate their entries
+    ocr_path.write_text(ocr_path.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+    assert ocr_cache.load_parsed_ocr(ocr_path, cache_dir) is None
+    ocr_path.unlink()
+    assert ocr_cache.prune_parsed_ocr_cache(cache_dir) == [ocr_cache.get_entry_path(ocr_path, cache_dir)]
+    assert list(cache_dir.glob('*.npz')) == []
@@ -1,9 +1,13 @@
+import concurrent.futures
+import functools
 import json
+import multiprocessing
 
+import bs4
 import jsonschema
 
-from ajmc.commons import image, variables
-from ajmc.text_processing import raw_classes
+from ajmc.commons import geometry, image, variables
+from ajmc.text_processing import markup_processing, raw_classes
 from tests import sample_objects as so
 
 
@@ -24,6 +28,26 @@ def test_rawcommentary():
 
 # test_ocrcommentary_to_canonical()
 
+def test_rawcommentary_to_canonical_workers(tmp_path):
+    so.sample_raw_commentary.to_canonical(workers=2).to_json(tmp_path / 'parallel.json')
+    so.sample_can_commentary.to_json(tmp_path / 'serial.json')
+    assert (tmp_path / 'parallel.json').read_bytes() == (tmp_path / 'serial.json').read_bytes()
+
+
+def test_rawcommentary_to_canonical_spawned_workers(tmp_path, monkeypatch):
+    # Spawned workers do not inherit the variables set at runtime, which must hence be forwarded to them
+    monkeypatch.setattr(variables, 'AJMC_DATA_DIR', variables.AJMC_DATA_DIR, raising=False)
+    monkeypatch.delenv('AJMC_DATA_DIR', raising=False)
+    for name in ['NE_CORPUS_DIR', 'LEMLINK_CORPUS_DIR', 'LEMLINK_XMI_DIR', 'PARSED_OCR_CACHE_DIR', 'CONTOURS_CACHE_DIR']:
+        monkeypatch.delattr(variables, name, raising=False)  # Left to be derived from ``AJMC_DATA_DIR`` by the workers
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor',
+                        functools.partial(concurrent.futures.ProcessPoolExecutor,
+                                          mp_context=multiprocessing.get_context('spawn')))
+    so.sample_raw_commentary.to_canonical(workers=2).to_json(tmp_path / 'parallel.json')
+    so.sample_can_commentary.to_json(tmp_path / 'serial.json')
+    assert (tmp_path / 'parallel.json').read_bytes() == (tmp_path / 'serial.json').read_bytes()
+
+
 def test_rawpage():
     page = raw_classes.RawPage(ocr_path=so.sample_ocr_page_path, id=so.sample_page_id,
                                img_path=so.sample_img_path, commentary=so.sample_raw_commentary)
@@ -41,6 +65,27 @@ def test_rawpage():
     schema = json.loads(schema_path.read_text('utf-8'))
     jsonschema.validate(instance=page.to_inception_dict(), schema=schema)
 
+    # A page which is not annotated has no annotations
+    unannotated_page = raw_classes.RawPage(ocr_path=so.sample_ocr_page_path, id=so.sample_comm_id + '_0001',
+                                           commentary=so.sample_raw_commentary)
+    assert unannotated_page.children.entities == unannotated_page.children.sentences == []
+    assert unannotated_page.children.lemmas == []
+
+
+def test_rawpage_spatial_index():
+    page = raw_classes.RawPage(ocr_path=so.sample_ocr_page_path, id=so.sample_page_id,
+                               img_path=so.sample_img_path, commentary=so.sample_raw_commentary)
+    region = page.children.regions[0]
+    assert region.children.words == [w for w in page.children.words
+                                     if geometry.is_bbox_within_bbox_with_threshold(w.bbox.bbox, region.bbox.bbox,
+                                                                                    region._inclusion_threshold)]
+
+    words_index = page.get_spatial_index('words')
+    assert len(words_index) == len(page.children.words)
+    assert page.get_spatial_index('words') is words_index  # Cached
+    page.children.words = page.children.words[:10]
+    assert len(page.get_spatial_index('words')) == 10  # Rebuilt on reassignment
+
 
 def test_rawpage_optimise():
     for page in so.sample_raw_commentary.children.pages:
@@ -83,3 +128,23 @@ def test_rawpage_optimise():
         assert all([isinstance(w, raw_classes.RawWord) for w in page.children.words])
 
         page.reset()
+
+
+def test_ocr_parsers(tmp_path):
+    for ocr_path in so.sample_ocr_run_outputs_dir.glob('*.hocr'):
+        bs4_lines = markup_processing.parse_ocr_lines_with_bs4(raw_classes.RawPage(ocr_path=ocr_path, commentary=so.sample_raw_commentary).markup)
+        lxml_lines = markup_processing.parse_ocr_lines_with_lxml(ocr_path)
+        assert [[(t, b.bbox) for t, b in l] for l in bs4_lines] == [[(t, b.bbox) for t, b in l] for l in lxml_lines]
+
+    pagexml_path = tmp_path / 'page.xml'
+    pagexml_path.write_text("""<?xml version="1.0" encoding="UTF-8"?>
+<pc:PcGts xmlns:pc="http://schema.primaresearch.org/PAGE/gts/pagecontent/2019-07-15">
+ <pc:Page><pc:TextRegion><pc:TextLine><pc:Coords points="0,0 40,0 40,10 0,10"/>
+  <pc:Word><pc:Coords points="0,0 18,0 18,10 0,10"/><pc:TextEquiv><pc:Unicode>Ajax</pc:Unicode></pc:TextEquiv></pc:Word>
+  <pc:Word><pc:Coords points="22,0 40,1 40,10 22,10"/><pc:TextEquiv><pc:Unicode>Αἴας</pc:Unicode></pc:TextEquiv></pc:Word>
+ </pc:TextLine></pc:TextRegion></pc:Page>
+</pc:PcGts>""", encoding='utf-8')
+    bs4_lines = markup_processing.parse_ocr_lines_with_bs4(bs4.BeautifulSoup(pagexml_path.read_text('utf-8'), 'xml'), 'xml')
+    lxml_lines = markup_processing.parse_ocr_lines_with_lxml(pagexml_path, 'xml')
+    assert [[(t, b.bbox) for t, b in l] for l in lxml_lines] == [[(t, b.bbox) for t, b in l] for l in bs4_lines]
+    assert [t for t, _ in lxml_lines[0]] == ['Ajax', 'Αἴας']